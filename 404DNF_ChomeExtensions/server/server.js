@@ -85,7 +85,9 @@ const ExtensionDocSchema = new mongoose.Schema(
       total: { type: Number, default: 0 }
     },
     modelingError: { type: String },
-    modelingCompletedAt: { type: Date }
+    modelingCompletedAt: { type: Date },
+    // 모델 서버가 완료 시 기록하는 페이지 요약 (total, dark, percent, byType, byPredicate, topItems)
+    modelingSummary: { type: mongoose.Schema.Types.Mixed }
   },
   {
     collection: 'extension',
@@ -316,6 +318,15 @@ app.get('/model/summary', async (req, res) => {
     if (!id || typeof id !== 'string') {
       return res.status(400).json({ ok: false, error: 'id query required' });
     }
+    // 모델 서버가 완료 시 기록한 페이지 요약이 있으면 model 문서를 스캔하지 않음
+    const doc = mongoose.isValidObjectId(id)
+      ? await ExtensionDoc.findById(id, { modelingSummary: 1 }).lean().exec()
+      : null;
+    const summary = doc && doc.modelingSummary;
+    if (summary) {
+      const { total, dark, percent, byType, byPredicate, topItems } = summary;
+      return res.json({ ok: true, id, total, dark, percent, byType, byPredicate, topItems });
+    }
     const [total, dark] = await Promise.all([
       ModelResult.countDocuments({ id }),
       ModelResult.countDocuments({ id, is_darkpattern: true })
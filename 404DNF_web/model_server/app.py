@@ -1,6 +1,8 @@
 from flask import Flask, request, jsonify
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
+import atexit
 import os
 import re
 import sys
@@ -8,19 +10,48 @@ import threading
 import time
 import socket
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import wraps
 from typing import Any, Dict, List, Optional
-from model.predictor import process_image_and_predict, process_text_and_predict, parse_text_blocks
-
-# stdout 버퍼링 비활성화 (로그 즉시 출력)
-sys.stdout.reconfigure(line_buffering=True)
 
 # 현재 디렉토리와 상위 디렉토리에서 .env 파일 로드
+# (predictor / logging_setup이 import 시점에 MODEL_RUNTIME, LOG_LEVEL 등 환경변수를 읽으므로
+#  model.logging_setup을 쓰는 로컬 모듈(scheduler, async_mongo, worker_control 등)보다 먼저 로드)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 load_dotenv(os.path.join(BASE_DIR, '.env'))  # model_server/.env
 load_dotenv(os.path.join(BASE_DIR, '..', '.env'))  # 상위 디렉토리 .env
 load_dotenv(os.path.join(BASE_DIR, '..', 'server', '.env'))  # server/.env
 
+from delta import block_key, carried_result, find_base_run, load_base_results
+from async_mongo import AsyncMongo
+from leases import FINISHED_STATUSES, LeaseLostError, LeaseManager
+from profiling import MemorySnapshots, ProfilerBusyError, buffer_usage, diff_stats, sample_stacks, top_stats
+from scheduler import BULK, INTERACTIVE, LANES, PriorityScheduler
+from worker_control import WorkerControl, notify_picked, serve_worker_control
+from storage import (
+    build_page_summary,
+    change_stream_project_stage,
+    ensure_indexes,
+    find_lean_document,
+    modeling_projection,
+)
+
+from model.predictor import (
+    process_image_and_predict,
+    process_images_and_predict,
+    process_text_and_predict,
+    parse_text_blocks,
+    get_runtime_info,
+    law_table,
+    artifact_fingerprint,
+    reload_artifacts,
+)
+from model import predictor
+from model.law_sets import sync_law_sets
+from model.logging_setup import get_logger, log_block, log_summary
+
+logger = get_logger("app")
+
 app = Flask(__name__)
 
 # 동시 실행 시 충돌 방지를 위한 서버 인스턴스 식별자
@@ -57,6 +88,12 @@ try:
     model_col = db["model"]
     print(f"✅ [MongoDB 연결 성공] Database: {db.name}")
     print(f"   - Collections: predicate, extension, model")
+    ensure_indexes(db)
+    # 결과 문서에는 lawSetId만 저장하므로 법률 목록을 law_set 컬렉션에 동기화
+    try:
+        print(f"   - law_set 동기화: {sync_law_sets(db, law_table)}개")
+    except Exception as e:
+        print(f"⚠️ [law_set 동기화 실패] {str(e)}")
     print("=" * 80 + "\n")
 except Exception as e:
     print(f"\n❌ [MongoDB 연결 실패] {str(e)}")
@@ -72,6 +109,111 @@ except Exception as e:
 # input_image는 server 디렉토리에 있음
 INPUT_IMAGE_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "server", "input_image"))
 
+# 문서 처리권 lease (만료 시각 + heartbeat 연장, 만료 시 다른 인스턴스가 인수)
+lease_manager = LeaseManager(
+    extension_col,
+    lease_seconds=int(os.getenv("LEASE_SECONDS", 60)),
+    heartbeat_seconds=int(os.getenv("LEASE_HEARTBEAT_SECONDS", 0)) or None,
+    unclaimed_grace_seconds=int(os.getenv("LEASE_UNCLAIMED_GRACE_SECONDS", 120)),
+    takeover_max_age_hours=int(os.getenv("LEASE_TAKEOVER_MAX_AGE_HOURS", 24)),
+    # change stream 파티셔닝 (노드 N개 중 이 노드 번호)
+    partition_count=int(os.getenv("PARTITION_COUNT", 1)),
+    partition_index=int(os.getenv("PARTITION_INDEX", 0)),
+)
+# 비동기 Mongo I/O (opt-in, motor 필요) - 선점 / 본문 조회 / 진행 상황 / 결과 저장을 이벤트 루프에서 실행해 추론과 겹침
+ASYNC_IO = os.getenv("ASYNC_IO", "0").strip().lower() in ("1", "true", "yes")
+async_mongo = None
+if ASYNC_IO:
+    try:
+        async_mongo = AsyncMongo(MONGODB_URL, db.name, max_pending=int(os.getenv("ASYNC_IO_MAX_PENDING", 256)))
+        # 종료 시 아직 끝나지 않은 결과 저장을 기다림
+        atexit.register(async_mongo.flush, 30)
+        print("✅ [비동기 I/O] motor 이벤트 루프 시작")
+    except Exception as e:
+        print(f"⚠️ [비동기 I/O 비활성화] 동기 pymongo로 처리합니다: {str(e)}")
+# 만료 lease / 미선점 문서 인수 주기 (초)
+LEASE_SWEEP_SECONDS = int(os.getenv("LEASE_SWEEP_SECONDS", 30))
+# 페이지 요약(modelingSummary)에 담을 상위 다크패턴 블록 수
+SUMMARY_TOP_N = int(os.getenv("SUMMARY_TOP_N", 5))
+# 관리 엔드포인트(/admin/*) 토큰 - 미설정 시 관리 엔드포인트 비활성화
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# 모델 아티팩트 파일 변경 감시 주기 (초, 0 = 감시 안 함)
+MODEL_RELOAD_WATCH_SECONDS = int(os.getenv("MODEL_RELOAD_WATCH_SECONDS", 0))
+# 멀티 프로세스 모드에서 워커 리로드 응답 대기 시간 (초, 워커마다 모델을 새로 로드 / 검증)
+WORKER_RELOAD_TIMEOUT = float(os.getenv("WORKER_RELOAD_TIMEOUT", 600))
+
+# 크기 기반 우선순위 스케줄러 (단일 프로세스 모드의 문서 모델링 + /predict 요청)
+scheduler = PriorityScheduler(
+    workers=int(os.getenv("SCHEDULER_WORKERS", 2)),
+    bulk_max_running=int(os.getenv("BULK_MAX_RUNNING", 1)),
+    bulk_max_wait_seconds=float(os.getenv("BULK_MAX_WAIT_SECONDS", 120)),
+)
+# 이 블록 수 이하인 문서는 interactive 레인
+INTERACTIVE_MAX_BLOCKS = int(os.getenv("INTERACTIVE_MAX_BLOCKS", 50))
+# 큰 문서를 나눠 실행할 청크 크기 (청크 경계에서 더 우선인 작업이 먼저 실행됨)
+SCHEDULER_CHUNK_BLOCKS = max(1, int(os.getenv("SCHEDULER_CHUNK_BLOCKS", 64)))
+# 레인별 기본 마감 시간 (초, 미설정 = 마감 없음)
+INTERACTIVE_DEADLINE_SECONDS = float(os.getenv("INTERACTIVE_DEADLINE_SECONDS", 0)) or None
+BULK_DEADLINE_SECONDS = float(os.getenv("BULK_DEADLINE_SECONDS", 0)) or None
+
+# 같은 tabUrl 재수집 시 바뀐 블록만 분류 (이전 실행 결과 재사용)
+DELTA_MODE = os.getenv("DELTA_MODE", "0").strip().lower() in ("1", "true", "yes")
+# 이 시간 안에 처리된 같은 URL 문서만 기준 실행으로 사용
+DELTA_WINDOW_HOURS = float(os.getenv("DELTA_WINDOW_HOURS", 24))
+
+# 마지막 아티팩트 리로드 상태 (/admin/reload GET)
+reload_state = {"status": "idle", "result": None, "error": None, "startedAt": None, "finishedAt": None}
+# tracemalloc 스냅샷 (/admin/memory/*)
+memory_snapshots = MemorySnapshots()
+# 추론 워커 제어 채널 (멀티 프로세스 모드에서 start_inference_workers가 설정)
+worker_control = None
+
+def require_admin(view):
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 일치해야 호출 가능"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "ADMIN_TOKEN이 설정되지 않아 관리 엔드포인트가 비활성화되어 있습니다."}), 403
+        if request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+            return jsonify({"error": "인증 실패"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def run_artifact_reload(source_dir=None, export_dir=None, min_agreement=0.0, embeddings_path=None):
+    """아티팩트 리로드 실행 + 상태 기록 (백그라운드 스레드에서 호출)"""
+    reload_state.update(status="running", result=None, error=None,
+                        startedAt=datetime.now().isoformat(), finishedAt=None)
+    try:
+        result = reload_artifacts(source_dir, export_dir=export_dir, min_agreement=min_agreement,
+                                  embeddings_path=embeddings_path)
+        status = "swapped" if result["swapped"] else "rejected"
+        if result["swapped"] and worker_control is not None:
+            # 멀티 프로세스 모드: 부모에서 검증을 통과한 같은 설정으로 각 워커도 교체
+            result["workers"] = reload_workers(source_dir, export_dir, min_agreement, embeddings_path)
+            if not all(r.get("swapped") for r in result["workers"].values()):
+                status = "partial"
+        reload_state.update(status=status, result=result)
+    except Exception as e:
+        print(f"❌ [아티팩트 리로드 실패] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        reload_state.update(status="failed", error=str(e))
+    reload_state["finishedAt"] = datetime.now().isoformat()
+
+def reload_workers(source_dir, export_dir, min_agreement, embeddings_path):
+    """모든 추론 워커에 리로드 전송 -> {워커 ID: 결과}"""
+    replies = worker_control.request(
+        "reload", WORKER_RELOAD_TIMEOUT, source_dir=source_dir, export_dir=export_dir,
+        min_agreement=min_agreement, embeddings_path=embeddings_path)
+    return {f"{SERVER_INSTANCE_ID}-w{index}": reply for index, reply in replies.items()}
+
+def worker_artifacts():
+    """워커별 현재 아티팩트 (멀티 프로세스 모드가 아니면 None)"""
+    if worker_control is None:
+        return None
+    replies = worker_control.request("status", 5)
+    return {f"{SERVER_INSTANCE_ID}-w{index}": reply for index, reply in replies.items()}
+
 @app.route("/health", methods=["GET"])
 def health():
     """서버 상태 확인 엔드포인트"""
@@ -81,16 +223,159 @@ def health():
         return jsonify({
             "status": "healthy",
             "mongodb": "connected",
+            "inference": get_runtime_info(),
+            "scheduler": scheduler.stats(),
             "timestamp": datetime.now().isoformat()
         }), 200
     except Exception as e:
         return jsonify({
             "status": "unhealthy",
             "mongodb": "disconnected",
+            "inference": get_runtime_info(),
             "error": str(e),
             "timestamp": datetime.now().isoformat()
         }), 503
 
+@app.route("/admin/reload", methods=["POST"])
+@require_admin
+def admin_reload():
+    """
+    모델 아티팩트 핫 리로드 (백그라운드 로드 → 샘플 검증 → 원자적 교체)
+    body: {"dir": 아티팩트 디렉토리, "exportDir": export 런타임 GCN 디렉토리, "minAgreement": 0~1,
+           "embeddingsPath": 축소 참조 집합 .npy} (모두 선택)
+    """
+    if reload_state["status"] == "running":
+        return jsonify({"error": "이미 리로드가 진행 중입니다.", "reload": reload_state}), 409
+    data = request.get_json(silent=True) or {}
+    source_dir = data.get("dir")
+    if source_dir and not os.path.isdir(source_dir):
+        return jsonify({"error": f"디렉토리가 존재하지 않습니다: {source_dir}"}), 400
+    reload_state["status"] = "running"
+    threading.Thread(
+        target=run_artifact_reload,
+        args=(source_dir, data.get("exportDir"), float(data.get("minAgreement", 0.0)), data.get("embeddingsPath")),
+        name="artifact-reload",
+        daemon=True,
+    ).start()
+    return jsonify({"message": "리로드 시작", "current": get_runtime_info()["artifacts"]}), 202
+
+@app.route("/admin/reload", methods=["GET"])
+@require_admin
+def admin_reload_status():
+    """마지막 리로드 상태 + 현재 아티팩트 버전 (멀티 프로세스 모드면 워커별 버전 포함)"""
+    return jsonify({
+        "reload": reload_state,
+        "current": get_runtime_info()["artifacts"],
+        "workers": worker_artifacts(),
+    })
+
+@app.route("/admin/profile", methods=["POST"])
+@require_admin
+def admin_profile():
+    """
+    모든 스레드 샘플링 프로파일 (?seconds=10&interval=0.01)
+    응답: collapsed stack 텍스트 (flamegraph.pl / speedscope 입력)
+    멀티 프로세스 모드면 추론 워커도 같은 시간 동안 샘플링해 합침 (스택 앞에 parent / w<번호> 프로세스 프레임)
+    """
+    try:
+        seconds = float(request.args.get("seconds", 10))
+        interval = float(request.args.get("interval", 0.01))
+    except ValueError:
+        return jsonify({"error": "seconds / interval은 숫자여야 합니다."}), 400
+    # 워커에 먼저 전송해 부모와 같은 구간을 샘플링
+    ticket = worker_control.send("profile", seconds=seconds, interval=interval) if worker_control is not None else None
+    try:
+        collapsed, samples = sample_stacks(seconds, interval)
+    except ProfilerBusyError as e:
+        if ticket is not None:
+            worker_control.collect(ticket, 0)
+        return jsonify({"error": str(e)}), 409
+    headers = {"X-Profile-Samples": str(samples)}
+    if ticket is not None:
+        lines = [f"parent;{line}" for line in collapsed.splitlines() if line]
+        covered = 0
+        for index, reply in worker_control.collect(ticket, seconds + 30).items():
+            if "error" in reply:
+                logger.warning("⚠️ [프로파일] 워커 w%d 샘플링 실패: %s", index, reply["error"])
+                continue
+            covered += 1
+            lines.extend(f"w{index};{line}" for line in reply["collapsed"].splitlines() if line)
+        collapsed = "\n".join(lines) + "\n"
+        headers["X-Profile-Workers"] = f"{covered}/{worker_control.num_workers}"
+    return app.response_class(collapsed, mimetype="text/plain", headers=headers)
+
+@app.route("/admin/memory/snapshot", methods=["POST"])
+@require_admin
+def admin_memory_snapshot():
+    """tracemalloc 스냅샷 저장 (첫 호출 시 추적 시작) body: {"name", "nframes", "top"} (모두 선택)"""
+    data = request.get_json(silent=True) or {}
+    name, snapshot = memory_snapshots.take(data.get("name"), int(data.get("nframes", 1)))
+    return jsonify({
+        "name": name,
+        "top": top_stats(snapshot, int(data.get("top", 20))),
+        "memory": memory_snapshots.status(),
+    })
+
+@app.route("/admin/memory/diff", methods=["GET"])
+@require_admin
+def admin_memory_diff():
+    """두 스냅샷 차이 (?from=s1&to=s2&top=20&groupBy=lineno|filename|traceback), to 생략 시 지금 스냅샷을 새로 찍음"""
+    base_name = request.args.get("from")
+    if not base_name:
+        return jsonify({"error": "from 누락됨"}), 400
+    group_by = request.args.get("groupBy", "lineno")
+    if group_by not in ("lineno", "filename", "traceback"):
+        return jsonify({"error": f"지원하지 않는 groupBy: {group_by}"}), 400
+    try:
+        base = memory_snapshots.get(base_name)
+        target_name = request.args.get("to")
+        if target_name:
+            target = memory_snapshots.get(target_name)
+        else:
+            target_name, target = memory_snapshots.take()
+    except KeyError as e:
+        return jsonify({"error": f"스냅샷이 없습니다: {e}", "memory": memory_snapshots.status()}), 404
+    return jsonify({
+        "from": base_name,
+        "to": target_name,
+        "diff": diff_stats(base, target, int(request.args.get("top", 20)), group_by),
+    })
+
+@app.route("/admin/memory", methods=["GET"])
+@require_admin
+def admin_memory_status():
+    """tracemalloc 상태 + 버퍼 사용량 (?scan=1이면 gc로 살아 있는 텐서 / 배열 전체 집계)"""
+    scan = request.args.get("scan", "0").strip().lower() in ("1", "true", "yes")
+    models = {
+        "translation": predictor.trans_model,
+        "encoder": predictor.st_model,
+        "ocrDetector": getattr(predictor.reader, "detector", None),
+        "ocrRecognizer": getattr(predictor.reader, "recognizer", None),
+    }
+    return jsonify({
+        "memory": memory_snapshots.status(),
+        "buffers": buffer_usage(predictor.artifacts, models, scan=scan),
+    })
+
+@app.route("/admin/memory", methods=["DELETE"])
+@require_admin
+def admin_memory_stop():
+    """스냅샷 삭제 + tracemalloc 중단"""
+    memory_snapshots.stop()
+    return jsonify({"memory": memory_snapshots.status()})
+
+@app.route("/laws", methods=["GET"])
+def resolve_laws():
+    """lawSetId -> 법률 목록 조회 (?ids=a,b,c)"""
+    ids = [i for i in request.args.get("ids", "").split(",") if i]
+    if not ids:
+        return jsonify({"error": "ids 누락됨"}), 400
+    resolved = law_table.resolve(ids)
+    return jsonify({
+        "lawSets": resolved,
+        "missing": [i for i in ids if i not in resolved]
+    })
+
 @app.route("/predict", methods=["POST"])
 def predict():
     data = request.get_json()
@@ -104,7 +389,12 @@ def predict():
         return jsonify({"error": f"{img_path} 경로에 이미지가 존재하지 않습니다."}), 404
 
     try:
-        prediction_results = process_image_and_predict(img_path)
+        prediction_results = scheduler.run(
+            lambda: process_image_and_predict(img_path),
+            INTERACTIVE,
+            cost=1,
+            deadline_seconds=INTERACTIVE_DEADLINE_SECONDS,
+        )
 
         # ✅ 예측 결과에 filename 추가
         for result in prediction_results:
@@ -124,14 +414,537 @@ def predict():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-def watch_extension_collection():
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """여러 스크린샷을 한 번의 OCR / 번역 / 분류 배치로 처리하고 다크패턴 결과를 한 번에 저장"""
+    data = request.get_json() or {}
+    filenames = data.get("filenames")
+
+    if not isinstance(filenames, list) or not filenames:
+        return jsonify({"error": "filenames 누락됨 (파일명 배열)"}), 400
+
+    # 중복 제거 (순서 유지) 및 존재 여부 확인
+    filenames = list(dict.fromkeys(str(f) for f in filenames))
+    img_paths = {f: os.path.join(INPUT_IMAGE_DIR, f) for f in filenames}
+    missing = [f for f, path in img_paths.items() if not os.path.exists(path)]
+    found = [f for f in filenames if f not in missing]
+    if not found:
+        return jsonify({"error": "요청한 이미지가 모두 존재하지 않습니다.", "missing": missing}), 404
+
+    try:
+        results_by_path, failed_paths = scheduler.run(
+            lambda: process_images_and_predict([img_paths[f] for f in found]),
+            INTERACTIVE,
+            cost=len(found),
+            deadline_seconds=INTERACTIVE_DEADLINE_SECONDS,
+        )
+
+        # 디코딩에 실패한 파일은 missing과 같이 따로 보고 (나머지 파일은 정상 처리)
+        failed = {f: failed_paths[img_paths[f]] for f in found if img_paths[f] in failed_paths}
+        dark_patterns_only = []
+        per_file = {}
+        for filename in found:
+            if filename in failed:
+                continue
+            prediction_results = results_by_path.get(img_paths[filename], [])
+            for result in prediction_results:
+                result["filename"] = filename
+            dark = [r for r in prediction_results if r.get("is_darkpattern") == 1]
+            dark_patterns_only.extend(dark)
+            per_file[filename] = {"total": len(prediction_results), "saved": len(dark)}
+
+        if dark_patterns_only:
+            predicate_col.insert_many(dark_patterns_only)
+
+        return jsonify({
+            "message": "✅ 예측 완료",
+            "total": sum(v["total"] for v in per_file.values()),
+            "saved": len(dark_patterns_only),
+            "files": per_file,
+            "missing": missing,
+            "failed": failed
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def claim_extension_document(doc_id, doc, server_id) -> bool:
+    """
+    문서 처리권 선점 (lease 기반 원자적 업데이트)
+    server_id는 인스턴스 ID 또는 멀티 프로세스 모드의 워커 ID ({인스턴스 ID}-w{번호})
+
+    Returns:
+        이 server_id가 처리권을 가지면 True
+    """
+    # 다른 인스턴스가 처리 중인지 확인 (lease가 만료되었으면 인수 시도)
+    existing_processor = doc.get("processingServerId")
+    if existing_processor and existing_processor != server_id and not lease_manager.is_expired(doc):
+        logger.info("⚠️ [선점됨] 문서 %s는 다른 서버(%s)가 처리 중입니다. 건너뜁니다.", doc_id, existing_processor)
+        return False
+
+    if not lease_manager.claim(doc_id, server_id):
+        claimed_doc = extension_col.find_one({"_id": doc_id}, {"processingServerId": 1, "modelingStatus": 1})
+        claimed_by = claimed_doc.get("processingServerId") if claimed_doc else None
+        logger.info("⚠️ [경쟁 감지] 문서 %s는 다른 서버(%s)가 선점했거나 이미 처리되었습니다. 건너뜁니다.", doc_id, claimed_by)
+        return False
+
+    if existing_processor and existing_processor != server_id:
+        # 만료된 lease 인수: 이전 인스턴스가 일부 저장한 결과 제거 후 재처리
+        logger.warning("♻️ [lease 인수] 문서 %s (%s → %s)", doc_id, existing_processor, server_id)
+        model_col.delete_many({"id": str(doc_id)})
+    return True
+
+async def claim_and_fetch(adb, doc_id, doc, server_id):
+    """비동기 모드 선점(pymongo lease, executor) + 본문 조회(motor) -> (선점 여부, 본문)"""
+    claimed = await async_mongo.run_sync(claim_extension_document, doc_id, doc, server_id)
+    if not claimed:
+        return False, None
+    try:
+        body = await adb.extension.find_one({"_id": doc_id}, modeling_projection(doc.get("structured")))
+    except Exception:
+        await async_mongo.run_sync(lease_manager.release, doc_id, server_id)
+        raise
+    return True, body
+
+def extension_document_job(doc_id, doc, server_id):
+    """
+    선점 → 본문 조회 → 모델링 → lease 해제
+    doc은 lean 스냅샷(change stream 이벤트 / find_lean_document), None이면 조회
+    제너레이터: 청크마다 처리한 블록 수를 yield (스케줄러가 청크 사이에 다른 작업 실행),
+    비동기 I/O 모드에서는 DB 작업 Future를 yield (완료될 때까지 워커는 다른 작업 실행)
+    """
+    if doc is None:
+        doc = find_lean_document(extension_col, doc_id)
+        if not doc:
+            logger.warning("⚠️ [%s] 문서 %s를 찾을 수 없습니다. 건너뜁니다.", server_id, doc_id)
+            return
+    body = None
+    if async_mongo is not None:
+        fetch = async_mongo.submit(lambda adb: claim_and_fetch(adb, doc_id, doc, server_id))
+        yield fetch
+        claimed, body = fetch.result()
+    else:
+        claimed = claim_extension_document(doc_id, doc, server_id)
+    if not claimed:
+        return
+    handed_off = False
+    try:
+        # 선점에 성공한 인스턴스만 본문 조회 (structuredBlocks 하위 필드 또는 텍스트 필드)
+        if async_mongo is None:
+            body = extension_col.find_one({"_id": doc_id}, modeling_projection(doc.get("structured")))
+        if not body:
+            logger.warning("⚠️ [%s] 문서 %s를 찾을 수 없습니다. 건너뜁니다.", server_id, doc_id)
+            return
+        doc = {**doc, **body}
+        # 결과 저장을 비동기로 넘긴 경우 lease 해제도 저장이 끝난 뒤 그쪽에서 수행
+        handed_off = yield from process_extension_document(doc_id, doc, server_id)
+    finally:
+        if not handed_off:
+            lease_manager.release(doc_id, server_id)
+
+def update_extension_status(doc_id, server_id, update, label, unfinished=False):
+    """
+    선점한 extension 문서 상태 업데이트 - 비동기 I/O 모드면 기다리지 않음
+    unfinished: 완료 / 실패 상태가 아닐 때만 적용 (늦게 도착한 진행 상황 쓰기가 완료 상태를 덮지 않도록)
+    """
+    query = {"_id": doc_id, "processingServerId": server_id}
+    if unfinished:
+        query["modelingStatus"] = {"$nin": FINISHED_STATUSES}
+    if async_mongo is not None:
+        async_mongo.fire(lambda adb: adb.extension.update_one(query, update), label)
+    else:
+        extension_col.update_one(query, update)
+
+def save_model_results(doc_id, server_id, result_docs, completion):
+    """블록 결과 insert_many + 완료 상태 기록 -> 저장한 문서 수"""
+    saved_count = 0
+    if result_docs:
+        try:
+            saved_count = len(model_col.insert_many(result_docs, ordered=False).inserted_ids)
+        except BulkWriteError as bulk_error:
+            # ordered=False: 실패한 문서만 제외하고 나머지는 저장됨
+            saved_count = bulk_error.details.get("nInserted", 0)
+            logger.error("❌ [일부 저장 실패] %d개 문서 저장 실패", len(bulk_error.details.get("writeErrors", [])))
+    extension_col.update_one({"_id": doc_id, "processingServerId": server_id}, {"$set": completion})
+    return saved_count
+
+async def save_model_results_async(adb, doc_id, server_id, result_docs, completion, on_saved):
+    """save_model_results의 비동기 버전 - 저장 후 on_saved(저장 수) 호출, 끝나면 lease 해제"""
+    try:
+        saved_count = 0
+        if result_docs:
+            try:
+                saved_count = len((await adb.model.insert_many(result_docs, ordered=False)).inserted_ids)
+            except BulkWriteError as bulk_error:
+                saved_count = bulk_error.details.get("nInserted", 0)
+                logger.error("❌ [일부 저장 실패] %d개 문서 저장 실패", len(bulk_error.details.get("writeErrors", [])))
+        await adb.extension.update_one({"_id": doc_id, "processingServerId": server_id}, {"$set": completion})
+        on_saved(saved_count)
+    except Exception as e:
+        logger.exception("❌ [결과 저장 실패] 문서 %s: %s", doc_id, e)
+        await adb.extension.update_one(
+            {"_id": doc_id, "processingServerId": server_id},
+            {"$set": {"modelingStatus": "failed", "modelingError": str(e), "processingServerId": server_id}},
+        )
+    finally:
+        await async_mongo.run_sync(lease_manager.release, doc_id, server_id)
+
+def handle_extension_document(doc_id, doc, server_id):
+    """extension_document_job을 끝까지 실행 (멀티 프로세스 워커용)"""
+    for _ in extension_document_job(doc_id, doc, server_id):
+        pass
+
+def process_extension_document(doc_id, doc, server_id):
+    """
+    선점한 extension 문서의 fullText/structuredBlocks를 블록 단위로 모델링하고 결과를 model 컬렉션에 저장
+    제너레이터: SCHEDULER_CHUNK_BLOCKS개 블록을 처리할 때마다 처리한 블록 수를 yield
+    반환값: 결과 저장(및 lease 해제)을 비동기 I/O로 넘겼으면 True
+    """
+    doc["processingServerId"] = server_id
+
+    # structuredBlocks가 있으면 본문 텍스트(fullText/originalText)는 조회하지 않음 (modeling_projection)
+    structured_blocks = doc.get("structuredBlocks")
+    has_blocks = isinstance(structured_blocks, list) and bool(structured_blocks)
+    full_text = doc.get("fullText")  # 번역된 영어 텍스트 (모델링용) - * 기준으로 구분됨
+    original_text = doc.get("originalText")  # 원본 한글 텍스트 (표시용) - * 기준으로 구분됨
+
+    if not has_blocks and not full_text:
+        logger.warning("⚠️ [문서 %s] fullText가 없습니다. 건너뜁니다.", doc_id)
+        return
+
+    # originalText가 없으면 fullText를 원본으로 사용 (경고)
+    if not has_blocks and not original_text:
+        original_text = full_text
+        logger.warning("⚠️ [문서 %s] originalText가 없습니다. fullText를 원본으로 사용합니다.", doc_id)
+
+    # 새 문서 감지 로그
+    started = time.perf_counter()
+    logger.info(
+        "📥 [새로운 크롤링 데이터 감지] 문서 %s",
+        doc_id,
+        extra={"doc_id": str(doc_id), "url": doc.get("tabUrl"), "frames": doc.get("framesCollected", 0),
+               "block_count": doc.get("blockCount")},
+    )
+    logger.debug("📄 제목: %s", doc.get("tabTitle"))
+
+    try:
+        # structuredBlocks 기반 블록 구성 (태그/셀렉터 유지)
+        def star_to_plain(value: Optional[str]) -> str:
+            if not value:
+                return ""
+            text_value = str(value).replace("*", " ")
+            return re.sub(r"\s+", " ", text_value).strip()
+
+        block_entries: List[Dict[str, Any]] = []
+        if has_blocks:
+            for blk in structured_blocks:
+                if not isinstance(blk, dict):
+                    continue
+                translated_star = blk.get("text") or blk.get("plainText") or ""
+                translated_plain = blk.get("translatedPlainText") or star_to_plain(translated_star)
+                original_star = blk.get("originalText") or blk.get("rawText") or translated_star
+                original_plain = blk.get("originalPlainText") or blk.get("rawPlainText") or star_to_plain(original_star)
+                if not translated_plain and not original_plain:
+                    continue
+                block_entries.append({
+                    "translated_star": translated_star,
+                    "translated_plain": translated_plain,
+                    "original_star": original_star,
+                    "original_plain": original_plain,
+                    "meta": {
+                        "index": blk.get("index"),
+                        "selector": blk.get("selector"),
+                        "tag": blk.get("tag"),
+                        "frameUrl": blk.get("frameUrl"),
+                        "frameTitle": blk.get("frameTitle"),
+                        "frameBlockIndex": blk.get("frameBlockIndex"),
+                        "blockType": blk.get("blockType"),
+                        "frameId": blk.get("frameId"),
+                        "linkHref": blk.get("linkHref"),
+                    }
+                })
+        else:
+            translated_sentences = parse_text_blocks(full_text)
+            original_sentences = parse_text_blocks(original_text)
+            for idx, translated_plain in enumerate(translated_sentences):
+                original_plain = original_sentences[idx] if idx < len(original_sentences) else translated_plain
+                block_entries.append({
+                    "translated_star": translated_plain,
+                    "translated_plain": translated_plain,
+                    "original_star": original_plain,
+                    "original_plain": original_plain,
+                    "meta": {
+                        "index": idx,
+                        "linkHref": None
+                    }
+                })
+
+        # 중복 블록 제거 (텍스트 기준)
+        unique_entries = []
+        seen_entries = set()
+        for entry in block_entries:
+            text_key = (entry.get("original_plain") or entry.get("translated_plain") or "").strip().lower()
+            if not text_key:
+                continue
+            if text_key in seen_entries:
+                continue
+            seen_entries.add(text_key)
+            unique_entries.append(entry)
+        block_entries = unique_entries
+
+        # 모델 입력에 한글이 포함되어 있는지 확인 (반드시 번역된 영어 텍스트여야 함)
+        korean_sample = next(
+            (e["translated_plain"] for e in block_entries if re.search(r'[가-힣]', e["translated_plain"])), None
+        )
+        if korean_sample:
+            logger.warning("⚠️ [경고] 모델 입력에 한글이 포함되어 있습니다! (반드시 번역된 영어 텍스트여야 함) 샘플: %s",
+                           korean_sample[:200])
+
+        total_count = len(block_entries)
+        if total_count == 0:
+            logger.warning("⚠️ [경고] 처리할 블록이 없습니다. 문서 %s 건너뜁니다.", doc_id)
+            return
+
+        # delta 모드: 같은 URL의 이전 실행과 블록 키가 같으면 분류 결과 재사용, 나머지만 분류
+        # (아티팩트 버전 + 추론 설정 키가 같은 실행만 기준으로 사용)
+        model_version = predictor.inference_version()
+        carried = {}
+        base_id = None
+        if DELTA_MODE:
+            base_id = find_base_run(extension_col, doc_id, doc.get("tabUrl"), model_version, DELTA_WINDOW_HOURS)
+            if base_id is not None:
+                prior = load_base_results(model_col, base_id)
+                for idx, entry in enumerate(block_entries):
+                    prior_result = prior.get(block_key(entry["translated_plain"], entry["meta"].get("selector")))
+                    if prior_result is not None:
+                        carried[idx] = carried_result(prior_result)
+                logger.info("♻️ [delta] 문서 %s: 기준 %s에서 %d/%d개 블록 재사용",
+                            doc_id, base_id, len(carried), total_count)
+        pending_indices = [idx for idx in range(total_count) if idx not in carried]
+
+        current_count = [0]
+
+        def update_progress(current, total):
+            current_count[0] = current
+            try:
+                # 비동기 I/O 모드에서는 쓰기 순서가 바뀔 수 있으므로 $max로 갱신
+                update_extension_status(doc_id, server_id, {
+                    "$set": {
+                        "modelingStatus": "processing",
+                        "modelingProgress.total": total_count,
+                        "processingServerId": server_id
+                    },
+                    "$max": {"modelingProgress.current": current},
+                }, "진행 상황", unfinished=True)
+            except Exception as e:
+                logger.warning("⚠️ [진행 상황 업데이트 실패] %s", e)
+
+        update_extension_status(doc_id, server_id, {"$set": {
+            "modelingStatus": "processing",
+            "modelingProgress": {"current": 0, "total": total_count},
+            "processingServerId": server_id
+        }}, "모델링 시작", unfinished=True)
+
+        logger.info("🔄 [모델링 시작] 문서 %s: %d개 블록 처리 예정", doc_id, total_count)
+
+        translated_list_for_model = [block_entries[idx]["translated_plain"] for idx in pending_indices]
+        pending_count = len(pending_indices)
+        new_results = []
+        # 청크 단위 실행 - 청크 경계에서 스케줄러가 더 우선인 작업(짧은 페이지, 스크린샷)을 먼저 실행
+        for offset in range(0, pending_count, SCHEDULER_CHUNK_BLOCKS):
+            # lease를 잃었으면 중단 (다른 인스턴스가 인수함) - 진행 상황 콜백의 예외는 predictor가 로그로만 처리하므로 여기서 확인
+            lease_manager.check(doc_id)
+            chunk = translated_list_for_model[offset:offset + SCHEDULER_CHUNK_BLOCKS]
+            new_results.extend(process_text_and_predict(
+                chunk,
+                progress_callback=lambda current, total, offset=offset: update_progress(
+                    len(carried) + offset + current, total_count),
+            ))
+            if offset + SCHEDULER_CHUNK_BLOCKS < pending_count:
+                yield len(chunk)
+
+        # 재사용 결과와 새 분류 결과를 블록 순서대로 합침
+        if carried:
+            new_by_index = dict(zip(pending_indices, new_results))
+            merged = [(entry, carried.get(idx) or new_by_index.get(idx)) for idx, entry in enumerate(block_entries)]
+            merged = [(entry, result) for entry, result in merged if result is not None]
+            block_entries = [entry for entry, _ in merged]
+            results = [result for _, result in merged]
+        else:
+            results = new_results
+
+        logger.debug("📝 [원본 텍스트 매핑] 블록: %d개, 결과: %d개", len(block_entries), len(results))
+
+        for idx, result in enumerate(results):
+            if idx >= len(block_entries):
+                break
+            entry = block_entries[idx]
+            result["original_text"] = entry["original_plain"]
+            result["structured_meta"] = entry["meta"]
+            result["translated_text"] = entry["translated_plain"]
+
+        if not results:
+            logger.warning("⚠️ [경고] 결과가 없습니다. 텍스트를 확인해주세요. (문서 %s)", doc_id)
+            return
+
+        lease_manager.check(doc_id)
+        model_elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        result_docs = []
+        seen_result_docs = set()
+
+        for idx, result in enumerate(results, 1):
+            try:
+                prob_value = result.get("probability")
+                probability_int = int(round(prob_value * 100)) if prob_value is not None else None
+                is_dark = result.get("is_darkpattern", 0)
+
+                entry = block_entries[idx - 1] if (idx - 1) < len(block_entries) else None
+                original_string = result.get("original_text") or (entry.get("original_plain") if entry else "")
+                translated_string = result.get("translated_text") or (entry.get("translated_plain") if entry else result.get("text", ""))
+
+                normalized_original = original_string.strip().lower()
+                if normalized_original in seen_result_docs:
+                    continue
+                seen_result_docs.add(normalized_original)
+
+                meta_info = result.get("structured_meta") or (entry.get("meta") if entry else None)
+                link_href_value = None
+                link_selector_value = None
+                if isinstance(meta_info, dict):
+                    link_href_value = meta_info.get("linkHref")
+                    link_selector_value = meta_info.get("linkSelector")
+
+                result_doc = {
+                    "string": original_string,
+                    "translatedString": translated_string,
+                    "type": result.get("type"),
+                    "predicate": result.get("predicate"),
+                    "probability": probability_int,
+                    "is_darkpattern": is_dark,
+                    "id": str(doc_id),
+                    "structuredMeta": meta_info,
+                    "linkHref": link_href_value,
+                    "linkSelector": link_selector_value
+                }
+                result_docs.append(result_doc)
+
+                log_block(logger, idx, len(results), "%s 저장: %s",
+                          "🔴 다크패턴" if is_dark else "⚪ 일반", original_string[:60])
+            except Exception as save_error:
+                logger.exception("❌ [저장 실패 %d/%d] %s", idx, len(results), save_error)
+
+        # 블록 결과는 insert_many 한 번으로 저장 (insert_many가 문서에 _id를 추가하므로 요약은 먼저 계산)
+        summary = build_page_summary(result_docs, top_n=SUMMARY_TOP_N)
+        # 완료 상태와 페이지 요약을 한 번에 기록 (/model/summary는 model 문서를 스캔하지 않고 이 값을 사용)
+        completion = {
+            "modelingStatus": "completed",
+            "modelingProgress": {"current": len(results), "total": total_count},
+            "modelingCompletedAt": datetime.now(),
+            "modelingSummary": summary,
+            "modelingModelVersion": model_version,
+            "modelingDelta": {"baseId": base_id, "reused": len(carried), "classified": len(new_results)},
+            "processingServerId": server_id
+        }
+
+        def log_done(saved_count):
+            # 문서 단위 요약 레코드 (블록 단위 로그 대신)
+            log_summary(
+                logger, f"✅ [처리 완료] 문서 {doc_id}",
+                doc_id=str(doc_id),
+                server_id=server_id,
+                blocks=total_count,
+                results=len(results),
+                reused=len(carried),
+                saved=saved_count,
+                dark=summary["dark"],
+                dark_percent=summary["percent"],
+                model_ms=model_elapsed_ms,
+                total_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+        if async_mongo is not None:
+            # 저장은 이벤트 루프에서 진행하고 이 워커는 바로 다음 문서 추론으로 넘어감
+            async_mongo.submit(lambda adb: save_model_results_async(
+                adb, doc_id, server_id, result_docs, completion, log_done))
+            return True
+        log_done(save_model_results(doc_id, server_id, result_docs, completion))
+
+    except LeaseLostError as e:
+        logger.warning("⚠️ [처리 중단] %s", e)
+
+    except Exception as e:
+        # 모델링 실패 상태 업데이트
+        try:
+            update_extension_status(doc_id, server_id, {"$set": {
+                "modelingStatus": "failed",
+                "modelingError": str(e),
+                "processingServerId": server_id
+            }}, "실패 상태")
+        except:
+            pass
+
+        logger.exception("❌ [오류 발생] 문서 %s 처리 중 오류: %s", doc_id, e)
+
+def document_schedule(doc):
+    """
+    lean 문서 -> (레인, 예상 비용(블록 수), 마감까지 남은 초)
+    - modelingPriority(interactive|bulk)가 있으면 그대로 사용, 없으면 블록 수(blockCount)로 결정
+    - modelingDeadline(datetime)이 있으면 레인 기본 마감보다 우선
+    """
+    cost = int(doc.get("blockCount") or 0)
+
+    lane = doc.get("modelingPriority")
+    if lane not in LANES:
+        lane = INTERACTIVE if cost <= INTERACTIVE_MAX_BLOCKS else BULK
+
+    deadline = doc.get("modelingDeadline")
+    if isinstance(deadline, datetime):
+        # pymongo는 기본적으로 UTC naive datetime을 반환
+        now = datetime.now(timezone.utc) if deadline.tzinfo else datetime.utcnow()
+        deadline_seconds = (deadline - now).total_seconds()
+    else:
+        deadline_seconds = INTERACTIVE_DEADLINE_SECONDS if lane == INTERACTIVE else BULK_DEADLINE_SECONDS
+    return lane, cost, deadline_seconds
+
+def dispatch_document(doc_id, doc, task_queue):
+    """
+    문서 처리 분배
+    - 멀티 프로세스 모드: 워커 큐에 문서 ID 전달 (선점은 워커가 워커 ID로 수행, FIFO)
+    - 단일 모드: 우선순위 스케줄러에 제출 (같은 문서가 대기 / 실행 중이면 무시)
+    """
+    if task_queue is not None:
+        # 워커가 아직 꺼내지 않은 문서는 다시 넣지 않음 (인수 주기마다 같은 미선점 문서가 반복 전달됨)
+        if worker_control is not None and not worker_control.mark_queued(doc_id):
+            return
+        task_queue.put(doc_id)
+        logger.debug("📤 [워커 전달] 문서 %s", doc_id)
+        return
+    if doc is None:
+        doc = find_lean_document(extension_col, doc_id)
+        if not doc:
+            logger.warning("⚠️ 문서 %s를 찾을 수 없습니다. 건너뜁니다.", doc_id)
+            return
+    lane, cost, deadline_seconds = document_schedule(doc)
+    future = scheduler.submit(
+        extension_document_job(doc_id, doc, SERVER_INSTANCE_ID),
+        lane,
+        cost=cost,
+        deadline_seconds=deadline_seconds,
+        key=doc_id,
+        name=f"extension:{doc_id}",
+    )
+    if future is not None:
+        logger.debug("📥 [스케줄러 제출] 문서 %s (%s, %d블록)", doc_id, lane, cost)
+
+def watch_extension_collection(task_queue=None):
     """
     MongoDB extension 컬렉션의 변경 사항을 감지하고 
     새로운 문서가 추가되면 fullText를 * 기준으로 분리하여 모델링하고 결과를 model 컬렉션에 저장
+
+    Args:
+        task_queue: 멀티 프로세스 모드(MODEL_WORKERS > 1)에서 문서 ID를 전달할 워커 큐.
+                    None이면 이 스레드에서 직접 선점 / 모델링
     """
-    print("\n" + "=" * 80)
-    print("🔍 [MongoDB 감시 시작] Extension 컬렉션 감시 중")
-    print("=" * 80 + "\n")
+    logger.info("🔍 [MongoDB 감시 시작] Extension 컬렉션 감시 중")
     
     # 처리된 문서 ID를 추적 (중복 처리 방지)
     processed_ids = set()
@@ -144,368 +957,176 @@ def watch_extension_collection():
             try:
                 client.admin.command('ping')
             except Exception as conn_err:
-                print(f"\n❌ [MongoDB 연결 확인 실패] {str(conn_err)}")
-                print("MongoDB 연결을 확인하고 재시도합니다")
+                logger.error("❌ [MongoDB 연결 확인 실패] %s - MongoDB 연결을 확인하고 재시도합니다", conn_err)
                 retry_count += 1
                 if retry_count < max_retries:
                     time.sleep(5)
                     continue
                 else:
-                    print("\n❌ [최대 재시도 횟수 초과] MongoDB 연결에 실패했습니다.")
-                    print("서버를 재시작하거나 MongoDB 설정을 확인하세요.")
+                    logger.error("❌ [최대 재시도 횟수 초과] MongoDB 연결에 실패했습니다. "
+                                 "서버를 재시작하거나 MongoDB 설정을 확인하세요.")
                     return
             
             # Change Stream으로 실시간 변경 감지
-            print("✅ [Change Stream 연결 성공] 새 문서 감지 대기 중")
-            print("=" * 80 + "\n")
-            sys.stdout.flush()
+            logger.info("✅ [Change Stream 연결 성공] 새 문서 감지 대기 중")
             
-            with extension_col.watch([{"$match": {"operationType": "insert"}}]) as stream:
+            lease_manager.start_heartbeat()
+            next_sweep = time.monotonic()
+
+            # try_next로 이벤트를 기다리면서 주기적으로 만료 lease / 미선점 문서 인수
+            # fullDocument는 _id + 선점 필드 + 블록 수만 수신 (본문은 선점 후 조회)
+            pipeline = lease_manager.watch_pipeline() + [change_stream_project_stage()]
+            with extension_col.watch(pipeline, max_await_time_ms=1000) as stream:
                 retry_count = 0  # 성공적으로 스트림이 시작되면 재시도 카운트 리셋
-                print("👀 [Change Stream 활성화] MongoDB extension 컬렉션 감시 중\n")
-                sys.stdout.flush()
+                logger.info("👀 [Change Stream 활성화] MongoDB extension 컬렉션 감시 중")
+                if lease_manager.partition_count > 1:
+                    logger.info("   - 파티션: %d/%d", lease_manager.partition_index, lease_manager.partition_count)
                 
-                for change in stream:
-                    if change["operationType"] == "insert":
-                        doc = change["fullDocument"]
-                        doc_id = doc.get("_id")
-                        
-                        # 이미 처리된 문서는 스킵
-                        if doc_id in processed_ids:
-                            continue
-
-                    # 다른 인스턴스가 처리 중인지 확인
-                    existing_processor = doc.get("processingServerId")
-                    if existing_processor and existing_processor != SERVER_INSTANCE_ID:
-                        print(f"⚠️ [선점됨] 문서 {doc_id}는 다른 서버({existing_processor})가 처리 중입니다. 건너뜁니다.")
-                        processed_ids.add(doc_id)
+                while stream.alive:
+                    change = stream.try_next()
+                    if change is None:
+                        if time.monotonic() >= next_sweep:
+                            next_sweep = time.monotonic() + LEASE_SWEEP_SECONDS
+                            for doc_id in lease_manager.find_takeover_candidates():
+                                logger.info("♻️ [인수 후보] 문서 %s (만료된 lease 또는 미선점)", doc_id)
+                                dispatch_document(doc_id, None, task_queue)
                         continue
+                    if change["operationType"] != "insert":
+                        continue
+                    doc = change["fullDocument"]
+                    doc_id = doc.get("_id")
 
-                    # 처리권 선점 (원자적 업데이트)
-                    if not existing_processor:
-                        claim_result = extension_col.update_one(
-                            {"_id": doc_id, "processingServerId": {"$exists": False}},
-                            {"$set": {"processingServerId": SERVER_INSTANCE_ID}}
-                        )
-                        if claim_result.modified_count == 0:
-                            claimed_doc = extension_col.find_one({"_id": doc_id}, {"processingServerId": 1})
-                            claimed_by = claimed_doc.get("processingServerId") if claimed_doc else None
-                            if claimed_by and claimed_by != SERVER_INSTANCE_ID:
-                                print(f"⚠️ [경쟁 감지] 문서 {doc_id}는 다른 서버({claimed_by})가 선점했습니다. 건너뜁니다.")
-                                processed_ids.add(doc_id)
-                                continue
-                        doc["processingServerId"] = SERVER_INSTANCE_ID
-                        
-                        # fullText(번역된 텍스트)와 originalText(원본 텍스트) 가져오기
-                        full_text = doc.get("fullText")  # 번역된 영어 텍스트 (모델링용) - * 기준으로 구분됨
-                        original_text = doc.get("originalText")  # 원본 한글 텍스트 (표시용) - * 기준으로 구분됨
-                        structured_blocks = doc.get("structuredBlocks")
-                        
-                        if not full_text:
-                            print(f"⚠️ [문서 {doc_id}] fullText가 없습니다. 건너뜁니다.")
-                            processed_ids.add(doc_id)
-                            continue
-                        
-                        # originalText가 없으면 fullText를 원본으로 사용 (경고)
-                        if not original_text:
-                            original_text = full_text
-                            print(f"⚠️ [문서 {doc_id}] originalText가 없습니다. fullText를 원본으로 사용합니다.")
-                        
-                        # fullText에 한글이 포함되어 있는지 확인 (모델에 한글이 들어가면 안 됨)
-                        import re
-                        has_korean_in_fulltext = bool(re.search(r'[가-힣]', full_text))
-                        if has_korean_in_fulltext:
-                            print(f"⚠️ [경고] fullText에 한글이 포함되어 있습니다!")
-                            print(f"   fullText는 반드시 번역된 영어 텍스트여야 합니다.")
-                            print(f"   fullText 샘플: {full_text[:200]}")
-                            sys.stdout.flush()
-                        
-                        # 새 문서 감지 로그
-                        print("\n" + "=" * 80)
-                        print(f"📥 [새로운 크롤링 데이터 감지]")
-                        print("=" * 80)
-                        print(f"📝 문서 ID: {doc_id}")
-                        print(f"📍 URL: {doc.get('tabUrl', 'N/A')}")
-                        print(f"📄 제목: {doc.get('tabTitle', 'N/A')}")
-                        print(f"📊 프레임 수: {doc.get('framesCollected', 0)}개")
-                        print(f"📝 텍스트 길이: {len(full_text)} 문자")
-                        sys.stdout.flush()
-                        
-                        # 블록 기준 문장 수 계산
-                        sentences = parse_text_blocks(full_text)
-                        print(f"📋 문장 수 (# 기준 블록): {len(sentences)}개")
-                        print(f"📄 텍스트 미리보기: {full_text[:150]}")
-                        print("=" * 80)
-                        sys.stdout.flush()
-                        
-                        try:
-                            # structuredBlocks 기반 블록 구성 (태그/셀렉터 유지)
-                            def star_to_plain(value: Optional[str]) -> str:
-                                if not value:
-                                    return ""
-                                text_value = str(value).replace("*", " ")
-                                return re.sub(r"\s+", " ", text_value).strip()
-                            
-                            block_entries: List[Dict[str, Any]] = []
-                            if isinstance(structured_blocks, list) and structured_blocks:
-                                for blk in structured_blocks:
-                                    if not isinstance(blk, dict):
-                                        continue
-                                    translated_star = blk.get("text") or blk.get("plainText") or ""
-                                    translated_plain = blk.get("translatedPlainText") or star_to_plain(translated_star)
-                                    original_star = blk.get("originalText") or blk.get("rawText") or translated_star
-                                    original_plain = blk.get("originalPlainText") or blk.get("rawPlainText") or star_to_plain(original_star)
-                                    if not translated_plain and not original_plain:
-                                        continue
-                                    block_entries.append({
-                                        "translated_star": translated_star,
-                                        "translated_plain": translated_plain,
-                                        "original_star": original_star,
-                                        "original_plain": original_plain,
-                                        "meta": {
-                                            "index": blk.get("index"),
-                                            "selector": blk.get("selector"),
-                                            "tag": blk.get("tag"),
-                                            "frameUrl": blk.get("frameUrl"),
-                                            "frameTitle": blk.get("frameTitle"),
-                                            "frameBlockIndex": blk.get("frameBlockIndex"),
-                                            "blockType": blk.get("blockType"),
-                                            "frameId": blk.get("frameId"),
-                                            "linkHref": blk.get("linkHref"),
-                                        }
-                                    })
-                            else:
-                                translated_sentences = parse_text_blocks(full_text)
-                                original_sentences = parse_text_blocks(original_text)
-                                for idx, translated_plain in enumerate(translated_sentences):
-                                    original_plain = original_sentences[idx] if idx < len(original_sentences) else translated_plain
-                                    block_entries.append({
-                                        "translated_star": translated_plain,
-                                        "translated_plain": translated_plain,
-                                        "original_star": original_plain,
-                                        "original_plain": original_plain,
-                                        "meta": {
-                                            "index": idx,
-                                            "linkHref": None
-                                        }
-                                    })
-                            
-                            # 중복 블록 제거 (텍스트 기준)
-                            unique_entries = []
-                            seen_entries = set()
-                            for entry in block_entries:
-                                text_key = (entry.get("original_plain") or entry.get("translated_plain") or "").strip().lower()
-                                if not text_key:
-                                    continue
-                                if text_key in seen_entries:
-                                    continue
-                                seen_entries.add(text_key)
-                                unique_entries.append(entry)
-                            block_entries = unique_entries
-
-                            total_count = len(block_entries)
-                            if total_count == 0:
-                                print(f"⚠️ [경고] 처리할 블록이 없습니다. 문서 {doc_id} 건너뜁니다.")
-                                processed_ids.add(doc_id)
-                                continue
-                            
-                            current_count = [0]
-                            
-                            def update_progress(current, total):
-                                current_count[0] = current
-                                try:
-                                    extension_col.update_one(
-                                        {"_id": doc_id},
-                                        {"$set": {
-                                            "modelingStatus": "processing",
-                                            "modelingProgress.current": current,
-                                            "modelingProgress.total": total_count,
-                                            "processingServerId": SERVER_INSTANCE_ID
-                                        }}
-                                    )
-                                except Exception as e:
-                                    print(f"⚠️ [진행 상황 업데이트 실패] {str(e)}")
-                            
-                            extension_col.update_one(
-                                {"_id": doc_id},
-                                {"$set": {
-                                    "modelingStatus": "processing",
-                                    "modelingProgress": {"current": 0, "total": total_count},
-                                    "processingServerId": SERVER_INSTANCE_ID
-                                }}
-                            )
-                            
-                            print(f"\n🔄 [모델링 시작] {total_count}개 블록 처리 예정\n")
-                            sys.stdout.flush()
-                            
-                            print("🚀 [모델 실행 시작] process_text_and_predict() 호출")
-                            sys.stdout.flush()
-                            
-                            translated_list_for_model = [entry["translated_plain"] for entry in block_entries]
-                            results = process_text_and_predict(translated_list_for_model, progress_callback=update_progress)
-                            
-                            print(f"📝 [원본 텍스트 매핑] 블록: {len(block_entries)}개, 결과: {len(results)}개")
-                            sys.stdout.flush()
-                            
-                            for idx, result in enumerate(results):
-                                if idx >= len(block_entries):
-                                    break
-                                entry = block_entries[idx]
-                                result["original_text"] = entry["original_plain"]
-                                result["structured_meta"] = entry["meta"]
-                                result["translated_text"] = entry["translated_plain"]
-                                if idx < 3:
-                                    preview = entry["original_plain"] or entry["translated_plain"]
-                                    print(f"   [{idx+1}] 원본 매핑: {preview[:50]}")
-                                    sys.stdout.flush()
-                            
-                            print(f"\n✅ [모델링 완료] 총 {len(results)}개 텍스트 처리 완료\n")
-                            sys.stdout.flush()
-                            
-                            if not results:
-                                print(f"⚠️ [경고] 결과가 없습니다. 텍스트를 확인해주세요.\n")
-                                processed_ids.add(doc_id)
-                                continue
-                            
-                            dark_count = sum(1 for r in results if r.get("is_darkpattern") == 1)
-                            normal_count = len(results) - dark_count
-                            print("=" * 80)
-                            print(f"📊 [모델링 결과 통계]")
-                            print(f"   - 총 처리: {len(results)}개")
-                            print(f"   - 다크패턴: {dark_count}개")
-                            print(f"   - 일반: {normal_count}개")
-                            print(f"   - 다크패턴 비율: {round(dark_count/len(results)*100, 1)}%")
-                            print("=" * 80)
-                            
-                            print(f"\n💾 [MongoDB 저장 시작] 결과를 model 컬렉션에 저장 중\n")
-                            saved_count = 0
-                            dark_saved = 0
-                            seen_result_docs = set()
-                            
-                            for idx, result in enumerate(results, 1):
-                                try:
-                                    prob_value = result.get("probability")
-                                    probability_int = int(round(prob_value * 100)) if prob_value is not None else None
-                                    is_dark = result.get("is_darkpattern", 0)
-                                    
-                                    entry = block_entries[idx - 1] if (idx - 1) < len(block_entries) else None
-                                    original_string = result.get("original_text") or (entry.get("original_plain") if entry else "")
-                                    translated_string = result.get("translated_text") or (entry.get("translated_plain") if entry else result.get("text", ""))
-                                    
-                                    if is_dark and idx <= 3:
-                                        print(f"   🔍 [{idx}] 다크패턴 저장 - 원본: {original_string[:60]}")
-                                        sys.stdout.flush()
-
-                                    normalized_original = original_string.strip().lower()
-                                    if normalized_original in seen_result_docs:
-                                        continue
-                                    seen_result_docs.add(normalized_original)
-                                    
-                                    meta_info = result.get("structured_meta") or (entry.get("meta") if entry else None)
-                                    link_href_value = None
-                                    link_selector_value = None
-                                    if isinstance(meta_info, dict):
-                                        link_href_value = meta_info.get("linkHref")
-                                        link_selector_value = meta_info.get("linkSelector")
-
-                                    result_doc = {
-                                        "string": original_string,
-                                        "translatedString": translated_string,
-                                        "type": result.get("type"),
-                                        "predicate": result.get("predicate"),
-                                        "probability": probability_int,
-                                        "is_darkpattern": is_dark,
-                                        "id": str(doc_id),
-                                        "structuredMeta": meta_info,
-                                        "linkHref": link_href_value,
-                                        "linkSelector": link_selector_value
-                                    }
-                                    model_col.insert_one(result_doc)
-                                    saved_count += 1
-                                    if is_dark:
-                                        dark_saved += 1
-                                    
-                                    if idx % 10 == 0 or is_dark == 1:
-                                        status = "🔴 다크패턴" if is_dark else "⚪ 일반"
-                                        print(f"   [{idx}/{len(results)}] {status} 저장: {original_string[:60]}")
-                                except Exception as save_error:
-                                    print(f"❌ [저장 실패 {idx}/{len(results)}] {str(save_error)}")
-                                    import traceback
-                                    traceback.print_exc()
-                            
-                            extension_col.update_one(
-                                {"_id": doc_id},
-                                {"$set": {
-                                    "modelingStatus": "completed",
-                                    "modelingProgress": {"current": len(results), "total": total_count},
-                                    "modelingCompletedAt": datetime.now(),
-                                    "processingServerId": SERVER_INSTANCE_ID
-                                }}
-                            )
-                            
-                            processed_ids.add(doc_id)
-                            print("\n" + "=" * 80)
-                            print(f"✅ [처리 완료] 문서 {doc_id}")
-                            print(f"   - 총 저장: {saved_count}/{len(results)}개")
-                            print(f"   - 다크패턴 저장: {dark_saved}개")
-                            print(f"   - Collection: model")
-                            print(f"   - 저장 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                            print("=" * 80 + "\n")
-                            sys.stdout.flush()
-                            
-                        except Exception as e:
-                            # 모델링 실패 상태 업데이트
-                            try:
-                                extension_col.update_one(
-                                    {"_id": doc_id},
-                                    {"$set": {
-                                        "modelingStatus": "failed",
-                                        "modelingError": str(e),
-                                        "processingServerId": SERVER_INSTANCE_ID
-                                    }}
-                                )
-                            except:
-                                pass
-                            
-                            print(f"\n❌ [오류 발생] 문서 {doc_id} 처리 중 오류:")
-                            print(f"   {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                            print("=" * 80 + "\n")
-                            sys.stdout.flush()
-                            # 오류가 발생해도 processed_ids에 추가하여 무한 반복 방지
-                            processed_ids.add(doc_id)
+                    # 이미 처리된 문서는 스킵
+                    if doc_id in processed_ids:
+                        continue
+                    processed_ids.add(doc_id)
+                    dispatch_document(doc_id, doc, task_queue)
                         
         except Exception as e:
-            print(f"\n❌ [Change Stream 오류]")
-            print(f"   오류: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ [Change Stream 오류] %s", e)
             
             # 연결 오류인 경우 재시도
             if "Connection" in str(e) or "ServerSelectionTimeoutError" in str(type(e).__name__):
                 retry_count += 1
                 if retry_count < max_retries:
-                    print(f"   {5 * retry_count}초 후 재시도합니다 ({retry_count}/{max_retries})\n")
+                    logger.info("   %d초 후 재시도합니다 (%d/%d)", 5 * retry_count, retry_count, max_retries)
                     time.sleep(5 * retry_count)
                     continue
                 else:
-                    print(f"\n❌ [최대 재시도 횟수 초과] MongoDB 연결에 실패했습니다.")
-                    print("서버를 재시작하거나 MongoDB 설정을 확인하세요.\n")
+                    logger.error("❌ [최대 재시도 횟수 초과] MongoDB 연결에 실패했습니다. "
+                                 "서버를 재시작하거나 MongoDB 설정을 확인하세요.")
                     return
             else:
                 # 다른 오류인 경우 재시도
-                print(f"   5초 후 재시도합니다\n")
+                logger.info("   5초 후 재시도합니다")
                 time.sleep(5)
                 continue
 
-def start_watcher():
+def worker_reload(source_dir=None, export_dir=None, min_agreement=0.0, embeddings_path=None):
+    """워커 프로세스의 아티팩트 리로드 (제어 채널 명령)"""
+    result = reload_artifacts(source_dir, export_dir=export_dir, min_agreement=min_agreement,
+                              embeddings_path=embeddings_path)
+    return {"swapped": result["swapped"], "version": predictor.artifacts.version, "validation": result["validation"]}
+
+def worker_profile(seconds, interval):
+    """워커 프로세스의 스택 샘플링 (제어 채널 명령)"""
+    collapsed, samples = sample_stacks(seconds, interval)
+    return {"collapsed": collapsed, "samples": samples}
+
+def inference_worker_main(worker_index, task_queue, control_queue, reply_queue):
+    """
+    멀티 프로세스 모드의 추론 워커 진입점 (spawn된 프로세스에서 실행)
+    각 워커는 자체 MongoClient와 모델을 가지며, train 임베딩은 mmap으로 프로세스 간 공유
+    """
+    worker_id = f"{SERVER_INSTANCE_ID}-w{worker_index}"
+    logger.info("👷 [워커 시작] %s (pid: %d)", worker_id, os.getpid())
+    lease_manager.start_heartbeat()
+    # 워커는 별도 프로세스이므로 아티팩트 교체는 부모가 전달하는 리로드 명령으로만 수행
+    # (부모의 /admin/reload와 파일 감시 모두 워커로 전달 - 워커가 따로 감시하면 같은 변경을 두 번 리로드)
+    serve_worker_control(worker_index, control_queue, reply_queue, {
+        "reload": worker_reload,
+        "status": lambda: predictor.artifacts.info(),
+        "profile": worker_profile,
+    })
+    while True:
+        doc_id = task_queue.get()
+        if doc_id is None:
+            break
+        notify_picked(reply_queue, worker_index, doc_id)
+        try:
+            handle_extension_document(doc_id, None, worker_id)
+        except Exception as e:
+            logger.exception("❌ [%s] 문서 %s 처리 실패: %s", worker_id, doc_id, e)
+
+def start_inference_workers(num_workers):
+    """
+    추론 워커 프로세스 시작
+    - 워커는 spawn으로 시작되어 app.py를 다시 import하며 모델을 각자 로드함
+    - train 임베딩(EMBEDDINGS_MMAP)과 train kNN 캐시(GRAPH_CACHE_DIR)는 파일 mmap으로 공유
+
+    Returns:
+        워커들이 공유하는 작업 큐 (문서 ID)
+    """
+    import multiprocessing
+    global worker_control
+
+    # 자식 프로세스에 상속될 환경변수 (부모는 이미 로드를 마친 상태)
+    os.environ.setdefault("EMBEDDINGS_MMAP", "1")
+    os.environ["MODEL_SERVER_INSTANCE_ID"] = SERVER_INSTANCE_ID
+
+    ctx = multiprocessing.get_context("spawn")
+    task_queue = ctx.Queue()
+    # 리로드 / 버전 조회 / 프로파일처럼 모든 워커에 보내야 하는 명령은 워커별 제어 큐로 전달
+    worker_control = WorkerControl(ctx, num_workers)
+    for worker_index in range(num_workers):
+        proc = ctx.Process(
+            target=inference_worker_main,
+            args=(worker_index, task_queue, *worker_control.worker_args(worker_index)),
+            name=f"inference-worker-{worker_index}",
+            daemon=True,
+        )
+        proc.start()
+    print(f"✅ [시스템] 추론 워커 {num_workers}개 시작됨 (워커 ID: {SERVER_INSTANCE_ID}-w0 ~ w{num_workers - 1})")
+    return task_queue
+
+def watch_artifact_files(interval_seconds):
+    """아티팩트 파일(크기 / 수정 시각)이 바뀌면 리로드 (파일 교체가 끝난 뒤 한 주기 더 안정되면 실행)"""
+    last_seen = predictor.artifacts.version
+    pending = None
+    while True:
+        time.sleep(interval_seconds)
+        current = predictor.artifacts
+        fingerprint = artifact_fingerprint(current.source_dir, current.embeddings_path)
+        if fingerprint == current.version or fingerprint == last_seen:
+            pending = None
+            continue
+        # 복사 중인 파일을 읽지 않도록 두 주기 연속 같은 값일 때만 리로드
+        if pending != fingerprint:
+            pending = fingerprint
+            continue
+        print(f"📁 [아티팩트 변경 감지] {current.source_dir} ({current.version} → {fingerprint})")
+        last_seen = fingerprint
+        pending = None
+        run_artifact_reload()
+
+def start_artifact_watcher():
+    if MODEL_RELOAD_WATCH_SECONDS <= 0:
+        return
+    threading.Thread(
+        target=watch_artifact_files, args=(MODEL_RELOAD_WATCH_SECONDS,), name="artifact-watcher", daemon=True
+    ).start()
+    print(f"✅ [시스템] 모델 아티팩트 변경 감시 시작 ({MODEL_RELOAD_WATCH_SECONDS}초 간격)")
+
+def start_watcher(task_queue=None):
     """백그라운드에서 MongoDB 감시를 시작하는 스레드"""
-    watcher_thread = threading.Thread(target=watch_extension_collection, daemon=True)
+    watcher_thread = threading.Thread(target=watch_extension_collection, args=(task_queue,), daemon=True)
     watcher_thread.start()
     print("✅ [시스템] MongoDB 감시 스레드 시작됨")
     print("   - Extension 컬렉션 감시 중")
-    print("   - 새 문서 감지 시 자동으로 모델링 수행\n")
+    if task_queue is not None:
+        print("   - 새 문서 감지 시 추론 워커 프로세스로 분배\n")
+    else:
+        print("   - 새 문서 감지 시 자동으로 모델링 수행\n")
 
 if __name__ == "__main__":
     import socket
@@ -534,8 +1155,13 @@ if __name__ == "__main__":
         print(f"✅ [포트 확인] 포트 {PORT} 사용 가능")
         print("=" * 80 + "\n")
         
+        # 멀티 프로세스 추론 워커 (MODEL_WORKERS > 1)
+        MODEL_WORKERS = int(os.getenv("MODEL_WORKERS", 1))
+        task_queue = start_inference_workers(MODEL_WORKERS) if MODEL_WORKERS > 1 else None
+
         # Flask 서버 시작 전에 MongoDB 감시 시작
-        start_watcher()
+        start_watcher(task_queue)
+        start_artifact_watcher()
         
         print("\n" + "=" * 80)
         print(f"🚀 [Model 서버 시작]")
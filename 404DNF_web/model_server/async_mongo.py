@@ -0,0 +1,83 @@
+"""
+비동기 MongoDB I/O 계층 (ASYNC_IO=1, motor 필요)
+
+전용 이벤트 루프 스레드에서 Motor 클라이언트로 DB 작업을 실행하고,
+모델을 돌리는 스레드(스케줄러 워커)는 작업을 제출만 한 뒤 바로 다음 계산으로 넘어간다.
+
+- submit(fn): fn(db)가 반환하는 awaitable(Motor 호출 또는 코루틴)을 루프에서 실행 -> concurrent.futures.Future
+  스케줄러 작업은 이 Future를 yield하면 완료될 때까지 워커를 놓아줌 (다른 문서의 추론과 겹침)
+- fire(fn): 결과를 기다리지 않는 쓰기 (진행 상황 / 결과 저장), 실패는 로그로만 남김
+- run_sync(fn, *args): 동기 함수(pymongo 기반 lease 선점 등)를 루프의 executor에서 실행하는 awaitable
+- 대기 중인 작업 수는 max_pending으로 제한 (DB가 느리면 제출하는 쪽이 기다림)
+"""
+import asyncio
+import threading
+
+from model.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncMongo:
+    def __init__(self, url, db_name, max_pending=256):
+        try:
+            from motor.motor_asyncio import AsyncIOMotorClient
+        except ImportError as e:
+            raise RuntimeError("ASYNC_IO=1 사용 시 motor 패키지가 필요합니다 (pip install motor)") from e
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-mongo", daemon=True)
+        self._thread.start()
+
+        async def connect():
+            client = AsyncIOMotorClient(url)
+            await client.admin.command("ping")
+            return client
+
+        self.client = asyncio.run_coroutine_threadsafe(connect(), self.loop).result(timeout=30)
+        self.db = self.client[db_name]
+
+    def submit(self, fn):
+        """fn(db) -> awaitable 을 이벤트 루프에서 실행"""
+        self._slots.acquire()
+        with self._lock:
+            self._pending += 1
+
+        async def run():
+            return await fn(self.db)
+
+        future = asyncio.run_coroutine_threadsafe(run(), self.loop)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future):
+        self._slots.release()
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def fire(self, fn, label=""):
+        """결과를 기다리지 않는 쓰기 - 실패 시 경고 로그"""
+        def report(future):
+            error = future.exception()
+            if error is not None:
+                logger.warning("⚠️ [비동기 쓰기 실패] %s: %s", label, error)
+
+        future = self.submit(fn)
+        future.add_done_callback(report)
+        return future
+
+    def run_sync(self, fn, *args):
+        """동기 함수를 루프 기본 executor(스레드)에서 실행하는 awaitable"""
+        return self.loop.run_in_executor(None, fn, *args)
+
+    def flush(self, timeout=None):
+        """대기 중인 작업이 모두 끝날 때까지 대기 (종료 시) -> 남은 작업 수"""
+        with self._lock:
+            self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+            return self._pending
@@ -0,0 +1,60 @@
+"""
+같은 페이지(tabUrl) 재수집 시 블록 단위 delta 처리
+
+- 최근 DELTA_WINDOW_HOURS 안에 같은 tabUrl을 같은 모델 버전으로 처리한 완료 문서가 있으면 기준 실행으로 사용
+  (모델 버전 = predictor.inference_version(): 아티팩트 버전 + 런타임 / 양자화 / GCN 추론 방식 /
+  근접 중복 threshold / 블록 분할 / 배치 설정)
+- 블록 키(정규화한 번역 텍스트 + selector)가 기준 실행의 model 문서와 같으면 분류 결과를 그대로 가져오고
+  새로 생기거나 바뀐 블록만 분류
+- 모델 아티팩트나 추론 설정이 바뀌면(버전이 다르면) 기준 실행으로 쓰지 않음 (다른 설정의 결과가 섞이지 않도록)
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+# 기준 실행에서 가져오는 분류 결과 필드
+CARRIED_FIELDS = ("type", "predicate", "probability", "is_darkpattern")
+
+
+def block_key(text, selector):
+    """정규화한 번역 텍스트 + selector (selector가 없는 텍스트 블록은 텍스트만)"""
+    normalized = re.sub(r"\s+", " ", str(text or "")).strip().lower()
+    return normalized, selector or None
+
+
+def find_base_run(extension_col, doc_id, tab_url, model_version, window_hours):
+    """같은 tabUrl / 모델 버전으로 최근 완료된 이전 문서 ID (없으면 None)"""
+    if not tab_url:
+        return None
+    oldest_id = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(hours=window_hours))
+    base = extension_col.find_one(
+        {
+            "tabUrl": tab_url,
+            "_id": {"$lt": doc_id, "$gte": oldest_id},
+            "modelingStatus": "completed",
+            "modelingModelVersion": model_version,
+        },
+        {"_id": 1},
+        sort=[("_id", -1)],
+    )
+    return base["_id"] if base else None
+
+
+def load_base_results(model_col, base_id):
+    """기준 실행의 model 문서 -> {블록 키: 분류 결과}"""
+    projection = {"translatedString": 1, "structuredMeta.selector": 1, **{f: 1 for f in CARRIED_FIELDS}}
+    prior = {}
+    for doc in model_col.find({"id": str(base_id)}, projection):
+        meta = doc.get("structuredMeta") or {}
+        key = block_key(doc.get("translatedString"), meta.get("selector"))
+        prior.setdefault(key, {f: doc.get(f) for f in CARRIED_FIELDS})
+    return prior
+
+
+def carried_result(prior_result):
+    """저장된 분류 결과 -> process_text_and_predict 결과 모양 (probability는 0~100 정수로 저장됨)"""
+    result = dict(prior_result)
+    if result.get("probability") is not None:
+        result["probability"] = result["probability"] / 100
+    return result
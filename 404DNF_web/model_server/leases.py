@@ -0,0 +1,180 @@
+"""
+extension 문서 처리권 lease 관리 (멀티 노드 수평 확장용)
+
+- 선점 시 processingServerId와 함께 만료 시각(leaseExpiresAt)을 기록
+- 처리 중인 문서는 heartbeat 스레드가 주기적으로 만료 시각을 연장
+- 만료된 lease(처리 중 인스턴스가 죽은 경우)는 다른 인스턴스가 인수
+- 선택적으로 change stream을 _id 기준으로 파티셔닝해 각 노드가 자기 몫의 이벤트만 수신
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from model.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# 처리가 끝난 문서는 lease 인수 대상이 아님
+FINISHED_STATUSES = ["completed", "failed"]
+
+
+class LeaseLostError(Exception):
+    """처리 중 lease를 다른 인스턴스에 빼앗긴 경우"""
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value):
+    # pymongo는 기본적으로 naive UTC datetime을 반환
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def partition_of(doc_id, partition_count):
+    """ObjectId 마지막 바이트(카운터 하위 바이트) 기준 파티션 번호"""
+    return int(str(doc_id)[-2:], 16) % partition_count
+
+
+def partition_match_stage(partition_count, partition_index):
+    """
+    change stream $match 단계: 이 노드 파티션의 문서만 수신
+    ObjectId 16진 문자열의 마지막 두 글자(0~255)를 파티션 수로 나눈 나머지로 분배
+    """
+    suffixes = [f"{v:02x}" for v in range(256) if v % partition_count == partition_index]
+    return {"$match": {"$expr": {"$in": [
+        {"$substrCP": [{"$toString": "$fullDocument._id"}, 22, 2]},
+        suffixes,
+    ]}}}
+
+
+class LeaseManager:
+    def __init__(self, collection, lease_seconds=60, heartbeat_seconds=None, unclaimed_grace_seconds=120,
+                 takeover_max_age_hours=24, partition_count=1, partition_index=0):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or max(1, lease_seconds // 3)
+        self.unclaimed_grace_seconds = unclaimed_grace_seconds
+        self.takeover_max_age_hours = takeover_max_age_hours
+        self.partition_count = max(1, partition_count)
+        self.partition_index = partition_index
+        self._held = {}  # doc_id -> server_id
+        self._lost = set()
+        self._lock = threading.Lock()
+        self._heartbeat_thread = None
+
+    def _expiry(self):
+        return _utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def is_expired(self, doc):
+        """문서 스냅샷 기준 lease 만료 여부 (lease 필드가 없으면 만료되지 않은 것으로 간주)"""
+        expires_at = _as_utc(doc.get("leaseExpiresAt"))
+        return expires_at is not None and expires_at < _utcnow()
+
+    def claim(self, doc_id, server_id):
+        """
+        미선점 / 자기 소유 / 만료된 lease인 경우 원자적으로 선점
+
+        Returns:
+            선점 성공 여부
+        """
+        now = _utcnow()
+        result = self.collection.update_one(
+            {
+                "_id": doc_id,
+                "modelingStatus": {"$nin": FINISHED_STATUSES},
+                "$or": [
+                    {"processingServerId": {"$exists": False}},
+                    {"processingServerId": server_id},
+                    {"leaseExpiresAt": {"$lt": now}},
+                ],
+            },
+            {"$set": {"processingServerId": server_id, "leaseExpiresAt": self._expiry()}},
+        )
+        if result.matched_count == 0:
+            return False
+        with self._lock:
+            self._held[doc_id] = server_id
+            self._lost.discard(doc_id)
+        return True
+
+    def release(self, doc_id, server_id):
+        """처리 종료 후 lease 해제 (완료/실패 상태는 호출측에서 기록)"""
+        with self._lock:
+            self._held.pop(doc_id, None)
+            self._lost.discard(doc_id)
+        self.collection.update_one(
+            {"_id": doc_id, "processingServerId": server_id},
+            {"$unset": {"leaseExpiresAt": ""}},
+        )
+
+    def check(self, doc_id):
+        """heartbeat에서 lease를 잃은 것으로 확인되면 LeaseLostError"""
+        with self._lock:
+            lost = doc_id in self._lost
+        if lost:
+            raise LeaseLostError(f"문서 {doc_id}의 lease를 다른 인스턴스가 인수했습니다.")
+
+    def renew_all(self):
+        """보유 중인 모든 lease 연장 - 연장에 실패한 문서는 lost로 표시"""
+        with self._lock:
+            held = list(self._held.items())
+        for doc_id, server_id in held:
+            try:
+                result = self.collection.update_one(
+                    {"_id": doc_id, "processingServerId": server_id},
+                    {"$set": {"leaseExpiresAt": self._expiry()}},
+                )
+            except Exception as e:
+                logger.warning("⚠️ [lease 연장 실패] 문서 %s: %s", doc_id, e)
+                continue
+            if result.matched_count == 0:
+                logger.warning("⚠️ [lease 상실] 문서 %s는 다른 인스턴스가 인수했습니다.", doc_id)
+                with self._lock:
+                    self._lost.add(doc_id)
+
+    def start_heartbeat(self):
+        if self._heartbeat_thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.heartbeat_seconds)
+                self.renew_all()
+
+        self._heartbeat_thread = threading.Thread(target=loop, name="lease-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def watch_pipeline(self):
+        """insert 이벤트 + (파티셔닝 시) 이 노드 파티션만"""
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        if self.partition_count > 1:
+            pipeline.append(partition_match_stage(self.partition_count, self.partition_index))
+        return pipeline
+
+    def find_takeover_candidates(self, limit=20):
+        """
+        인수 대상 문서 ID
+        - lease가 만료된 처리 중 문서
+        - 유예 시간이 지나도록 아무도 선점하지 않은 문서 (담당 파티션 노드가 죽은 경우 포함)
+        takeover_max_age_hours보다 오래된 문서는 대상에서 제외 (배포 직후 과거 문서 일괄 처리 방지)
+        """
+        now = _utcnow()
+        grace_id = ObjectId.from_datetime(now - timedelta(seconds=self.unclaimed_grace_seconds))
+        oldest_id = ObjectId.from_datetime(now - timedelta(hours=self.takeover_max_age_hours))
+        cursor = self.collection.find(
+            {
+                "_id": {"$gte": oldest_id},
+                "modelingStatus": {"$nin": FINISHED_STATUSES},
+                "$or": [
+                    {"leaseExpiresAt": {"$lt": now}},
+                    {"processingServerId": {"$exists": False}, "_id": {"$lt": grace_id}},
+                ],
+            },
+            {"_id": 1},
+        ).limit(limit)
+        return [doc["_id"] for doc in cursor]
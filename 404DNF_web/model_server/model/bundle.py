@@ -0,0 +1,172 @@
+"""
+모델 번들 (버전 관리되는 단일 디렉토리 아티팩트)
+
+기존 아티팩트는 pickle 체크포인트(hp / state_dict / label_encoder_classes 키 추정) + X_train .npy + 메타 JSON +
+법률 CSV를 따로 읽는다. 번들은 빌드 시 이를 정규화해 두 파일로 저장한다.
+
+    <bundle>/manifest.json  형식 / 버전, 하이퍼파라미터, 클래스, kNN 설정, 법률 테이블, 인코더,
+                            배열 목록(dtype / shape / offset / sha256), 전체 해시(bundleHash)
+    <bundle>/tensors.bin    배열 원본 바이트를 64바이트 정렬로 이어 붙인 파일 (safetensors와 같은 방식)
+    <bundle>/encoder/       (선택) SentenceTransformer 로컬 사본 - 허브 이름 조회 없이 로드
+
+로드는 tensors.bin을 np.memmap(copy-on-write) 한 번으로 열고 각 배열을 복사 없이 view로 꺼낸다.
+ResGCN 가중치도 load_state_dict(assign=True)로 mmap 버퍼를 그대로 사용 (CPU 기준).
+
+배열 이름:
+    model/<state_dict 키>     ResGCN 가중치
+    train/X                  train 임베딩
+    train/labels             train 라벨 (클래스 인덱스, 선택) - NEAR_DUP_THRESHOLD 지름길
+    knn/dist, knn/idx        train 자기 자신 kNN (k+1개, 자기 포함) - GCN_INFERENCE=cached 그래프 캐시 재계산 생략
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import torch
+
+BUNDLE_FORMAT = "404dnf-model-bundle"
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "tensors.bin"
+ENCODER_DIR = "encoder"
+ALIGN = 64
+
+
+class BundleError(Exception):
+    """번들 형식 / 무결성 오류"""
+
+
+def is_bundle(path):
+    return bool(path) and os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _bundle_hash(manifest):
+    """배열 해시 + 나머지 manifest 내용 해시 (bundleHash / createdAt 제외 → 같은 입력이면 같은 값)"""
+    payload = {k: v for k, v in manifest.items() if k not in ("bundleHash", "createdAt")}
+    return _sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+def write_bundle(out_dir, arrays, manifest, encoder_dir=None):
+    """
+    번들 저장 (임시 디렉토리에 모두 쓴 뒤 out_dir로 이동 - 쓰는 도중의 번들은 보이지 않음)
+
+    Args:
+        arrays: {이름: np.ndarray}
+        manifest: 배열 외 manifest 필드 (hp, classes, meta, laws, encoder 등)
+        encoder_dir: SentenceTransformer.save()로 만든 디렉토리 (번들 안으로 복사)
+
+    Returns:
+        저장한 manifest
+    """
+    tmp_dir = f"{out_dir.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    entries = {}
+    offset = 0
+    with open(os.path.join(tmp_dir, DATA_NAME), "wb") as f:
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            data = arr.tobytes()
+            pad = (-offset) % ALIGN
+            f.write(b"\0" * pad)
+            offset += pad
+            f.write(data)
+            entries[name] = {
+                "dtype": arr.dtype.str,
+                "shape": list(arr.shape),
+                "offset": offset,
+                "nbytes": len(data),
+                "sha256": _sha256(data),
+            }
+            offset += len(data)
+
+    if encoder_dir:
+        shutil.copytree(encoder_dir, os.path.join(tmp_dir, ENCODER_DIR))
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "formatVersion": BUNDLE_FORMAT_VERSION,
+        **manifest,
+        "data": {"file": DATA_NAME, "size": offset, "entries": entries},
+        "createdAt": datetime.now().isoformat(),
+    }
+    if encoder_dir:
+        manifest.setdefault("encoder", {})["path"] = ENCODER_DIR
+    manifest["bundleHash"] = _bundle_hash(manifest)
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    return manifest
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ModelBundle:
+    """열린 번들 - 배열은 tensors.bin mmap의 view (복사 없음)"""
+
+    def __init__(self, path, verify=False):
+        self.path = path
+        self.manifest = read_manifest(path)
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise BundleError(f"번들 형식이 아닙니다: {path}")
+        if self.manifest.get("formatVersion", 0) > BUNDLE_FORMAT_VERSION:
+            raise BundleError(f"지원하지 않는 번들 버전: {self.manifest.get('formatVersion')} (지원: {BUNDLE_FORMAT_VERSION})")
+        if self.manifest.get("bundleHash") != _bundle_hash(self.manifest):
+            raise BundleError("manifest 해시가 일치하지 않습니다 (수정되었거나 손상됨)")
+
+        data = self.manifest["data"]
+        data_path = os.path.join(path, data["file"])
+        if os.path.getsize(data_path) != data["size"]:
+            raise BundleError(f"{data['file']} 크기가 manifest와 다릅니다 ({os.path.getsize(data_path)} != {data['size']})")
+        self.entries = data["entries"]
+        # copy-on-write: torch.from_numpy가 쓰기 가능한 버퍼를 요구, 수정해도 파일에는 반영되지 않음
+        self._mm = np.memmap(data_path, dtype=np.uint8, mode="c") if data["size"] else np.zeros(0, np.uint8)
+        if verify:
+            self.verify()
+
+    @property
+    def version(self):
+        return self.manifest["bundleHash"][:12]
+
+    def verify(self):
+        """배열 내용 sha256 검사 (전체 파일을 읽으므로 기본은 생략)"""
+        for name, entry in self.entries.items():
+            chunk = self._mm[entry["offset"]:entry["offset"] + entry["nbytes"]]
+            if _sha256(chunk.tobytes()) != entry["sha256"]:
+                raise BundleError(f"배열 해시가 일치하지 않습니다: {name}")
+
+    def has(self, name):
+        return name in self.entries
+
+    def array(self, name):
+        entry = self.entries[name]
+        chunk = self._mm[entry["offset"]:entry["offset"] + entry["nbytes"]]
+        return chunk.view(np.dtype(entry["dtype"])).reshape(entry["shape"])
+
+    def state_dict(self, prefix="model/"):
+        return {
+            name[len(prefix):]: torch.from_numpy(self.array(name))
+            for name in self.entries if name.startswith(prefix)
+        }
+
+    def encoder_path(self):
+        """번들 안 인코더 디렉토리 (없으면 None)"""
+        rel = (self.manifest.get("encoder") or {}).get("path")
+        return os.path.join(self.path, rel) if rel else None
+
+    def encoder_name(self, default):
+        return (self.manifest.get("encoder") or {}).get("name") or default
@@ -0,0 +1,87 @@
+"""
+CPU 추론 스레드 / 동시성 설정
+- BLAS/OpenMP 스레드 수 (numpy, torch import 전에 환경변수로 지정해야 적용됨)
+- torch intra-op / inter-op 스레드 수
+- sklearn NearestNeighbors n_jobs
+- 모델 호출 동시 실행 수 제한 (세마포어)
+
+Flask 요청 스레드, watcher 스레드, EasyOCR / Marian / mpnet이 한 프로세스에서 각자 스레드 풀을 쓰면
+코어 수보다 훨씬 많은 스레드가 경쟁하므로 시작 시 한 곳에서 제한한다.
+이 모듈은 numpy / torch를 import 시점에 불러오지 않는다.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+# BLAS_NUM_THREADS 하나로 지정하면 아래 변수들에 반영 (개별 변수가 이미 있으면 그대로 사용)
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+
+def _env_int(name, default=None):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️  {name} 값이 정수가 아닙니다: {value} (무시)")
+        return default
+
+
+TORCH_NUM_THREADS = _env_int("TORCH_NUM_THREADS")
+TORCH_INTEROP_THREADS = _env_int("TORCH_INTEROP_THREADS")
+BLAS_NUM_THREADS = _env_int("BLAS_NUM_THREADS")
+# sklearn 기본값(None)은 단일 스레드, -1은 전체 코어
+KNN_N_JOBS = _env_int("KNN_N_JOBS")
+# 0 이하면 제한 없음
+MODEL_CONCURRENCY = _env_int("MODEL_CONCURRENCY", 0)
+
+_model_semaphore = threading.BoundedSemaphore(MODEL_CONCURRENCY) if MODEL_CONCURRENCY > 0 else None
+
+
+def configure_blas_env():
+    """BLAS/OpenMP 스레드 환경변수 설정 (numpy / torch import 전에 호출)"""
+    if not BLAS_NUM_THREADS:
+        return
+    for var in BLAS_ENV_VARS:
+        os.environ.setdefault(var, str(BLAS_NUM_THREADS))
+
+
+def configure_torch_threads(torch):
+    """torch intra-op / inter-op 스레드 수 설정 (inter-op는 병렬 작업 시작 전에만 변경 가능)"""
+    if TORCH_NUM_THREADS:
+        torch.set_num_threads(TORCH_NUM_THREADS)
+    if TORCH_INTEROP_THREADS:
+        try:
+            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+        except RuntimeError as e:
+            print(f"⚠️  TORCH_INTEROP_THREADS 적용 실패 (이미 inter-op 작업이 시작됨): {e}")
+
+
+@contextmanager
+def model_slot():
+    """모델 호출 구간 - MODEL_CONCURRENCY개까지만 동시에 실행"""
+    if _model_semaphore is None:
+        yield
+        return
+    with _model_semaphore:
+        yield
+
+
+def thread_settings(torch=None):
+    """현재 스레드 / 동시성 설정 (/health 노출용)"""
+    settings = {
+        "blasThreads": {var: os.environ.get(var) for var in BLAS_ENV_VARS if os.environ.get(var)},
+        "knnNJobs": KNN_N_JOBS,
+        "modelConcurrency": MODEL_CONCURRENCY if MODEL_CONCURRENCY > 0 else None,
+    }
+    if torch is not None:
+        settings["torchThreads"] = torch.get_num_threads()
+        settings["torchInteropThreads"] = torch.get_num_interop_threads()
+    return settings
@@ -0,0 +1,109 @@
+"""
+inductive 추론용 train 참조 집합 축소 (coreset / prototype)
+
+forward_on_concat의 요청당 비용은 len(X_train)에 비례하므로(kNN 재구성 + ResGCN 전체 forward)
+클래스별로 대표 샘플만 남긴 축소 집합을 만들어 전체 집합 대신 로드할 수 있게 한다.
+
+- kmeans : 클래스별 k-means, 각 중심에 가장 가까운 실제 샘플(medoid) 또는 중심 자체
+- kcenter: 클래스별 greedy k-center (가장 먼 점 추가) - 희소한 영역의 샘플도 남김
+클래스별 개수는 클래스 크기에 비례해 배분하되 min_per_class 이상 보장
+"""
+import numpy as np
+from sklearn.cluster import KMeans
+
+SUPPORTED_METHODS = ("kmeans", "kcenter")
+
+
+def _normalize(X):
+    X = np.asarray(X, dtype=np.float32)
+    return X / (np.linalg.norm(X, axis=1, keepdims=True) + 1e-12)
+
+
+def allocate_per_class(labels, size, min_per_class=1):
+    """전체 size를 클래스 크기에 비례해 배분 -> {label: 개수} (클래스 크기 초과 불가)"""
+    classes, counts = np.unique(labels, return_counts=True)
+    size = max(size, min_per_class * len(classes))
+    raw = counts / counts.sum() * size
+    alloc = np.minimum(np.maximum(np.floor(raw).astype(int), min_per_class), counts)
+    # 반올림으로 남은 개수는 소수부가 큰 클래스부터 배분
+    remainder = size - alloc.sum()
+    for i in np.argsort(-(raw - np.floor(raw))):
+        if remainder <= 0:
+            break
+        if alloc[i] < counts[i]:
+            alloc[i] += 1
+            remainder -= 1
+    return {label: int(n) for label, n in zip(classes, alloc)}
+
+
+def kmeans_select(X, n, seed=0, medoid=True):
+    """
+    k-means n개 중심 -> 선택 결과
+    Returns:
+        (indices, points) - medoid면 중심에 가장 가까운 실제 샘플, 아니면 indices는 None이고 중심 좌표
+    """
+    if n >= len(X):
+        return np.arange(len(X)), X
+    km = KMeans(n_clusters=n, n_init=4, random_state=seed).fit(X)
+    if not medoid:
+        return None, km.cluster_centers_.astype(np.float32)
+    indices = []
+    for c in range(n):
+        members = np.flatnonzero(km.labels_ == c)
+        dist = np.linalg.norm(X[members] - km.cluster_centers_[c], axis=1)
+        indices.append(members[int(np.argmin(dist))])
+    indices = np.array(sorted(set(indices)))
+    return indices, X[indices]
+
+
+def kcenter_select(X, n, seed=0):
+    """greedy k-center (cosine 거리) -> 선택한 샘플 인덱스"""
+    if n >= len(X):
+        return np.arange(len(X))
+    Xn = _normalize(X)
+    rng = np.random.default_rng(seed)
+    # 시작점: 클래스 중심에 가장 가까운 샘플 (무작위 시작보다 안정적)
+    centroid = Xn.mean(axis=0)
+    first = int(np.argmax(Xn @ centroid)) if np.linalg.norm(centroid) > 0 else int(rng.integers(len(X)))
+    selected = [first]
+    min_dist = 1.0 - Xn @ Xn[first]
+    for _ in range(n - 1):
+        nxt = int(np.argmax(min_dist))
+        selected.append(nxt)
+        min_dist = np.minimum(min_dist, 1.0 - Xn @ Xn[nxt])
+    return np.array(sorted(selected))
+
+
+def build_coreset(X, labels, size, method="kmeans", min_per_class=1, seed=0, medoid=True):
+    """
+    클래스별 축소 참조 집합 구성
+
+    Args:
+        X: [N, D] train 임베딩
+        labels: [N] 클래스 라벨 (정답 또는 현재 모델의 pseudo-label)
+        size: 목표 전체 크기
+
+    Returns:
+        (X_reduced, indices, per_class) - indices는 원본 인덱스 (kmeans 중심 모드면 None)
+    """
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"지원하지 않는 coreset 방식: {method} (지원: {', '.join(SUPPORTED_METHODS)})")
+    X = np.asarray(X, dtype=np.float32)
+    labels = np.asarray(labels)
+    alloc = allocate_per_class(labels, size, min_per_class)
+
+    parts, index_parts = [], []
+    for label, n in alloc.items():
+        members = np.flatnonzero(labels == label)
+        if method == "kcenter":
+            local = kcenter_select(X[members], n, seed)
+            index_parts.append(members[local])
+            parts.append(X[members[local]])
+        else:
+            local, points = kmeans_select(X[members], n, seed, medoid)
+            index_parts.append(None if local is None else members[local])
+            parts.append(points)
+
+    indices = None if any(p is None for p in index_parts) else np.concatenate(index_parts)
+    per_class = {str(label): int(len(p)) for label, p in zip(alloc, parts)}
+    return np.vstack(parts).astype(np.float32), indices, per_class
@@ -0,0 +1,131 @@
+"""
+SentenceTransformer(mpnet) 인코더와 ResGCN의 ONNX / TorchScript export 및 eager 모델과의 parity 검사
+실행: python -m tools.export_models --format onnx
+"""
+import copy
+import os
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from model.resgcn import AdjResGCN, gcn_norm_adj
+from model.runtime import artifact_paths
+
+DEFAULT_OPSET = 17
+
+
+class MeanPoolEncoder(nn.Module):
+    """
+    SentenceTransformer(Transformer -> mean Pooling -> Normalize) 파이프라인을 단일 모듈로 감쌈
+    토크나이징은 런타임에서 st_model.tokenizer로 수행
+    """
+    def __init__(self, st_model):
+        super().__init__()
+        from sentence_transformers.models import Normalize, Pooling
+
+        pooling = [m for m in st_model if isinstance(m, Pooling)]
+        if pooling and not pooling[0].pooling_mode_mean_tokens:
+            raise ValueError("mean pooling 인코더만 export를 지원합니다.")
+        self.transformer = st_model[0].auto_model
+        self.normalize = any(isinstance(m, Normalize) for m in st_model)
+
+    def forward(self, input_ids, attention_mask):
+        token_emb = self.transformer(input_ids=input_ids, attention_mask=attention_mask, return_dict=False)[0]
+        mask = attention_mask.unsqueeze(-1).to(token_emb.dtype)
+        emb = (token_emb * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        if self.normalize:
+            emb = F.normalize(emb, p=2, dim=1)
+        return emb
+
+
+def export_encoder(st_model, out_path, fmt, opset=DEFAULT_OPSET):
+    """인코더를 ONNX 또는 TorchScript로 저장 (CPU 기준)"""
+    # 사본을 CPU로 옮김 - .to("cpu")는 모듈을 제자리에서 옮기므로 서빙 중인 st_model(GPU)이 CPU로 이동하지 않도록
+    wrapper = copy.deepcopy(MeanPoolEncoder(st_model)).to("cpu").eval()
+    sample = st_model.tokenizer(["Only 2 left in stock!", "Hurry, sale ends soon"],
+                                padding=True, return_tensors="pt")
+    args = (sample["input_ids"], sample["attention_mask"])
+    with torch.no_grad():
+        if fmt == "torchscript":
+            traced = torch.jit.trace(wrapper, args, strict=False)
+            traced.save(out_path)
+        else:
+            torch.onnx.export(
+                wrapper, args, out_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["embedding"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "seq"},
+                    "attention_mask": {0: "batch", 1: "seq"},
+                    "embedding": {0: "batch"},
+                },
+                opset_version=opset,
+            )
+    return out_path
+
+
+def export_resgcn(model, out_path, fmt, in_dim, opset=DEFAULT_OPSET):
+    """ResGCN을 정규화 인접행렬 입력 형태(AdjResGCN)로 저장 (CPU 기준)"""
+    adj_model = AdjResGCN(model).to("cpu").eval()
+    n = 8
+    x = torch.randn(n, in_dim)
+    ring = torch.arange(n)
+    edge_index = torch.stack([torch.cat([ring, (ring + 1) % n]), torch.cat([(ring + 1) % n, ring])])
+    with torch.no_grad():
+        if fmt == "torchscript":
+            scripted = torch.jit.script(adj_model)
+            scripted.save(out_path)
+        else:
+            adj = gcn_norm_adj(edge_index, n, dense=True)
+            torch.onnx.export(
+                adj_model, (x, adj), out_path,
+                input_names=["x", "adj"],
+                output_names=["logits"],
+                dynamic_axes={"x": {0: "nodes"}, "adj": {0: "nodes", 1: "nodes"}, "logits": {0: "nodes"}},
+                opset_version=opset,
+            )
+    return out_path
+
+
+def export_all(st_model, model, export_dir, fmt, in_dim, opset=DEFAULT_OPSET):
+    """인코더 + ResGCN export 후 (encoder_path, resgcn_path) 반환"""
+    os.makedirs(export_dir, exist_ok=True)
+    encoder_path, gcn_path = artifact_paths(fmt, export_dir)
+    export_encoder(st_model, encoder_path, fmt, opset=opset)
+    export_resgcn(model, gcn_path, fmt, in_dim, opset=opset)
+    return encoder_path, gcn_path
+
+
+def check_parity(eager_encode, backend_encode, eager_logits, backend_logits, texts, build_graph):
+    """
+    eager 모델과 export 백엔드의 출력 비교
+
+    Args:
+        eager_encode / backend_encode: texts -> [B, D] 임베딩
+        eager_logits / backend_logits: (x, edge_index) -> [N, C] 로짓
+        texts: 비교용 문장 리스트
+        build_graph: query 임베딩 -> (X_cat, edge_index)
+
+    Returns:
+        인코더 / GCN 차이 지표 dict
+    """
+    emb_eager = np.asarray(eager_encode(texts), dtype=np.float32)
+    emb_backend = np.asarray(backend_encode(texts), dtype=np.float32)
+    cos = np.sum(emb_eager * emb_backend, axis=1) / (
+        np.linalg.norm(emb_eager, axis=1) * np.linalg.norm(emb_backend, axis=1) + 1e-12)
+
+    # 동일한 그래프(eager 임베딩 기준)에서 GCN만 비교
+    X_cat, edge_index = build_graph(emb_eager)
+    logits_eager = np.asarray(eager_logits(X_cat, edge_index), dtype=np.float32)
+    logits_backend = np.asarray(backend_logits(X_cat, edge_index), dtype=np.float32)
+    n_query = len(texts)
+
+    return {
+        "encoder_max_abs_diff": float(np.max(np.abs(emb_eager - emb_backend))),
+        "encoder_min_cosine": float(np.min(cos)),
+        "gcn_max_abs_diff": float(np.max(np.abs(logits_eager - logits_backend))),
+        "gcn_argmax_agreement": float(np.mean(
+            logits_eager[-n_query:].argmax(axis=1) == logits_backend[-n_query:].argmax(axis=1))),
+    }
@@ -0,0 +1,173 @@
+"""
+kNN 그래프 구성 유틸리티 + inductive 추론용 train 그래프 캐시
+
+forward_on_concat은 요청마다 train + query 전체에 대해 kNN을 다시 구하고
+GCNConv가 매 forward마다 gcn_norm(self-loop 추가 + degree 정규화)을 재계산한다.
+TrainGraphCache는 train 부분의 kNN 인덱스 / 정규화 인접행렬 / 첫 레이어 projection을 한 번만 계산하고,
+query 행은 train kNN 인덱스 조회로 엣지를 붙여 degree가 바뀐 노드만 재스케일한다.
+
+근사: query끼리의 엣지와 query로 인해 밀려나는 train-train 엣지는 반영하지 않음
+(mutual 조건은 'query가 train 노드 j의 기존 k번째 이웃보다 가까운가'로 판정)
+"""
+import hashlib
+import os
+
+import numpy as np
+import torch
+from sklearn.neighbors import NearestNeighbors
+
+from model.resgcn import FoldedResGCN
+
+# GCNConv(improved=True) self-loop 가중치
+SELF_LOOP_FILL = 2.0
+
+
+# kNN 그래프 구성 함수 (노트북 구조)
+def knn_indices(emb, k=10, metric="cosine", n_jobs=None):
+    """kNN 인덱스 계산"""
+    nn = NearestNeighbors(n_neighbors=k+1, metric=metric, n_jobs=n_jobs)
+    nn.fit(emb)
+    _, idx = nn.kneighbors(emb)
+    return idx[:, 1:]  # drop self
+
+def build_edge_index(neigh_idx: np.ndarray, mutual: bool):
+    """엣지 인덱스 구성 (노트북 구조)"""
+    N, k = neigh_idx.shape
+    rows = np.repeat(np.arange(N), k)
+    cols = neigh_idx.reshape(-1)
+    # mutual/non-mutual 대칭 처리
+    if not mutual:
+        ei = np.vstack([np.concatenate([rows, cols]),
+                        np.concatenate([cols, rows])])
+        return np.unique(ei, axis=1)
+    # mutual kNN
+    S = set(zip(rows.tolist(), cols.tolist()))
+    mutual_pairs = [(i, j) for (i, j) in S if (j, i) in S and i != j]
+    if len(mutual_pairs) == 0:
+        ei = np.vstack([np.concatenate([rows, cols]),
+                        np.concatenate([cols, rows])])
+        return np.unique(ei, axis=1)
+    r = np.array([p[0] for p in mutual_pairs])
+    c = np.array([p[1] for p in mutual_pairs])
+    ei = np.vstack([np.concatenate([r, c]),
+                    np.concatenate([c, r])])
+    return np.unique(ei, axis=1)
+
+
+class TrainGraphCache:
+    """train 임베딩에 대한 kNN 인덱스 / 정규화 인접행렬 / 첫 레이어 projection 캐시"""
+
+    def __init__(self, model, X_train, knn_k=10, metric="cosine", mutual=True, device="cpu", n_jobs=None,
+                 cache_dir=None, neighbors=None):
+        self.knn_k = knn_k
+        self.metric = metric
+        self.mutual = mutual
+        self.device = torch.device(device)
+        self.num_train = len(X_train)
+
+        # train kNN 인덱스 (query 이웃 조회에 재사용)
+        self.nn = NearestNeighbors(n_neighbors=knn_k + 1, metric=metric, n_jobs=n_jobs)
+        self.nn.fit(X_train)
+        # neighbors: 미리 계산한 train 자기 자신 kNN (dist, idx) - 모델 번들의 knn/* 배열
+        dist, idx = neighbors if neighbors is not None else self._train_neighbors(X_train, cache_dir)
+        # 각 train 노드의 k번째 이웃 거리 (mutual 판정 기준)
+        self.kth_dist = dist[:, -1].astype(np.float64)
+
+        edge_index = build_edge_index(idx[:, 1:], mutual)
+        row = torch.as_tensor(edge_index[0], dtype=torch.long)
+        col = torch.as_tensor(edge_index[1], dtype=torch.long)
+        weight = torch.ones(row.numel())
+        # add_remaining_self_loops와 동일하게 self-loop 추가
+        is_loop = row == col
+        loop_weight = torch.full((self.num_train,), SELF_LOOP_FILL)
+        if bool(is_loop.any()):
+            loop_weight[row[is_loop]] = weight[is_loop]
+        loops = torch.arange(self.num_train)
+        self.row = torch.cat([row[~is_loop], loops])
+        self.col = torch.cat([col[~is_loop], loops])
+        weight = torch.cat([weight[~is_loop], loop_weight])
+
+        # 정규화 값 미리 계산 (target 기준 degree)
+        self.deg = torch.zeros(self.num_train).scatter_add_(0, self.col, weight)
+        dinv = self.deg.pow(-0.5)
+        self.norm = dinv[self.row] * weight * dinv[self.col]
+
+        # BatchNorm folding 모델 + train 노드 첫 레이어 projection 캐시
+        self.model = FoldedResGCN(model).to(self.device)
+        self.X_train = torch.as_tensor(np.asarray(X_train), dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            self.train_proj = self.model.project_first(self.X_train)
+
+    def _train_neighbors(self, X_train, cache_dir):
+        """
+        train 자기 자신 kNN (dist, idx)
+        cache_dir가 있으면 .npy로 저장하고 이후에는 mmap으로 로드 (워커 프로세스 간 공유, 재시작 시 재계산 생략)
+        """
+        if not cache_dir:
+            return self.nn.kneighbors(X_train)
+
+        fingerprint = hashlib.sha1(np.ascontiguousarray(X_train).tobytes())
+        fingerprint.update(f"{X_train.shape}-{self.knn_k}-{self.metric}".encode())
+        prefix = os.path.join(cache_dir, f"train_knn_{fingerprint.hexdigest()[:16]}")
+        dist_path, idx_path = f"{prefix}_dist.npy", f"{prefix}_idx.npy"
+        if os.path.exists(dist_path) and os.path.exists(idx_path):
+            return np.load(dist_path, mmap_mode="r"), np.load(idx_path, mmap_mode="r")
+
+        dist, idx = self.nn.kneighbors(X_train)
+        os.makedirs(cache_dir, exist_ok=True)
+        for path, arr in ((dist_path, dist), (idx_path, idx)):
+            # 동시에 여러 프로세스가 쓰더라도 완성된 파일만 보이도록 임시 파일 후 교체
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, arr)
+            os.replace(tmp_path, path)
+        return dist, idx
+
+    def query_edges(self, X_query):
+        """query -> train 엣지 (query 로컬 인덱스, train 인덱스)"""
+        dist, idx = self.nn.kneighbors(X_query, n_neighbors=self.knn_k)
+        q_local = np.repeat(np.arange(len(X_query)), self.knn_k)
+        t_idx = idx.reshape(-1)
+        if self.mutual:
+            # query가 train 노드 j의 k-NN 안에 들어가는 경우만 유지
+            keep = dist.reshape(-1) <= self.kth_dist[t_idx]
+            q_local, t_idx = q_local[keep], t_idx[keep]
+        return q_local, t_idx
+
+    def build_adjacency(self, X_query):
+        """캐시된 train 정규화 인접행렬을 query 행/열로 확장 -> sparse CSR [N+Q, N+Q]"""
+        n, q = self.num_train, len(X_query)
+        q_local, t_idx = self.query_edges(X_query)
+        q_node = torch.as_tensor(q_local + n, dtype=torch.long)
+        t_node = torch.as_tensor(t_idx, dtype=torch.long)
+
+        # degree 갱신: query가 붙은 train 노드만 변경
+        added = torch.ones(t_node.numel())
+        train_deg = self.deg.clone().scatter_add_(0, t_node, added)
+        query_deg = torch.full((q,), SELF_LOOP_FILL).scatter_add_(0, q_node - n, added)
+        dinv_train = train_deg.pow(-0.5)
+        dinv_query = query_deg.pow(-0.5)
+
+        # 기존 train 정규화 값 재스케일 (degree가 바뀐 노드만 scale != 1)
+        scale = (self.deg / train_deg).sqrt()
+        train_norm = self.norm * scale[self.row] * scale[self.col]
+
+        # query <-> train 엣지 (대칭) + query self-loop
+        qt_norm = dinv_query[q_node - n] * dinv_train[t_node]
+        q_loops = torch.arange(n, n + q)
+        rows = torch.cat([self.row, q_node, t_node, q_loops])
+        cols = torch.cat([self.col, t_node, q_node, q_loops])
+        values = torch.cat([train_norm, qt_norm, qt_norm, SELF_LOOP_FILL * dinv_query.pow(2)])
+
+        adj = torch.sparse_coo_tensor(torch.stack([cols, rows]), values, (n + q, n + q)).coalesce()
+        return adj.to_sparse_csr().to(self.device)
+
+    def logits(self, X_query):
+        """query 임베딩 -> [Q, num_classes] 로짓 (train 부분 재계산 없이 레이어당 sparse matmul 1회)"""
+        x_query = torch.as_tensor(np.asarray(X_query), dtype=torch.float32, device=self.device)
+        adj = self.build_adjacency(X_query)
+        with torch.no_grad():
+            x = torch.cat([self.X_train, x_query])
+            first_proj = torch.cat([self.train_proj, self.model.project_first(x_query)])
+            out = self.model(x, adj, first_proj=first_proj)
+        return out[self.num_train:].detach().cpu().numpy()
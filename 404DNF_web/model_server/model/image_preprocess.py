@@ -0,0 +1,140 @@
+"""
+스크린샷 OCR 전처리
+- 해상도 상한으로 축소 (bbox는 원본 좌표로 복원)
+- OCR 결과 캐시: 픽셀이 같은 이미지(내용 digest 일치)는 이전 결과 재사용
+  (opt-in으로 dHash 해밍 거리 이하인 거의 동일한 이미지도 재사용)
+- 빈(단색) 가로 영역 건너뛰기: 내용이 있는 구간만 OCR
+OCR 시간은 픽셀 수에 비례하므로 큰 전체 페이지 스크린샷에서 효과가 큼
+"""
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def downscale(image, max_width=0, max_pixels=0):
+    """
+    가로 폭 / 전체 픽셀 수 상한에 맞춰 축소 (확대는 하지 않음)
+
+    Returns:
+        (축소된 이미지, scale) - 원본 좌표 = 축소 좌표 / scale
+    """
+    height, width = image.shape[:2]
+    scale = 1.0
+    if max_width and width > max_width:
+        scale = min(scale, max_width / width)
+    if max_pixels and height * width > max_pixels:
+        scale = min(scale, (max_pixels / (height * width)) ** 0.5)
+    if scale >= 1.0:
+        return image, 1.0
+    resized = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                         interpolation=cv2.INTER_AREA)
+    return resized, scale
+
+
+def dhash(image, hash_size=16):
+    """difference hash - hash_size x hash_size 비트 (numpy bool 배열)"""
+    grey = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(grey, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return (small[:, 1:] > small[:, :-1]).flatten()
+
+
+def content_digest(image):
+    """픽셀 내용 digest (크기 + dtype + 픽셀 바이트의 sha1) - 한 픽셀이라도 다르면 다른 값"""
+    digest = hashlib.sha1(f"{image.shape}:{image.dtype}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def content_segments(image, band_height=32, std_threshold=4.0):
+    """
+    단색 / 빈 가로 밴드를 제외한 내용 구간 [(y0, y1), ...]
+    글자가 밴드 경계에서 잘리지 않도록 내용 밴드 앞뒤로 한 밴드씩 여유를 둠
+    """
+    grey = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    height = grey.shape[0]
+    n_bands = (height + band_height - 1) // band_height
+    has_content = np.array([
+        grey[i * band_height:(i + 1) * band_height].std() > std_threshold
+        for i in range(n_bands)
+    ], dtype=bool)
+    if not has_content.any():
+        return []
+
+    # 앞뒤 한 밴드씩 확장
+    padded = has_content.copy()
+    padded[1:] |= has_content[:-1]
+    padded[:-1] |= has_content[1:]
+
+    segments = []
+    start = None
+    for i, flag in enumerate(padded):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            segments.append((start * band_height, min(height, i * band_height)))
+            start = None
+    if start is not None:
+        segments.append((start * band_height, height))
+    return segments
+
+
+def restore_bbox(bbox, scale=1.0, y_offset=0):
+    """축소 / 구간 잘라낸 이미지의 bbox 좌표를 원본 이미지 좌표로 복원"""
+    return [[x / scale, (y + y_offset) / scale] for x, y in bbox]
+
+
+class ImageResultCache:
+    """
+    이미지 OCR 결과 캐시 (LRU)
+    기본은 내용 digest가 같은(픽셀이 동일한) 이미지만 같은 이미지로 간주
+    max_distance > 0이면 원본 해상도가 같고 dHash 해밍 거리가 max_distance 이하인 이미지도 같은 이미지로 간주
+    (dHash는 축소한 밝기 기울기만 비교하므로 카운트다운 숫자 / 재고 수량처럼 작은 글자만 다른 스크린샷도
+    거리 0으로 일치할 수 있음 - 다른 이미지의 결과를 받을 수 있음)
+    """
+
+    def __init__(self, max_entries=256, max_distance=0, hash_size=16):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self._entries = OrderedDict()  # digest -> (shape, dHash 또는 None, result)
+        self._lock = threading.Lock()
+
+    def key(self, image):
+        """이미지 -> 캐시 키 (digest, shape, dHash) - dHash는 근접 일치를 켰을 때만 계산"""
+        image_hash = dhash(image, self.hash_size) if self.max_distance > 0 else None
+        return content_digest(image), image.shape, image_hash
+
+    def get(self, key):
+        digest, shape, image_hash = key
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                # 호출측에서 결과 dict를 수정(filename, _id 등)하므로 사본 반환
+                return copy.deepcopy(entry[2])
+            if image_hash is None:
+                return None
+            for entry_digest, (entry_shape, entry_hash, result) in self._entries.items():
+                if (entry_hash is not None and entry_shape == shape
+                        and np.count_nonzero(entry_hash != image_hash) <= self.max_distance):
+                    self._entries.move_to_end(entry_digest)
+                    return copy.deepcopy(result)
+        return None
+
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        digest, shape, image_hash = key
+        with self._lock:
+            self._entries[digest] = (shape, image_hash, copy.deepcopy(result))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,80 @@
+"""
+type(category)별 관련 법률 목록 정규화 테이블
+
+predicate_type_law.csv의 laws 컬럼(긴 법률 문자열 JSON 배열)을 결과 문서마다 복사하지 않고
+내용 해시(lawSetId)만 저장한다. 같은 법률 목록은 항상 같은 ID를 가지므로
+CSV가 바뀌어도 기존 결과의 ID는 그대로 유효하다 (law_set 컬렉션에 upsert만 추가).
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# law_set 컬렉션 이름 (web/server의 predict_detail 라우트가 읽기 시 조회)
+LAW_SET_COLLECTION = "law_set"
+
+
+def law_set_id(laws):
+    """법률 목록 -> 내용 기반 ID (순서 포함)"""
+    payload = json.dumps(list(laws), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class LawTable:
+    """type -> lawSetId, lawSetId -> 법률 목록"""
+
+    def __init__(self, csv_path=None, laws_df=None):
+        """csv_path의 CSV 또는 이미 읽은 laws_df(type, laws 컬럼, 모델 번들의 법률 테이블)로 구성"""
+        self.laws_by_id = {}
+        self.id_by_type = {}
+        self.types_by_id = {}
+        if laws_df is None:
+            if not os.path.exists(csv_path):
+                print(f"[WARNING] 법률 매핑 파일 없음: {csv_path}")
+                return
+            laws_df = pd.read_csv(csv_path)
+        for category, laws_json in laws_df[["type", "laws"]].drop_duplicates().itertuples(index=False):
+            if category in self.id_by_type:
+                continue
+            try:
+                laws = json.loads(laws_json)
+            except Exception as e:
+                print(f"[WARNING] JSON parsing error in laws ({category}): {e}")
+                continue
+            set_id = law_set_id(laws)
+            self.laws_by_id[set_id] = laws
+            self.id_by_type[category] = set_id
+            self.types_by_id.setdefault(set_id, []).append(category)
+
+    def id_for_type(self, category):
+        """type(category)에 연결된 lawSetId (없으면 None)"""
+        if not category:
+            return None
+        return self.id_by_type.get(category)
+
+    def resolve(self, set_ids):
+        """lawSetId 목록 -> {lawSetId: 법률 목록} (모르는 ID는 제외)"""
+        return {set_id: self.laws_by_id[set_id] for set_id in set_ids if set_id in self.laws_by_id}
+
+    def documents(self):
+        """law_set 컬렉션에 저장할 문서 목록"""
+        return [
+            {"_id": set_id, "laws": laws, "types": self.types_by_id.get(set_id, [])}
+            for set_id, laws in self.laws_by_id.items()
+        ]
+
+
+def sync_law_sets(db, law_table):
+    """law_set 컬렉션에 현재 법률 목록 upsert (ID가 내용 해시이므로 기존 문서와 충돌하지 않음)"""
+    from pymongo import UpdateOne
+
+    docs = law_table.documents()
+    if not docs:
+        return 0
+    ops = [
+        UpdateOne({"_id": doc["_id"]}, {"$set": {"laws": doc["laws"], "types": doc["types"]}}, upsert=True)
+        for doc in docs
+    ]
+    db[LAW_SET_COLLECTION].bulk_write(ops, ordered=False)
+    return len(docs)
@@ -0,0 +1,116 @@
+"""
+비동기 레벨 로깅
+
+- QueueHandler -> 백그라운드 QueueListener 스레드에서만 stdout에 기록 (요청 / watcher 스레드는 큐에 넣기만 함)
+- LOG_LEVEL로 레벨 지정, LOG_FORMAT=json이면 한 줄 JSON (로그 수집 파이프라인용)
+- 블록 단위 로그는 DEBUG, INFO에서는 BLOCK_LOG_EVERY번째 블록만 샘플링
+- 문서 단위 요약은 구조화 필드(extra)를 가진 한 건의 INFO 레코드로 기록
+
+사용:
+    from model.logging_setup import get_logger, log_block, log_summary
+    logger = get_logger(__name__)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+# INFO 레벨에서 블록 로그를 남길 간격 (0 = 남기지 않음, DEBUG에서는 모든 블록)
+BLOCK_LOG_EVERY = int(os.getenv("BLOCK_LOG_EVERY", 0))
+# 큐가 가득 차면 레코드를 버림 (로깅 때문에 추론이 막히지 않도록)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+ROOT_LOGGER_NAME = "model_server"
+# LogRecord 기본 속성 (JSON 포맷에서 extra 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """기존 print 로그와 같은 모양 + extra 필드는 key=value로 덧붙임"""
+
+    def format(self, record):
+        text = super().format(record)
+        fields = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+        if fields:
+            text += " | " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class _DropQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging():
+    """루트 로거(model_server)에 큐 핸들러 연결, stdout 기록은 리스너 스레드에서 수행 (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if _listener is not None:
+        return root
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(message)s", "%H:%M:%S"))
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root.addHandler(_DropQueueHandler(log_queue))
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    # 종료 시 큐에 남은 레코드 기록
+    atexit.register(_listener.stop)
+    return root
+
+
+def get_logger(name):
+    """model_server 하위 로거 (최초 호출 시 큐 리스너 시작)"""
+    setup_logging()
+    short = name.rsplit(".", 1)[-1] if name != "__main__" else "app"
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{short}")
+
+
+def log_block(logger, idx, total, msg, *args, **fields):
+    """
+    블록 단위 로그 - DEBUG면 모든 블록, INFO면 BLOCK_LOG_EVERY번째 블록만 기록
+    비활성 레벨에서는 포맷팅 없이 바로 반환
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        level = logging.DEBUG
+    elif BLOCK_LOG_EVERY > 0 and idx % BLOCK_LOG_EVERY == 0 and logger.isEnabledFor(logging.INFO):
+        level = logging.INFO
+    else:
+        return
+    logger.log(level, f"[{idx}/{total}] " + msg, *args, extra=fields or None)
+
+
+def log_summary(logger, msg, **fields):
+    """문서 / 요청 단위 요약 레코드 (필드는 JSON 포맷에서 최상위 키로 기록)"""
+    logger.info(msg, extra={"event": "summary", **fields})
@@ -0,0 +1,97 @@
+"""
+train 예제 근접 중복 지름길 (NEAR_DUP_THRESHOLD)
+
+"Only 2 left in stock!"처럼 운영 문장 상당수가 train 문장과 거의 같다.
+query 임베딩과 가장 가까운 train 임베딩의 코사인 유사도가 threshold 이상이면
+그래프 구성 / GCN 추론 없이 그 train 예제의 라벨을 그대로 사용한다.
+
+train 라벨은 임베딩과 같은 행 순서의 클래스 인덱스 배열:
+    기본 아티팩트     <source_dir>/train_labels.npy  (tools.save_train_labels)
+    축소 참조 집합    <이름>_labels.npy               (tools.build_coreset이 함께 저장)
+    모델 번들         train/labels 배열
+"""
+import os
+import threading
+
+import numpy as np
+
+# 한 번에 유사도를 계산할 query 행 수 ([chunk, num_train] 행렬 크기 제한)
+SIMILARITY_CHUNK = 256
+
+
+def train_labels_path(embeddings_path):
+    """train 임베딩 .npy와 함께 저장되는 라벨 경로 (embeddings_improved.npy -> train_labels.npy)"""
+    directory, name = os.path.split(embeddings_path)
+    if name == "embeddings_improved.npy":
+        return os.path.join(directory, "train_labels.npy")
+    return os.path.splitext(embeddings_path)[0] + "_labels.npy"
+
+
+def encode_labels(labels, classes):
+    """클래스 이름 또는 인덱스 배열 -> int32 클래스 인덱스 배열"""
+    labels = np.asarray(labels)
+    if np.issubdtype(labels.dtype, np.integer):
+        indices = labels.astype(np.int32)
+    else:
+        lookup = {str(c): i for i, c in enumerate(classes)}
+        unknown = sorted({str(label) for label in labels if str(label) not in lookup})
+        if unknown:
+            raise ValueError(f"클래스 목록에 없는 라벨: {unknown[:5]}")
+        indices = np.array([lookup[str(label)] for label in labels], dtype=np.int32)
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(classes)):
+        raise ValueError(f"라벨 인덱스 범위 초과 (클래스 {len(classes)}개)")
+    return indices
+
+
+class NearDuplicateIndex:
+    """train 임베딩 최근접 코사인 유사도 조회 + 적중 통계"""
+
+    def __init__(self, X_train, labels, threshold):
+        if len(labels) != len(X_train):
+            raise ValueError(f"라벨 수({len(labels)})와 train 임베딩 수({len(X_train)})가 다릅니다.")
+        self.X_train = X_train
+        self.labels = np.asarray(labels)
+        self.threshold = threshold
+        # train 행 norm만 미리 계산 (정규화 사본을 만들지 않음 - mmap 임베딩 그대로 사용)
+        norms = np.linalg.norm(np.asarray(X_train, dtype=np.float32), axis=1)
+        self.inv_norms = (1.0 / np.maximum(norms, 1e-12)).astype(np.float32)
+        self._lock = threading.Lock()
+        self._queries = 0
+        self._hits = 0
+
+    def nearest(self, X_query):
+        """query별 (최근접 train 인덱스, 코사인 유사도)"""
+        X_query = np.asarray(X_query, dtype=np.float32)
+        idx = np.empty(len(X_query), dtype=np.int64)
+        sims = np.empty(len(X_query), dtype=np.float32)
+        for start in range(0, len(X_query), SIMILARITY_CHUNK):
+            chunk = X_query[start:start + SIMILARITY_CHUNK]
+            q_inv = 1.0 / np.maximum(np.linalg.norm(chunk, axis=1), 1e-12)
+            scores = (chunk @ np.asarray(self.X_train).T) * self.inv_norms
+            best = scores.argmax(axis=1)
+            idx[start:start + len(chunk)] = best
+            sims[start:start + len(chunk)] = scores[np.arange(len(chunk)), best] * q_inv
+        return idx, sims
+
+    def match(self, X_query, threshold=None):
+        """
+        threshold 이상인 query -> (적중 마스크, 적중 행의 train 라벨, 유사도)
+        threshold: 기본 self.threshold (리포트에서 여러 값을 비교할 때 지정)
+        """
+        idx, sims = self.nearest(X_query)
+        hit = sims >= (self.threshold if threshold is None else threshold)
+        if threshold is None:
+            with self._lock:
+                self._queries += len(hit)
+                self._hits += int(hit.sum())
+        return hit, self.labels[idx[hit]], sims
+
+    def stats(self):
+        with self._lock:
+            queries, hits = self._queries, self._hits
+        return {
+            "threshold": self.threshold,
+            "queries": queries,
+            "hits": hits,
+            "hitRate": round(hits / queries, 4) if queries else None,
+        }
@@ -1,3 +1,8 @@
+# BLAS/OpenMP 스레드 설정은 numpy / torch import 전에 적용되어야 함
+from model.concurrency import KNN_N_JOBS, configure_blas_env, configure_torch_threads, model_slot, thread_settings
+configure_blas_env()
+
+import cv2
 import easyocr
 import torch
 import torch.nn.functional as F
@@ -5,17 +10,27 @@ from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from sentence_transformers import SentenceTransformer
 from torch_geometric.data import Data
 import numpy as np
-from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import LabelEncoder
 import json
 import os
-import sys
 import pandas as pd
 import re
+import hashlib
+import threading
+import time
+from datetime import datetime
 from model.resgcn import ResGCN
+from model.runtime import SUPPORTED_RUNTIMES, load_backends, load_gcn_backend
+from model.quantization import SUPPORTED_QUANTIZATION, quantize_encoder
+from model.graph_cache import TrainGraphCache, build_edge_index, knn_indices
+from model.image_preprocess import ImageResultCache, content_segments, downscale, restore_bbox
+from model.law_sets import LawTable
+from model.bundle import ModelBundle, is_bundle, read_manifest
+from model.near_dup import NearDuplicateIndex, encode_labels, train_labels_path
+from model.text_batching import plan_batches, split_block
+from model.logging_setup import get_logger, log_block, log_summary
 
-# stdout 버퍼링 비활성화 (로그 즉시 출력)
-sys.stdout.reconfigure(line_buffering=True)
+logger = get_logger(__name__)
 
 # 현재 파일의 디렉토리 경로 가져오기
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -24,6 +39,34 @@ MODEL_DIR = os.path.join(BASE_DIR)
 # 디바이스 설정
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# torch intra-op / inter-op 스레드 설정 (모델 로드 전)
+configure_torch_threads(torch)
+
+# 추론 런타임 설정 (torch | torchscript | onnx)
+MODEL_RUNTIME = os.getenv("MODEL_RUNTIME", "torch").strip().lower()
+MODEL_EXPORT_DIR = os.getenv("MODEL_EXPORT_DIR", os.path.join(MODEL_DIR, "exported"))
+# 인코더 양자화 설정 (none | int8, CPU 전용)
+ENCODER_QUANTIZATION = os.getenv("ENCODER_QUANTIZATION", "none").strip().lower()
+# GCN 추론 방식 (concat: 요청마다 train+query 전체 kNN 재구성 | cached: train 그래프 캐시 + query 행 확장)
+GCN_INFERENCE = os.getenv("GCN_INFERENCE", "concat").strip().lower()
+# train 임베딩을 mmap으로 로드 (멀티 프로세스 모드에서 워커 간 페이지 공유)
+EMBEDDINGS_MMAP = os.getenv("EMBEDDINGS_MMAP", "0").strip().lower() in ("1", "true", "yes")
+# train kNN 캐시 저장 위치 (GCN_INFERENCE=cached)
+GRAPH_CACHE_DIR = os.getenv("GRAPH_CACHE_DIR", os.path.join(MODEL_DIR, "cache"))
+# 축소 참조 집합 (tools.build_coreset 결과 .npy) - 설정 시 embeddings_improved.npy 대신 사용
+TRAIN_EMBEDDINGS_PATH = os.getenv("TRAIN_EMBEDDINGS_PATH") or None
+# 모델 번들 디렉토리 (tools.build_bundle 결과) - 설정 시 체크포인트 / 임베딩 / 메타 / 법률 CSV 대신 사용
+MODEL_BUNDLE = os.getenv("MODEL_BUNDLE") or None
+# 번들 로드 시 배열 sha256 검사 (전체 파일을 읽으므로 기본 끔, manifest 해시 / 파일 크기는 항상 검사)
+BUNDLE_VERIFY = os.getenv("BUNDLE_VERIFY", "0").strip().lower() in ("1", "true", "yes")
+# train 예제와 코사인 유사도가 이 값 이상인 문장은 GCN 없이 train 라벨 사용 (0 = 끔, 예: 0.98) - train 라벨 파일 필요
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", 0))
+ENCODER_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+model_bundle = ModelBundle(MODEL_BUNDLE, verify=BUNDLE_VERIFY) if MODEL_BUNDLE else None
+if model_bundle is not None:
+    print(f"✅ 모델 번들 열기 완료: {MODEL_BUNDLE} (버전: {model_bundle.version})")
+
 # OCR 엔진 초기화 (이미지 분석용)
 reader = easyocr.Reader(['en', 'ko'])
 
@@ -34,120 +77,35 @@ trans_model = AutoModelForSeq2SeqLM.from_pretrained(trans_model_name).to(device)
 
 # ResGCN 모델 로드 (노트북 구조 기반)
 # SentenceTransformer 로드 (임베딩 생성용)
-st_model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2', device=device)
-print(f"✅ SentenceTransformer 로드 완료 (device: {device})")
-
-# 모델 파일 경로
-model_path = os.path.join(MODEL_DIR, "resgcn_improved.pt")
-embeddings_path = os.path.join(MODEL_DIR, "embeddings_improved.npy")
-meta_path = os.path.join(MODEL_DIR, "embeddings_meta.json")
-
-# embeddings_meta.json 로드
-if os.path.exists(meta_path):
-    with open(meta_path, 'r', encoding='utf-8') as f:
-        meta = json.load(f)
-    print(f"✅ 메타데이터 로드 완료: {meta_path}")
-    print(f"   - knn_k: {meta.get('knn_k', 10)}")
-    print(f"   - mutual_knn: {meta.get('mutual_knn', True)}")
-    print(f"   - metric: {meta.get('metric', 'cosine')}")
-    print(f"   - classes: {len(meta.get('classes', []))}개")
-else:
-    print(f"⚠️  메타데이터 파일이 없습니다: {meta_path}")
-    print("   기본값을 사용합니다.")
-    meta = {
-        'knn_k': 10,
-        'mutual_knn': True,
-        'metric': 'cosine',
-        'classes': []
-    }
-
-# Train embeddings 로드 (inductive inference용)
-if os.path.exists(embeddings_path):
-    X_train = np.load(embeddings_path)
-    print(f"✅ Train embeddings 로드 완료: {embeddings_path}")
-    print(f"   - Shape: {X_train.shape}")
-else:
-    print(f"⚠️  Train embeddings 파일이 없습니다: {embeddings_path}")
-    print("   단일 노드 그래프로 추론합니다 (권장하지 않음).")
-    X_train = None
-
-# ResGCN 모델 체크포인트 로드
-print(f"📦 ResGCN 모델 체크포인트 로드 중: {model_path}")
-ckpt = torch.load(model_path, map_location=device)
-
-# 체크포인트에서 모델 하이퍼파라미터 추출
-if 'hp' in ckpt:
-    hp = ckpt['hp']
-    in_dim = 768  # all-mpnet-base-v2의 차원
-    hidden = hp.get('hidden', 128)
-    num_blocks = hp.get('layers', 2)
-    dropout = hp.get('dropout', 0.1)
-else:
-    # 기본값 사용
-    in_dim = 768
-    hidden = 128
-    num_blocks = 2
-    dropout = 0.1
-    print("⚠️  체크포인트에 hp 정보가 없어 기본값을 사용합니다.")
-
-# state_dict 추출
-if 'state_dict' in ckpt:
-    state_dict = ckpt['state_dict']
+# 번들에 인코더 사본이 있으면 허브 이름 조회 없이 로컬에서 로드
+if model_bundle is not None:
+    encoder_source = model_bundle.encoder_path() or model_bundle.encoder_name(ENCODER_NAME)
 else:
-    state_dict = ckpt
-
-# 출력 클래스 수는 체크포인트에서 확인
-if 'head.weight' in state_dict:
-    num_classes = state_dict['head.weight'].shape[0]
-    print(f"📊 체크포인트에서 num_classes 확인: {num_classes}")
-elif 'label_encoder_classes' in ckpt:
-    num_classes = len(ckpt['label_encoder_classes'])
-    print(f"📊 체크포인트에서 label_encoder_classes로 num_classes 확인: {num_classes}")
-elif meta.get('classes'):
-    num_classes = len(meta['classes'])
-    print(f"📊 메타데이터에서 num_classes 확인: {num_classes}")
-else:
-    num_classes = 10  # 기본값
-    print(f"⚠️  num_classes를 확인할 수 없어 기본값 사용: {num_classes}")
-
-print(f"📊 모델 설정: in_dim={in_dim}, hidden={hidden}, num_classes={num_classes}, num_blocks={num_blocks}, dropout={dropout}")
-
-# ResGCN 모델 인스턴스 생성
-model = ResGCN(in_dim=in_dim, hidden=hidden, out_dim=num_classes, layers=num_blocks, dropout=dropout)
-
-# state_dict 로드
-model.load_state_dict(state_dict)
-print("✅ 모델 state_dict 로드 완료")
+    encoder_source = ENCODER_NAME
+st_model = SentenceTransformer(encoder_source, device=device)
+print(f"✅ SentenceTransformer 로드 완료 (device: {device})")
 
-model.to(device)
-model.eval()
-print(f"✅ ResGCN 모델 로드 완료 (device: {device})")
+# 인코더 동적 int8 양자화 (opt-in)
+if ENCODER_QUANTIZATION not in SUPPORTED_QUANTIZATION:
+    print(f"⚠️  지원하지 않는 ENCODER_QUANTIZATION: {ENCODER_QUANTIZATION} (지원: {', '.join(SUPPORTED_QUANTIZATION)}), fp32 사용")
+    ENCODER_QUANTIZATION = "none"
+elif ENCODER_QUANTIZATION == "int8" and device.type != "cpu":
+    print(f"⚠️  int8 동적 양자화는 CPU 전용입니다 (device: {device}), fp32 사용")
+    ENCODER_QUANTIZATION = "none"
+if ENCODER_QUANTIZATION == "int8":
+    st_model = quantize_encoder(st_model)
+    print("✅ SentenceTransformer int8 동적 양자화 적용 (Linear 레이어)")
 
-# Label Encoder 설정 (체크포인트 또는 메타데이터에서)
-if 'label_encoder_classes' in ckpt:
-    label_encoder_classes = ckpt['label_encoder_classes']
-elif meta.get('classes'):
-    label_encoder_classes = meta['classes']
-else:
-    # 기본 클래스 목록 (노트북에서 사용한 10개 클래스)
-    label_encoder_classes = [
-        "Activity Notifications",
-        "Confirmshaming",
-        "Countdown Timers",
-        "High-demand Messages",
-        "Limited-time Messages",
-        "Low-stock Messages",
-        "Not Dark Pattern",
-        "Pressured Selling",
-        "Testimonials of Uncertain Origin",
-        "Trick Questions"
-    ]
-    print("⚠️  Label encoder 클래스를 확인할 수 없어 기본값 사용")
-
-# LabelEncoder 생성 (예측 결과 디코딩용)
-label_encoder = LabelEncoder()
-label_encoder.classes_ = np.array(label_encoder_classes)
-print(f"✅ Label Encoder 설정 완료: {len(label_encoder_classes)}개 클래스")
+def get_runtime_info():
+    """현재 추론 설정 (/health 노출용)"""
+    return {
+        "device": str(device),
+        "runtime": MODEL_RUNTIME,
+        "encoderQuantization": ENCODER_QUANTIZATION,
+        "gcnInference": artifacts.gcn_inference,
+        "artifacts": artifacts.info(),
+        "threads": thread_settings(torch),
+    }
 
 # Predicate -> Type 매핑 (사용자 제공 매핑)
 PREDICATE_TO_TYPE_MAP = {
@@ -213,88 +171,585 @@ def parse_text_blocks(raw_text):
             cleaned.append(segment_str)
     return cleaned
 
-# kNN 그래프 구성 함수 (노트북 구조)
-def knn_indices(emb, k=10, metric="cosine"):
-    """kNN 인덱스 계산"""
-    nn = NearestNeighbors(n_neighbors=k+1, metric=metric)
-    nn.fit(emb)
-    _, idx = nn.kneighbors(emb)
-    return idx[:, 1:]  # drop self
-
-def build_edge_index(neigh_idx: np.ndarray, mutual: bool):
-    """엣지 인덱스 구성 (노트북 구조)"""
-    N, k = neigh_idx.shape
-    rows = np.repeat(np.arange(N), k)
-    cols = neigh_idx.reshape(-1)
-    # mutual/non-mutual 대칭 처리
-    if not mutual:
-        ei = np.vstack([np.concatenate([rows, cols]),
-                        np.concatenate([cols, rows])])
-        return np.unique(ei, axis=1)
-    # mutual kNN
-    S = set(zip(rows.tolist(), cols.tolist()))
-    mutual_pairs = [(i, j) for (i, j) in S if (j, i) in S and i != j]
-    if len(mutual_pairs) == 0:
-        ei = np.vstack([np.concatenate([rows, cols]),
-                        np.concatenate([cols, rows])])
-        return np.unique(ei, axis=1)
-    r = np.array([p[0] for p in mutual_pairs])
-    c = np.array([p[1] for p in mutual_pairs])
-    ei = np.vstack([np.concatenate([r, c]),
-                    np.concatenate([c, r])])
-    return np.unique(ei, axis=1)
-
-def forward_on_concat(model, X_train: np.ndarray, X_query: np.ndarray):
-    """
-    Inductive inference: train + query 임베딩을 concat하여 kNN 그래프 구성 후 추론
-    노트북의 forward_on_concat 방식과 동일
-    """
+def encode_texts(texts):
+    """문장 리스트 -> [B, 768] 임베딩 (설정된 런타임 사용)"""
+    with model_slot():
+        if encoder_backend is not None:
+            return encoder_backend.encode(texts)
+        with torch.no_grad():
+            return st_model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+
+def build_concat_graph(X_train: np.ndarray, X_query: np.ndarray, meta: dict):
+    """train + query 임베딩 concat 후 kNN 그래프 구성 -> (X_cat, edge_index)"""
     if X_train is None or len(X_train) == 0:
-        # Train embeddings가 없으면 단일 노드 그래프로 추론 (비권장)
-        print("⚠️  Train embeddings가 없어 단일 노드 그래프로 추론합니다.")
-        X_cat = X_query
         # 단일 노드 그래프 (엣지 없음)
-        edge_index = np.empty((2, 0), dtype=np.int64)
-    else:
-        # Train + Query concat
-        X_cat = np.vstack([X_train, X_query])
-        # kNN 그래프 구성
-        knn_k = meta.get('knn_k', 10)
-        metric = meta.get('metric', 'cosine')
-        mutual_knn = meta.get('mutual_knn', True)
-        
-        knn = knn_indices(X_cat, k=knn_k, metric=metric)
-        edge_index = build_edge_index(knn, mutual_knn)
-    
+        return X_query, np.empty((2, 0), dtype=np.int64)
+
+    # Train + Query concat
+    X_cat = np.vstack([X_train, X_query])
+    # kNN 그래프 구성
+    knn_k = meta.get('knn_k', 10)
+    metric = meta.get('metric', 'cosine')
+    mutual_knn = meta.get('mutual_knn', True)
+
+    knn = knn_indices(X_cat, k=knn_k, metric=metric, n_jobs=KNN_N_JOBS)
+    edge_index = build_edge_index(knn, mutual_knn)
+    return X_cat, edge_index
+
+def eager_logits(model, X_cat: np.ndarray, edge_index: np.ndarray):
+    """eager PyTorch(PyG) ResGCN 추론 -> [N, num_classes] 로짓"""
     # PyG Data 객체 생성
     data = Data(
         x=torch.tensor(X_cat, dtype=torch.float32, device=device),
         edge_index=torch.tensor(edge_index, dtype=torch.long, device=device),
     )
-    
-    # 추론
     model.eval()
     with torch.no_grad():
-        logits = model(data)  # [total_nodes, num_classes]
-        probs = F.softmax(logits, dim=1).detach().cpu().numpy()
-    
+        return model(data).detach().cpu().numpy()
+
+def forward_on_concat(arts: "ArtifactSet", X_query: np.ndarray):
+    """
+    Inductive inference: train + query 임베딩을 concat하여 kNN 그래프 구성 후 추론
+    노트북의 forward_on_concat 방식과 동일
+    """
+    if arts.train_graph is not None:
+        # 캐시된 train 그래프에 query 행만 확장 (GCN_INFERENCE=cached)
+        with model_slot():
+            logits = torch.from_numpy(arts.train_graph.logits(X_query))
+        return F.softmax(logits, dim=1).numpy()
+
+    X_train = arts.X_train
+    if X_train is None or len(X_train) == 0:
+        # Train embeddings가 없으면 단일 노드 그래프로 추론 (비권장)
+        print("⚠️  Train embeddings가 없어 단일 노드 그래프로 추론합니다.")
+    X_cat, edge_index = build_concat_graph(X_train, X_query, arts.meta)
+
+    # 추론 (설정된 런타임 사용)
+    with model_slot():
+        if arts.gcn_backend is not None:
+            logits = torch.from_numpy(np.asarray(arts.gcn_backend.logits(X_cat, edge_index)))
+        else:
+            logits = torch.from_numpy(eager_logits(arts.model, X_cat, edge_index))  # [total_nodes, num_classes]
+    probs = F.softmax(logits, dim=1).numpy()
+
     # Query 부분만 반환
     if X_train is not None and len(X_train) > 0:
         return probs[len(X_train):]
     else:
         return probs
 
-# 예측 함수 (두 단계 분기 + 번역 포함)
-def process_image_and_predict(image_path):
+def predict_probs(arts: "ArtifactSet", X_query: np.ndarray):
+    """
+    forward_on_concat + train 근접 중복 지름길 (NEAR_DUP_THRESHOLD)
+    가장 가까운 train 임베딩과의 코사인 유사도가 threshold 이상인 query는 그래프 / GCN 없이 그 train 라벨(one-hot)
+    """
+    if arts.near_dup is None:
+        return forward_on_concat(arts, X_query)
+    hit, labels, _ = arts.near_dup.match(X_query)
+    probs = np.zeros((len(X_query), len(arts.label_encoder.classes_)), dtype=np.float32)
+    probs[np.flatnonzero(hit), labels] = 1.0
+    if not hit.all():
+        probs[~hit] = forward_on_concat(arts, X_query[~hit])
+    return probs
+
+# 기본 모델 아티팩트 위치 (/admin/reload로 다른 디렉토리의 아티팩트 세트 로드 가능)
+ARTIFACT_FILES = ("resgcn_improved.pt", "embeddings_improved.npy", "embeddings_meta.json")
+
+# 기본 Label encoder 클래스 목록 (노트북에서 사용한 10개 클래스)
+DEFAULT_LABEL_CLASSES = [
+    "Activity Notifications",
+    "Confirmshaming",
+    "Countdown Timers",
+    "High-demand Messages",
+    "Limited-time Messages",
+    "Low-stock Messages",
+    "Not Dark Pattern",
+    "Pressured Selling",
+    "Testimonials of Uncertain Origin",
+    "Trick Questions"
+]
+
+# 리로드 검증용 샘플 문장
+VALIDATION_TEXTS = [
+    "Only 2 left in stock!",
+    "Hurry! Sale ends in 10 minutes",
+    "No thanks, I don't like saving money",
+    "15 people are looking at this item right now",
+    "Free shipping on orders over $50",
+    "Add to cart",
+]
+
+
+class ArtifactSet:
+    """
+    ResGCN 체크포인트 + train 임베딩 + 메타데이터와 이로부터 만든 객체 (LabelEncoder, GCN 백엔드, train 그래프 캐시)
+    요청은 시작 시 `artifacts`를 한 번 읽어 끝까지 같은 세트를 사용하므로 교체 중에도 이전 버전으로 마무리됨
+    """
+
+    def __init__(self, source_dir, version, model, X_train, meta, label_encoder, in_dim,
+                 gcn_backend=None, train_graph=None, gcn_inference="concat", embeddings_path=None,
+                 y_train=None, near_dup=None):
+        self.source_dir = source_dir
+        self.embeddings_path = embeddings_path  # 축소 참조 집합 경로 (None = 기본 embeddings_improved.npy)
+        self.version = version
+        self.model = model
+        self.X_train = X_train
+        self.y_train = y_train  # train 라벨 (클래스 인덱스, 없으면 None)
+        self.near_dup = near_dup  # 근접 중복 지름길 (NEAR_DUP_THRESHOLD > 0 이고 train 라벨이 있을 때)
+        self.meta = meta
+        self.label_encoder = label_encoder
+        self.in_dim = in_dim
+        self.gcn_backend = gcn_backend
+        self.train_graph = train_graph
+        self.gcn_inference = gcn_inference
+        self.export_dir = None  # gcn_backend를 로드한 export 디렉토리 (리로드 시 기본값)
+        self.loaded_at = datetime.now()
+
+    def info(self):
+        return {
+            "sourceDir": self.source_dir,
+            "version": self.version,
+            "loadedAt": self.loaded_at.isoformat(),
+            "numTrain": 0 if self.X_train is None else len(self.X_train),
+            "embeddingsPath": self.embeddings_path,
+            "coreset": self.meta.get("coreset"),
+            "numClasses": len(self.label_encoder.classes_),
+            "gcnInference": self.gcn_inference,
+            "gcnBackend": type(self.gcn_backend).__name__ if self.gcn_backend is not None else "eager",
+            "exportDir": self.export_dir,
+            "trainLabels": self.y_train is not None,
+            "nearDuplicate": self.near_dup.stats() if self.near_dup is not None else None,
+        }
+
+
+def coreset_meta_path(embeddings_path):
+    """축소 참조 집합 .npy와 함께 저장되는 메타데이터 경로 (<이름>.json)"""
+    return os.path.splitext(embeddings_path)[0] + ".json"
+
+
+def artifact_fingerprint(source_dir, embeddings_path=None):
+    """아티팩트 파일 크기 / 수정 시각 기반 버전 (파일 감시 트리거용, 내용 해시보다 저렴), 번들은 manifest 해시"""
+    if is_bundle(source_dir):
+        return read_manifest(source_dir)["bundleHash"][:12]
+    digest = hashlib.sha1()
+    paths = [os.path.join(source_dir, name) for name in ARTIFACT_FILES]
+    if embeddings_path:
+        paths += [embeddings_path, coreset_meta_path(embeddings_path)]
+    for path in paths:
+        name = os.path.basename(path)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def build_train_graph(model, X_train, meta, gcn_backend, gcn_inference, neighbors=None):
+    """
+    train 그래프 캐시 (GCN_INFERENCE=cached) -> (train_graph 또는 None, 실제 사용할 gcn_inference)
+    neighbors: 미리 계산한 train kNN (dist, idx) - 모델 번들
+    """
+    if gcn_inference == "cached":
+        if X_train is None or len(X_train) == 0:
+            print("⚠️  Train embeddings가 없어 GCN_INFERENCE=cached를 사용할 수 없습니다. concat 방식으로 추론합니다.")
+            return None, "concat"
+        if gcn_backend is not None:
+            print(f"⚠️  {MODEL_RUNTIME} 런타임 GCN은 concat 방식만 지원합니다. GCN_INFERENCE=concat 사용")
+            return None, "concat"
+        train_graph = TrainGraphCache(
+            model, X_train,
+            knn_k=meta.get('knn_k', 10),
+            metric=meta.get('metric', 'cosine'),
+            mutual=meta.get('mutual_knn', True),
+            device=device,
+            n_jobs=KNN_N_JOBS,
+            cache_dir=GRAPH_CACHE_DIR,
+            neighbors=neighbors,
+        )
+        print(f"✅ Train 그래프 캐시 구성 완료 (노드: {train_graph.num_train}, 엣지: {len(train_graph.row)})")
+        return train_graph, gcn_inference
+    if gcn_inference != "concat":
+        print(f"⚠️  지원하지 않는 GCN_INFERENCE: {gcn_inference} (지원: concat, cached), concat 사용")
+    return None, "concat"
+
+
+def build_near_dup(X_train, y_train):
+    """근접 중복 지름길 인덱스 (NEAR_DUP_THRESHOLD > 0) -> NearDuplicateIndex 또는 None"""
+    if NEAR_DUP_THRESHOLD <= 0 or X_train is None or len(X_train) == 0:
+        return None
+    if y_train is None:
+        print("⚠️  train 라벨이 없어 NEAR_DUP_THRESHOLD를 사용할 수 없습니다 (python -m tools.save_train_labels).")
+        return None
+    near_dup = NearDuplicateIndex(X_train, y_train, NEAR_DUP_THRESHOLD)
+    print(f"✅ 근접 중복 지름길 사용 (threshold: {NEAR_DUP_THRESHOLD}, train: {len(y_train)}개)")
+    return near_dup
+
+
+def load_bundle_artifact_set(source_dir, gcn_backend=None, gcn_inference=None):
+    """모델 번들 -> 아티팩트 세트 (manifest 그대로 사용, 배열은 mmap view로 복사 없이)"""
+    gcn_inference = gcn_inference or GCN_INFERENCE
+    bundle = ModelBundle(source_dir, verify=BUNDLE_VERIFY)
+    manifest = bundle.manifest
+    hp = manifest["hp"]
+    meta = manifest.get("meta") or {}
+
+    X_train = bundle.array("train/X") if bundle.has("train/X") else None
+    if X_train is None:
+        print("⚠️  번들에 train 임베딩이 없습니다. 단일 노드 그래프로 추론합니다 (권장하지 않음).")
+
+    model = ResGCN(in_dim=hp["in_dim"], hidden=hp["hidden"], out_dim=hp["num_classes"],
+                   layers=hp["layers"], dropout=hp["dropout"])
+    state_dict = bundle.state_dict()
+    try:
+        # CPU: mmap 버퍼를 파라미터로 그대로 사용 (torch 2.1+)
+        model.load_state_dict(state_dict, assign=device.type == "cpu")
+    except TypeError:
+        model.load_state_dict(state_dict)
+    model.to(device)
+    model.eval()
+
+    neighbors = (bundle.array("knn/dist"), bundle.array("knn/idx")) if bundle.has("knn/idx") else None
+    train_graph, gcn_inference = build_train_graph(model, X_train, meta, gcn_backend, gcn_inference, neighbors)
+
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(manifest["classes"])
+    y_train = bundle.array("train/labels") if bundle.has("train/labels") else None
+    print(f"✅ 번들 아티팩트 로드 완료: {source_dir} (버전: {bundle.version}, train: "
+          f"{0 if X_train is None else len(X_train)}, 클래스: {len(manifest['classes'])}개)")
+    return ArtifactSet(source_dir, bundle.version, model, X_train, meta, label_encoder, hp["in_dim"],
+                       gcn_backend=gcn_backend, train_graph=train_graph, gcn_inference=gcn_inference,
+                       y_train=y_train, near_dup=build_near_dup(X_train, y_train))
+
+
+def load_artifact_set(source_dir, gcn_backend=None, gcn_inference=None, embeddings_path=None):
+    """
+    source_dir의 모델 아티팩트 세트 로드 (train kNN 캐시 포함)
+    source_dir가 모델 번들(manifest.json)이면 load_bundle_artifact_set
+
+    Args:
+        gcn_backend: export 런타임 GCN 백엔드 (None이면 eager PyTorch)
+        gcn_inference: concat | cached (None이면 GCN_INFERENCE)
+        embeddings_path: 축소 참조 집합 .npy (None이면 source_dir의 embeddings_improved.npy)
+                         같은 이름의 .json 메타데이터가 있으면 embeddings_meta.json 대신 사용
+    """
+    if is_bundle(source_dir):
+        if embeddings_path:
+            print(f"⚠️  모델 번들에는 축소 참조 집합을 따로 지정할 수 없습니다 (번들 빌드 시 --embeddings 사용): {embeddings_path}")
+        return load_bundle_artifact_set(source_dir, gcn_backend, gcn_inference)
+
+    gcn_inference = gcn_inference or GCN_INFERENCE
+    embeddings_override = embeddings_path
+    version = artifact_fingerprint(source_dir, embeddings_path)
+    model_path = os.path.join(source_dir, "resgcn_improved.pt")
+    meta_path = os.path.join(source_dir, "embeddings_meta.json")
+    if embeddings_path:
+        if os.path.exists(coreset_meta_path(embeddings_path)):
+            meta_path = coreset_meta_path(embeddings_path)
+    else:
+        embeddings_path = os.path.join(source_dir, "embeddings_improved.npy")
+
+    # embeddings_meta.json 로드
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        print(f"✅ 메타데이터 로드 완료: {meta_path}")
+        print(f"   - knn_k: {meta.get('knn_k', 10)}")
+        print(f"   - mutual_knn: {meta.get('mutual_knn', True)}")
+        print(f"   - metric: {meta.get('metric', 'cosine')}")
+        print(f"   - classes: {len(meta.get('classes', []))}개")
+        if meta.get("coreset"):
+            coreset = meta["coreset"]
+            print(f"   - 축소 참조 집합: {coreset.get('method')} {coreset.get('size')}/{coreset.get('sourceSize')}개")
+    else:
+        print(f"⚠️  메타데이터 파일이 없습니다: {meta_path}")
+        print("   기본값을 사용합니다.")
+        meta = {
+            'knn_k': 10,
+            'mutual_knn': True,
+            'metric': 'cosine',
+            'classes': []
+        }
+
+    # Train embeddings 로드 (inductive inference용)
+    if os.path.exists(embeddings_path):
+        X_train = np.load(embeddings_path, mmap_mode="r" if EMBEDDINGS_MMAP else None)
+        print(f"✅ Train embeddings 로드 완료: {embeddings_path}{' (mmap)' if EMBEDDINGS_MMAP else ''}")
+        print(f"   - Shape: {X_train.shape}")
+    else:
+        print(f"⚠️  Train embeddings 파일이 없습니다: {embeddings_path}")
+        print("   단일 노드 그래프로 추론합니다 (권장하지 않음).")
+        X_train = None
+
+    # ResGCN 모델 체크포인트 로드
+    print(f"📦 ResGCN 모델 체크포인트 로드 중: {model_path}")
+    ckpt = torch.load(model_path, map_location=device)
+
+    # 체크포인트에서 모델 하이퍼파라미터 추출
+    if 'hp' in ckpt:
+        hp = ckpt['hp']
+        in_dim = 768  # all-mpnet-base-v2의 차원
+        hidden = hp.get('hidden', 128)
+        num_blocks = hp.get('layers', 2)
+        dropout = hp.get('dropout', 0.1)
+    else:
+        # 기본값 사용
+        in_dim = 768
+        hidden = 128
+        num_blocks = 2
+        dropout = 0.1
+        print("⚠️  체크포인트에 hp 정보가 없어 기본값을 사용합니다.")
+
+    # state_dict 추출
+    if 'state_dict' in ckpt:
+        state_dict = ckpt['state_dict']
+    else:
+        state_dict = ckpt
+
+    # 출력 클래스 수는 체크포인트에서 확인
+    if 'head.weight' in state_dict:
+        num_classes = state_dict['head.weight'].shape[0]
+        print(f"📊 체크포인트에서 num_classes 확인: {num_classes}")
+    elif 'label_encoder_classes' in ckpt:
+        num_classes = len(ckpt['label_encoder_classes'])
+        print(f"📊 체크포인트에서 label_encoder_classes로 num_classes 확인: {num_classes}")
+    elif meta.get('classes'):
+        num_classes = len(meta['classes'])
+        print(f"📊 메타데이터에서 num_classes 확인: {num_classes}")
+    else:
+        num_classes = 10  # 기본값
+        print(f"⚠️  num_classes를 확인할 수 없어 기본값 사용: {num_classes}")
+
+    print(f"📊 모델 설정: in_dim={in_dim}, hidden={hidden}, num_classes={num_classes}, num_blocks={num_blocks}, dropout={dropout}")
+
+    # ResGCN 모델 인스턴스 생성
+    model = ResGCN(in_dim=in_dim, hidden=hidden, out_dim=num_classes, layers=num_blocks, dropout=dropout)
+
+    # state_dict 로드
+    model.load_state_dict(state_dict)
+    print("✅ 모델 state_dict 로드 완료")
+
+    model.to(device)
+    model.eval()
+    print(f"✅ ResGCN 모델 로드 완료 (device: {device})")
+
+    train_graph, gcn_inference = build_train_graph(model, X_train, meta, gcn_backend, gcn_inference)
+
+    # Label Encoder 설정 (체크포인트 또는 메타데이터에서)
+    if 'label_encoder_classes' in ckpt:
+        label_encoder_classes = ckpt['label_encoder_classes']
+    elif meta.get('classes'):
+        label_encoder_classes = meta['classes']
+    else:
+        label_encoder_classes = DEFAULT_LABEL_CLASSES
+        print("⚠️  Label encoder 클래스를 확인할 수 없어 기본값 사용")
+
+    # LabelEncoder 생성 (예측 결과 디코딩용)
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(label_encoder_classes)
+    print(f"✅ Label Encoder 설정 완료: {len(label_encoder_classes)}개 클래스")
+
+    # Train 라벨 로드 (근접 중복 지름길용, 임베딩과 같은 행 순서)
+    y_train = None
+    labels_path = train_labels_path(embeddings_path)
+    if X_train is not None and os.path.exists(labels_path):
+        try:
+            y_train = encode_labels(np.load(labels_path, allow_pickle=True), label_encoder.classes_)
+            if len(y_train) != len(X_train):
+                raise ValueError(f"라벨 수({len(y_train)})와 train 임베딩 수({len(X_train)})가 다릅니다.")
+            print(f"✅ Train 라벨 로드 완료: {labels_path}")
+        except ValueError as e:
+            print(f"⚠️  Train 라벨을 사용할 수 없습니다: {labels_path} ({e})")
+            y_train = None
+
+    return ArtifactSet(source_dir, version, model, X_train, meta, label_encoder, in_dim,
+                       gcn_backend=gcn_backend, train_graph=train_graph, gcn_inference=gcn_inference,
+                       embeddings_path=embeddings_override, y_train=y_train, near_dup=build_near_dup(X_train, y_train))
+
+
+# 런타임 백엔드 로드 (torch 외 런타임은 export 아티팩트 필요, 실패 시 eager로 대체)
+encoder_backend, initial_gcn_backend = None, None
+if MODEL_RUNTIME != "torch":
+    try:
+        encoder_backend, initial_gcn_backend = load_backends(MODEL_RUNTIME, MODEL_EXPORT_DIR, st_model, device)
+        print(f"✅ 추론 런타임: {MODEL_RUNTIME} ({MODEL_EXPORT_DIR})")
+    except Exception as e:
+        print(f"⚠️  {MODEL_RUNTIME} 런타임 로드 실패, eager PyTorch로 대체합니다: {e}")
+        print(f"   지원 런타임: {', '.join(SUPPORTED_RUNTIMES)}")
+        MODEL_RUNTIME = "torch"
+if encoder_backend is not None and ENCODER_QUANTIZATION != "none":
+    print(f"⚠️  {MODEL_RUNTIME} 런타임 인코더를 사용하므로 int8 양자화 모델은 사용되지 않습니다.")
+    ENCODER_QUANTIZATION = "none"
+
+# 현재 아티팩트 세트 - swap_artifacts로만 교체 (참조 대입은 원자적)
+artifacts = load_artifact_set(MODEL_BUNDLE or MODEL_DIR, gcn_backend=initial_gcn_backend,
+                              embeddings_path=TRAIN_EMBEDDINGS_PATH)
+if initial_gcn_backend is not None:
+    artifacts.export_dir = MODEL_EXPORT_DIR
+_reload_lock = threading.Lock()
+
+
+def validate_artifact_set(candidate, reference=None, texts=VALIDATION_TEXTS):
+    """
+    샘플 문장으로 새 아티팩트 세트 검증 (train 그래프 캐시 / kNN 인덱스 warm-up 겸용)
+
+    Returns:
+        검증 지표 dict - ok가 False면 교체하지 않음
+    """
+    embeddings = encode_texts(texts)
+    probs = forward_on_concat(candidate, embeddings)
+    report = {
+        "samples": len(texts),
+        "finite": bool(np.isfinite(probs).all()),
+        "shapeOk": probs.shape == (len(texts), len(candidate.label_encoder.classes_)),
+    }
+    if candidate.gcn_backend is not None and candidate.X_train is not None:
+        # export 런타임 GCN이 새 체크포인트와 일치하는지 eager 모델과 비교
+        X_cat, edge_index = build_concat_graph(candidate.X_train, embeddings, candidate.meta)
+        eager = eager_logits(candidate.model, X_cat, edge_index)[-len(texts):]
+        backend = np.asarray(candidate.gcn_backend.logits(X_cat, edge_index))[-len(texts):]
+        report["backendArgmaxAgreement"] = float(np.mean(eager.argmax(axis=1) == backend.argmax(axis=1)))
+    if reference is not None and report["shapeOk"]:
+        # 현재 버전과의 예측 일치율 (참고용)
+        ref_probs = forward_on_concat(reference, embeddings)
+        new_preds = candidate.label_encoder.inverse_transform(probs.argmax(axis=1))
+        ref_preds = reference.label_encoder.inverse_transform(ref_probs.argmax(axis=1))
+        report["agreementWithCurrent"] = float(np.mean(new_preds == ref_preds))
+    report["ok"] = report["finite"] and report["shapeOk"] and report.get("backendArgmaxAgreement", 1.0) == 1.0
+    return report
+
+
+def reload_artifacts(source_dir=None, export_dir=None, min_agreement=0.0, embeddings_path=None):
+    """
+    새 아티팩트 세트를 로드 / 검증한 뒤 교체 (검증 실패 시 기존 세트 유지)
+    한 번에 하나의 리로드만 실행, 진행 중 요청은 이전 세트로 끝까지 처리됨
+
+    Args:
+        source_dir: 아티팩트 디렉토리 (기본: 현재 세트의 디렉토리)
+        export_dir: export 런타임 GCN 아티팩트 디렉토리 (기본: 현재 세트의 export 디렉토리, torch 런타임이면 없음)
+                    export GCN에는 가중치가 포함되므로 새 체크포인트와 다르면 검증(backendArgmaxAgreement)에서 거부됨
+        min_agreement: 현재 버전과의 최소 예측 일치율 (0 = 검사 안 함)
+        embeddings_path: 축소 참조 집합 .npy (기본: 같은 디렉토리를 다시 로드하면 현재 설정 유지)
+
+    Returns:
+        리로드 결과 dict
+    """
+    global artifacts
+    if not _reload_lock.acquire(blocking=False):
+        raise RuntimeError("이미 아티팩트 리로드가 진행 중입니다.")
+    try:
+        current = artifacts
+        source_dir = source_dir or current.source_dir
+        if embeddings_path is None and source_dir == current.source_dir:
+            embeddings_path = current.embeddings_path
+        print(f"🔄 [아티팩트 리로드] {source_dir} 로드 시작 (현재 버전: {current.version})")
+        # export 런타임은 eager GCN으로 조용히 바뀌지 않도록 현재 세트의 export 디렉토리에서 GCN을 다시 로드
+        export_dir = export_dir or current.export_dir
+        gcn_backend = load_gcn_backend(MODEL_RUNTIME, export_dir, device) if export_dir else None
+        candidate = load_artifact_set(source_dir, gcn_backend=gcn_backend, embeddings_path=embeddings_path)
+        if gcn_backend is not None:
+            candidate.export_dir = export_dir
+        report = validate_artifact_set(candidate, reference=current)
+        if min_agreement > 0 and report.get("agreementWithCurrent", 0.0) < min_agreement:
+            report["ok"] = False
+        if not report["ok"]:
+            print(f"❌ [아티팩트 리로드] 검증 실패, 기존 버전 유지: {report}")
+            if report.get("backendArgmaxAgreement", 1.0) < 1.0:
+                print(f"   {MODEL_RUNTIME} GCN({export_dir})이 새 체크포인트와 다릅니다. 새 체크포인트로 export 후 exportDir를 지정하세요.")
+            return {"swapped": False, "validation": report, "current": current.info()}
+
+        artifacts = candidate
+        # OCR 결과 캐시는 이전 모델의 예측을 담고 있으므로 비움
+        if image_cache is not None:
+            image_cache.clear()
+        print(f"✅ [아티팩트 리로드] 버전 {current.version} → {candidate.version} 교체 완료")
+        return {"swapped": True, "validation": report, "previous": current.info(), "current": candidate.info()}
+    finally:
+        _reload_lock.release()
+
+# 다중 이미지 배치 예측 설정
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", 8))  # EasyOCR 인식 단계 배치 크기
+IMAGE_DECODE_WORKERS = int(os.getenv("IMAGE_DECODE_WORKERS", 4))  # 이미지 디코딩 스레드 수
+TRANSLATE_BATCH_SIZE = int(os.getenv("TRANSLATE_BATCH_SIZE", 32))
+
+# 텍스트 블록 배치 설정 (process_text_and_predict)
+LONG_BLOCK_TOKENS = int(os.getenv("LONG_BLOCK_TOKENS", 0))  # 이 토큰 수를 넘는 블록은 문장 단위 하위 블록으로 분할 (0 = 끔)
+TEXT_TOKEN_BUDGET = int(os.getenv("TEXT_TOKEN_BUDGET", 0))  # 배치당 padding 포함 토큰 수 상한 (0 = 블록마다 1건씩)
+TEXT_BATCH_MAX = int(os.getenv("TEXT_BATCH_MAX", 64))  # 배치당 최대 문장 수 (0 = 제한 없음)
+
+
+def inference_version(arts=None):
+    """
+    아티팩트 버전 + 분류 결과에 영향을 주는 추론 설정 -> 버전 키 (delta 기준 실행 매칭 / modelingModelVersion)
+    런타임 / 양자화 / GCN 추론 방식 / 근접 중복 / 블록 분할 / 배치 설정이 다르면 다른 키
+    """
+    arts = arts or artifacts
+    settings = {
+        "runtime": MODEL_RUNTIME,
+        "encoderQuantization": ENCODER_QUANTIZATION,
+        "gcnInference": arts.gcn_inference,
+        "gcnBackend": type(arts.gcn_backend).__name__ if arts.gcn_backend is not None else "eager",
+        "exportDir": arts.export_dir,
+        "nearDuplicate": NEAR_DUP_THRESHOLD if arts.near_dup is not None else 0,
+        "longBlockTokens": LONG_BLOCK_TOKENS,
+        "textTokenBudget": TEXT_TOKEN_BUDGET,
+        "textBatchMax": TEXT_BATCH_MAX,
+    }
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    return f"{arts.version}-{digest}"
+
+# 스크린샷 전처리 설정
+OCR_MAX_WIDTH = int(os.getenv("OCR_MAX_WIDTH", 1920))  # 가로 폭 상한 (0 = 제한 없음)
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", 12_000_000))  # 전체 픽셀 수 상한 (0 = 제한 없음)
+OCR_SKIP_BLANK = os.getenv("OCR_SKIP_BLANK", "0").strip().lower() in ("1", "true", "yes")
+# OCR 결과 캐시: 기본은 픽셀이 동일한 이미지(내용 digest 일치)만 재사용
+OCR_HASH_CACHE_SIZE = int(os.getenv("OCR_HASH_CACHE_SIZE", 0))  # 0 = 캐시 사용 안 함
+OCR_HASH_SIZE = int(os.getenv("OCR_HASH_SIZE", 16))  # dHash 한 변 크기 (비트 수 = OCR_HASH_SIZE^2)
+# 0보다 크면 dHash 해밍 거리 이하인 이미지도 재사용 - 작은 글자(카운트다운 / 재고 수량)만 다른 스크린샷이
+# 다른 이미지의 결과를 받을 수 있음 (거리 0이어도 dHash가 같으면 일치)
+OCR_HASH_MAX_DISTANCE = int(os.getenv("OCR_HASH_MAX_DISTANCE", 0))  # 0 = 내용 digest 정확히 일치만
+
+image_cache = (ImageResultCache(OCR_HASH_CACHE_SIZE, OCR_HASH_MAX_DISTANCE, OCR_HASH_SIZE)
+               if OCR_HASH_CACHE_SIZE > 0 else None)
+
+NOT_DARK_KEYWORDS = ["not dark pattern", "not_dark_pattern", "not dark", "normal", "none"]
+
+# 번들의 법률 테이블 (predicate, type, laws) - 요청마다 CSV를 읽지 않음
+bundle_laws_df = None
+if model_bundle is not None:
+    bundle_laws_df = pd.DataFrame(model_bundle.manifest["laws"], columns=['predicate', 'type', 'laws'])
+
+def load_reduced_law():
+    """predicate_type_law.csv (또는 모델 번들) -> predicate, type, laws 테이블"""
+    if bundle_laws_df is not None:
+        return bundle_laws_df
     law_path = os.path.join(MODEL_DIR, "predicate_type_law.csv")
     if os.path.exists(law_path):
         laws_df = pd.read_csv(law_path)
-        # predicate, type, laws 모두 포함해야 함 (predicate로 검색하기 위해)
-        reduced_law = laws_df[['predicate', 'type', 'laws']].drop_duplicates().reset_index(drop=True)
-    else:
-        reduced_law = pd.DataFrame(columns=['predicate', 'type', 'laws'])
+        return laws_df[['predicate', 'type', 'laws']].drop_duplicates().reset_index(drop=True)
+    return pd.DataFrame(columns=['predicate', 'type', 'laws'])
 
-    ocr_results = reader.readtext(image_path)
+# type별 법률 목록 테이블 - 결과에는 lawSetId만 저장하고 읽기 시 law_set 컬렉션 / /laws API로 조회
+if bundle_laws_df is not None:
+    law_table = LawTable(laws_df=bundle_laws_df)
+else:
+    law_table = LawTable(os.path.join(MODEL_DIR, "predicate_type_law.csv"))
+
+# 예측 함수 (두 단계 분기 + 번역 포함)
+def process_image_and_predict(image_path):
+    # predicate, type, laws 모두 포함해야 함 (predicate로 검색하기 위해)
+    reduced_law = load_reduced_law()
+    # 요청 동안 같은 아티팩트 세트 사용 (처리 중 리로드되어도 이전 세트로 마무리)
+    arts = artifacts
+
+    image = _decode_image(image_path)
+    # 같은 스크린샷이 재전송되면 이전 결과 재사용
+    cache_key = image_cache.key(image) if image_cache is not None else None
+    if cache_key is not None:
+        cached = image_cache.get(cache_key)
+        if cached is not None:
+            logger.info("♻️  [이미지 캐시] 동일 이미지 결과 재사용: %s", os.path.basename(image_path))
+            return cached
+
+    ocr_results = ocr_image(image)
     output = []
 
     for (bbox, text, prob) in ocr_results:
@@ -307,72 +762,33 @@ def process_image_and_predict(image_path):
         input_text = text.strip()
         try:
             trans_inputs = trans_tokenizer.encode(input_text, return_tensors="pt", truncation=True).to(device)
-            translated = trans_model.generate(trans_inputs, max_length=100)
+            with model_slot():
+                translated = trans_model.generate(trans_inputs, max_length=100)
             translated_text = trans_tokenizer.decode(translated[0], skip_special_tokens=True)
         except Exception:
             translated_text = input_text  # 번역 실패 시 원문 유지
 
-        # ResGCN 모델로 직접 예측 (1-2단계 구분 없이)
+        # ResGCN 모델로 직접 예측 (1-2단계 구분 없이) - 텍스트 / 배치 경로와 같은 decode_prediction 사용
         category, predicate, top_preds = None, None, []
         is_dark = 0
-        probability = None
 
         try:
-            # SentenceTransformer로 임베딩 생성
-            with torch.no_grad():
-                embedding = st_model.encode([translated_text], convert_to_numpy=True, show_progress_bar=False)  # [1, 768]
-            
-            # Inductive inference: forward_on_concat 사용
-            query_probs = forward_on_concat(model, X_train, embedding)  # [1, num_classes]
-            
-            # 결과 후처리
-            pred_probs = query_probs[0]  # [num_classes]
-            pred_idx = np.argmax(pred_probs)
-            
-            # Predicate 디코딩
-            predicate = label_encoder.inverse_transform([pred_idx])[0]
-            probability = float(pred_probs[pred_idx])
-            
-            # 다크패턴 여부 판단: predicate가 "Not Dark Pattern"이 아니면 다크패턴
-            is_not_dark_keywords = ["not dark pattern", "not_dark_pattern", "not dark", "normal", "none"]
-            is_dark = 1 if not any(keyword in predicate.lower() for keyword in is_not_dark_keywords) else 0
-            
-            # Top 3 predictions
-            top_indices = pred_probs.argsort()[::-1][:3]
-            top_preds = [
-                f"{label_encoder.inverse_transform([i])[0]} ({round(pred_probs[i], 4)})"
-                for i in top_indices
-            ]
-            
-            # Category는 predicate로부터 매핑 (우선: 직접 매핑, 없으면 CSV에서 찾기)
-            if predicate:
-                # 직접 매핑 사용 (사용자 제공 매핑)
-                category = get_type_from_predicate(predicate)
-                # CSV에서 찾기 (fallback)
-                if not category:
-                    category_row = reduced_law[reduced_law["predicate"] == predicate]
-                    if not category_row.empty:
-                        category = category_row.iloc[0]["type"]
-                # 둘 다 없으면 None 유지
+            # SentenceTransformer로 임베딩 생성 후 inductive inference (train 근접 중복은 지름길)
+            embedding = encode_texts([translated_text])  # [1, 768]
+            pred = decode_prediction(arts, predict_probs(arts, embedding)[0], reduced_law)
+            predicate = pred["predicate"]
+            top_preds = pred["top_preds"]
+            category = pred["category"]
+            is_dark = pred["is_darkpattern"]
         except Exception as e:
-            print(f"[WARNING] ResGCN 예측 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("ResGCN 예측 실패: %s", e)
             predicate = None
             top_preds = []
             category = None
-            probability = None
             is_dark = 0
 
-        # 법률 정보 연결
-        law_list = []
-        if category:
-            law_row = reduced_law[reduced_law["type"] == category]
-            if not law_row.empty:
-                try:
-                    law_list = json.loads(law_row.iloc[0]["laws"])
-                except Exception as e:
-                    print(f"[WARNING] JSON parsing error in laws: {e}")
+        # 법률 정보 연결 (법률 목록 대신 ID)
+        law_set_id = law_table.id_for_type(category)
 
         output.append({
             "text": text,
@@ -386,149 +802,325 @@ def process_image_and_predict(image_path):
             "top3_predicate": top_preds[2] if len(top_preds) > 2 else None,
             "category": category,
             "type": category,
-            "laws": law_list
+            "lawSetId": law_set_id
         })
 
+    if cache_key is not None:
+        image_cache.put(cache_key, output)
     return output
 
+def _decode_image(image_path):
+    """이미지 파일 -> RGB ndarray (EasyOCR 파일 입력과 동일한 채널 순서)"""
+    image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {image_path}")
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+def _try_decode_image(image_path):
+    """_decode_image -> (이미지, None) 또는 (None, 오류 메시지)"""
+    try:
+        return _decode_image(image_path), None
+    except Exception as e:
+        return None, str(e)
+
+def ocr_image(image):
+    """
+    전처리(해상도 축소 / 빈 영역 건너뛰기) 후 OCR
+
+    Returns:
+        원본 이미지 좌표 bbox의 (bbox, text, prob) 리스트
+    """
+    small, scale = downscale(image, OCR_MAX_WIDTH, OCR_MAX_PIXELS)
+    segments = content_segments(small) if OCR_SKIP_BLANK else [(0, small.shape[0])]
+    ocr_results = []
+    for y0, y1 in segments:
+        with model_slot():
+            segment_results = reader.readtext(small[y0:y1])
+        ocr_results.extend((restore_bbox(bbox, scale, y0), text, prob) for bbox, text, prob in segment_results)
+    return ocr_results
+
+def translate_texts(texts):
+    """Marian(ko->en) 배치 번역 - 배치 실패 시 원문 유지"""
+    translated = []
+    for start in range(0, len(texts), TRANSLATE_BATCH_SIZE):
+        chunk = [t.strip() for t in texts[start:start + TRANSLATE_BATCH_SIZE]]
+        try:
+            inputs = trans_tokenizer(chunk, return_tensors="pt", padding=True, truncation=True).to(device)
+            with model_slot(), torch.no_grad():
+                generated = trans_model.generate(**inputs, max_length=100)
+            translated.extend(trans_tokenizer.batch_decode(generated, skip_special_tokens=True))
+        except Exception as e:
+            logger.warning("배치 번역 실패, 원문 유지: %s", e)
+            translated.extend(chunk)
+    return translated
+
+def classify_texts(texts, reduced_law, arts=None):
+    """
+    문장 리스트를 한 번의 임베딩 + 한 번의 inductive 추론으로 분류
+    arts: 사용할 아티팩트 세트 (기본: 현재 세트)
+
+    Returns:
+        문장별 dict (predicate, probability, top_preds, is_darkpattern, category)
+    """
+    if not texts:
+        return []
+    arts = arts or artifacts
+    embeddings = encode_texts(texts)  # [B, 768]
+    query_probs = predict_probs(arts, embeddings)  # [B, num_classes]
+    return [decode_prediction(arts, pred_probs, reduced_law) for pred_probs in query_probs]
+
+def decode_prediction(arts, pred_probs, reduced_law):
+    """클래스 확률 -> dict (predicate, probability, top_preds, is_darkpattern, category)"""
+    pred_idx = int(np.argmax(pred_probs))
+    predicate = arts.label_encoder.inverse_transform([pred_idx])[0]
+    top_indices = pred_probs.argsort()[::-1][:3]
+    category = get_type_from_predicate(predicate)
+    if not category:
+        category_row = reduced_law[reduced_law["predicate"] == predicate]
+        if not category_row.empty:
+            category = category_row.iloc[0]["type"]
+    return {
+        "predicate": predicate,
+        "probability": float(pred_probs[pred_idx]),
+        "top_preds": [
+            f"{arts.label_encoder.inverse_transform([i])[0]} ({round(pred_probs[i], 4)})"
+            for i in top_indices
+        ],
+        "is_darkpattern": 0 if any(k in predicate.lower() for k in NOT_DARK_KEYWORDS) else 1,
+        "category": category,
+    }
+
+def count_tokens(texts):
+    """문장별 인코더 토큰 수 (특수 토큰 제외, 자르지 않음)"""
+    if not texts:
+        return []
+    encoded = st_model.tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+def dark_score(arts, pred_probs):
+    """다크패턴 점수 = 1 - not dark 클래스 확률 합"""
+    not_dark = [i for i, c in enumerate(arts.label_encoder.classes_)
+                if any(k in str(c).lower() for k in NOT_DARK_KEYWORDS)]
+    return 1.0 - float(pred_probs[not_dark].sum())
+
+def process_images_and_predict(image_paths):
+    """
+    여러 이미지를 한 번에 OCR + 번역 + 분류
+    - 이미지 디코딩: 스레드 풀 (파일별로 실패를 기록하고 나머지 이미지는 계속 처리)
+    - OCR: 같은 해상도끼리 묶어 EasyOCR readtext_batched (검출/인식 배치)
+    - 인식된 모든 줄을 한 번의 번역 / 임베딩 / 분류 배치로 처리
+
+    Returns:
+        ({image_path: process_image_and_predict와 동일한 형식의 결과 리스트}, {디코딩 실패 image_path: 오류 메시지})
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    reduced_law = load_reduced_law()
+    # 요청 동안 같은 아티팩트 세트 사용 (처리 중 리로드되어도 이전 세트로 마무리)
+    arts = artifacts
+    with ThreadPoolExecutor(max_workers=max(1, IMAGE_DECODE_WORKERS)) as pool:
+        decoded = list(pool.map(_try_decode_image, image_paths))
+    images = [image for image, _ in decoded]
+    failed = {path: error for path, (_, error) in zip(image_paths, decoded) if error is not None}
+    for path, error in failed.items():
+        logger.warning("⚠️ [이미지 디코딩 실패] %s: %s", os.path.basename(path), error)
+
+    outputs = {path: [] for path in image_paths if path not in failed}
+    cache_keys = [None] * len(images)
+    pending = []  # 캐시에 없는 이미지 인덱스
+    for idx, image in enumerate(images):
+        if image is None:
+            continue
+        if image_cache is not None:
+            cache_keys[idx] = image_cache.key(image)
+            cached = image_cache.get(cache_keys[idx])
+            if cached is not None:
+                outputs[image_paths[idx]] = cached
+                continue
+        pending.append(idx)
+
+    # 해상도 상한으로 축소 후 해상도별 그룹 (readtext_batched는 한 배치의 이미지 크기가 같아야 함)
+    scaled = {idx: downscale(images[idx], OCR_MAX_WIDTH, OCR_MAX_PIXELS) for idx in pending}
+    groups = {}
+    for idx in pending:
+        groups.setdefault(scaled[idx][0].shape, []).append(idx)
+    ocr_by_image = {idx: [] for idx in pending}
+    for indices in groups.values():
+        with model_slot():
+            batch_results = reader.readtext_batched([scaled[i][0] for i in indices], batch_size=OCR_BATCH_SIZE)
+        for i, ocr_results in zip(indices, batch_results):
+            scale = scaled[i][1]
+            ocr_by_image[i] = [(restore_bbox(bbox, scale), text, prob) for bbox, text, prob in ocr_results]
+
+    # 전체 이미지의 OCR 줄을 평탄화해 한 번에 번역 / 분류
+    lines = [(img_idx, bbox, text, prob)
+             for img_idx, ocr_results in ocr_by_image.items()
+             for (bbox, text, prob) in ocr_results]
+    translated = translate_texts([text for _, _, text, _ in lines])
+    try:
+        predictions = classify_texts(translated, reduced_law, arts)
+    except Exception as e:
+        logger.exception("ResGCN 배치 예측 실패: %s", e)
+        predictions = [None] * len(lines)
+
+    for (img_idx, bbox, text, prob), translated_text, pred in zip(lines, translated, predictions):
+        x_min = int(min(p[0] for p in bbox))
+        y_min = int(min(p[1] for p in bbox))
+        width = int(max(p[0] for p in bbox)) - x_min
+        height = int(max(p[1] for p in bbox)) - y_min
+        pred = pred or {"predicate": None, "top_preds": [], "is_darkpattern": 0, "category": None}
+        top_preds = pred["top_preds"]
+        category = pred["category"]
+        outputs[image_paths[img_idx]].append({
+            "text": text,
+            "translated": translated_text,
+            "confidence": float(prob),
+            "bbox": json.dumps({"x": x_min, "y": y_min, "width": width, "height": height}),
+            "is_darkpattern": pred["is_darkpattern"],
+            "predicate": pred["predicate"],
+            "top1_predicate": top_preds[0] if len(top_preds) > 0 else None,
+            "top2_predicate": top_preds[1] if len(top_preds) > 1 else None,
+            "top3_predicate": top_preds[2] if len(top_preds) > 2 else None,
+            "category": category,
+            "type": category,
+            "lawSetId": law_table.id_for_type(category)
+        })
+
+    if image_cache is not None:
+        for idx in pending:
+            image_cache.put(cache_keys[idx], outputs[image_paths[idx]])
+    return outputs, failed
+
 # 텍스트 기반 예측 함수 (* 기준으로 분리)
 def process_text_and_predict(full_text, progress_callback=None):
     """
     fullText를 블록 단위로 분리하여 각 텍스트에 대해 모델 예측 수행
     (신규 포맷: '#' 구분, 기존 포맷: '*' 구분)
-    
+
+    - LONG_BLOCK_TOKENS: 긴 블록은 문장 단위 하위 블록으로 나눠 각각 분류하고,
+      다크패턴 점수가 가장 높은 하위 블록의 판정을 블록 판정으로 사용 (결과는 원래 블록 1개당 1개)
+    - TEXT_TOKEN_BUDGET: 하위 블록을 토큰 길이순으로 정렬해 배치당 padding 포함 토큰 수 상한 안에서 묶어 추론
+      (0이면 블록마다 1건씩)
+
     Args:
         full_text: 수집된 텍스트 (문자열 또는 문자열 리스트)
-        
+        progress_callback: (완료된 블록 수, 전체 블록 수) - 배치마다 호출
+
     Returns:
         각 텍스트별 예측 결과 리스트
     """
-    law_path = os.path.join(MODEL_DIR, "predicate_type_law.csv")
-    if os.path.exists(law_path):
-        laws_df = pd.read_csv(law_path)
-        # predicate, type, laws 모두 포함해야 함 (predicate로 검색하기 위해)
-        reduced_law = laws_df[['predicate', 'type', 'laws']].drop_duplicates().reset_index(drop=True)
-    else:
-        reduced_law = pd.DataFrame(columns=['predicate', 'type', 'laws'])
-    
+    # predicate, type, laws 모두 포함해야 함 (predicate로 검색하기 위해)
+    reduced_law = load_reduced_law()
+    # 요청 동안 같은 아티팩트 세트 사용 (처리 중 리로드되어도 이전 세트로 마무리)
+    arts = artifacts
+
     # 텍스트 블록 파싱
     text_list = parse_text_blocks(full_text)
-    print(f"📊 [텍스트 분리] 총 {len(text_list)}개 블록 처리 예정")
+    logger.debug("📊 [텍스트 분리] 총 %d개 블록 처리 예정", len(text_list))
     output = []
-    
+    started = time.perf_counter()
+
+    # fullText는 이미 크롬 익스텐션에서 번역된 영어 텍스트
+    # 모델에 들어가는 텍스트는 반드시 영어여야 함
+    blocks = []  # (블록 번호, 텍스트)
     for idx, text in enumerate(text_list, 1):
         input_text = text.strip()
         if not input_text:
             continue
-        
+        # 한글 감지 및 경고 (모델에 한글이 들어가면 안 됨)
+        if re.search(r'[가-힣]', input_text):
+            logger.warning("⚠️ [경고] 모델에 한글 텍스트가 입력되었습니다! (번역 확인 필요) 입력 텍스트: %s",
+                           input_text[:100])
+        blocks.append((idx, input_text))
+
+    # 긴 블록 -> 하위 블록 (segment), segment마다 원래 블록 위치 기록
+    seg_texts, seg_block = [], []
+    block_lengths = count_tokens([text for _, text in blocks]) if LONG_BLOCK_TOKENS > 0 else None
+    for b, (_, text) in enumerate(blocks):
+        if block_lengths is not None and block_lengths[b] > LONG_BLOCK_TOKENS:
+            parts = split_block(text, count_tokens, LONG_BLOCK_TOKENS)
+        else:
+            parts = [text]
+        seg_texts.extend(parts)
+        seg_block.extend([b] * len(parts))
+
+    # 배치 구성 (인코더 최대 길이에서 잘리므로 그 길이로 정렬 / 예산 계산)
+    if TEXT_TOKEN_BUDGET > 0:
+        max_len = st_model.max_seq_length
+        seg_lengths = [min(n + 2, max_len) for n in count_tokens(seg_texts)]
+        batches = plan_batches(seg_lengths, TEXT_TOKEN_BUDGET, TEXT_BATCH_MAX)
+    else:
+        batches = [[i] for i in range(len(seg_texts))]
+
+    # ResGCN 모델로 직접 예측 (노트북 구조: inductive inference), train 근접 중복은 지름길
+    seg_probs = [None] * len(seg_texts)
+    remaining = [0] * len(blocks)
+    for b in seg_block:
+        remaining[b] += 1
+    done_blocks = 0
+    for batch in batches:
+        try:
+            embeddings = encode_texts([seg_texts[i] for i in batch])  # [B, 768]
+            for i, pred_probs in zip(batch, predict_probs(arts, embeddings)):
+                seg_probs[i] = pred_probs
+        except Exception as e:
+            logger.exception("❌ ResGCN 예측 실패: %s", e)
+        for i in batch:
+            remaining[seg_block[i]] -= 1
+            if remaining[seg_block[i]] == 0:
+                done_blocks += 1
+
         # 진행 상황 콜백 호출 (있는 경우)
         if progress_callback:
             try:
-                progress_callback(idx, len(text_list))
+                progress_callback(done_blocks, len(text_list))
             except Exception as e:
-                print(f"⚠️ [진행 상황 콜백 오류] {str(e)}")
-        
-        # 진행 상황 로그 (모든 단계에서 출력)
-        print(f"  🔄 [{idx}/{len(text_list)}] 모델링 진행 중 ({input_text[:50]})")
-        sys.stdout.flush()  # 버퍼 강제 출력
-        
-        # fullText는 이미 크롬 익스텐션에서 번역된 영어 텍스트
-        # 모델에 들어가는 텍스트는 반드시 영어여야 함
+                logger.warning("⚠️ [진행 상황 콜백 오류] %s", e)
+
+    block_segments = [[] for _ in blocks]
+    for i, b in enumerate(seg_block):
+        block_segments[b].append(i)
+
+    for b, (idx, input_text) in enumerate(blocks):
         translated_text = input_text  # 이미 번역된 텍스트
-        
-        # 한글 감지 및 경고 (모델에 한글이 들어가면 안 됨)
-        import re
-        has_korean = bool(re.search(r'[가-힣]', translated_text))
-        if has_korean:
-            print(f"     ⚠️ [경고] 모델에 한글 텍스트가 입력되었습니다! (번역 확인 필요)")
-            print(f"     입력 텍스트: {translated_text[:100]}")
-            sys.stdout.flush()
-        
-        category, predicate, probability, top_preds = None, None, None, []
-        is_dark = 0
-        
-        # ResGCN 모델로 직접 예측 (노트북 구조: inductive inference)
-        print(f"     📊 ResGCN 모델 예측 중 (입력: {len(translated_text)}자)")
-        sys.stdout.flush()
-        
+        pred = None
         try:
-            # SentenceTransformer로 임베딩 생성
-            with torch.no_grad():
-                embedding = st_model.encode([translated_text], convert_to_numpy=True, show_progress_bar=False)  # [1, 768]
-            
-            # Inductive inference: forward_on_concat 사용 (노트북 방식)
-            query_probs = forward_on_concat(model, X_train, embedding)  # [1, num_classes]
-            
-            # 결과 후처리
-            pred_probs = query_probs[0]  # [num_classes]
-            pred_idx = np.argmax(pred_probs)
-            
-            # Predicate 디코딩
-            predicate = label_encoder.inverse_transform([pred_idx])[0]
-            probability = float(pred_probs[pred_idx])
-            
-            # 다크패턴 여부 판단: predicate가 "Not Dark Pattern"이 아니면 다크패턴
-            is_not_dark_keywords = ["not dark pattern", "not_dark_pattern", "not dark", "normal", "none"]
-            is_dark = 1 if not any(keyword in predicate.lower() for keyword in is_not_dark_keywords) else 0
-            
-            # Top 3 predictions
-            top_indices = pred_probs.argsort()[::-1][:3]
-            top_preds = [
-                f"{label_encoder.inverse_transform([i])[0]} ({round(pred_probs[i], 4)})"
-                for i in top_indices
-            ]
-            
-            # Category는 predicate로부터 매핑 (우선: 직접 매핑, 없으면 CSV에서 찾기)
-            if predicate:
-                # 직접 매핑 사용 (사용자 제공 매핑)
-                category = get_type_from_predicate(predicate)
-                # CSV에서 찾기 (fallback)
-                if not category:
-                    category_row = reduced_law[reduced_law["predicate"] == predicate]
-                    if not category_row.empty:
-                        category = category_row.iloc[0]["type"]
-                # 둘 다 없으면 None 유지
-            
-            # 결과 로그
-            if is_dark:
-                print(f"     🔴 다크패턴 감지: Type={category}, Predicate={predicate}, 확률={round(probability*100, 1)}%")
-            else:
-                print(f"     ⚪ 일반 텍스트: Predicate={predicate}, 확률={round(probability*100, 1)}%")
-            sys.stdout.flush()
-            
+            candidates = [seg_probs[i] for i in block_segments[b] if seg_probs[i] is not None]
+            if candidates:
+                # 하위 블록 중 다크패턴 점수가 가장 높은 것의 판정을 블록 판정으로 사용
+                pred = decode_prediction(arts, max(candidates, key=lambda p: dark_score(arts, p)), reduced_law)
+                # 결과 로그 (DEBUG 또는 BLOCK_LOG_EVERY 샘플링)
+                log_block(logger, idx, len(text_list), "%s Type=%s, Predicate=%s, 확률=%.1f%% (%s)",
+                          "🔴 다크패턴" if pred["is_darkpattern"] else "⚪ 일반", pred["category"],
+                          pred["predicate"], pred["probability"] * 100, input_text[:50])
         except Exception as e:
-            print(f"     ❌ ResGCN 예측 실패: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            sys.stdout.flush()
-            predicate = None
-            probability = None
-            top_preds = []
-            category = None
-            is_dark = 0
-        
-        # 법률 정보 연결
-        law_list = []
-        if category:
-            law_row = reduced_law[reduced_law["type"] == category]
-            if not law_row.empty:
-                try:
-                    law_list = json.loads(law_row.iloc[0]["laws"])
-                except Exception as e:
-                    print(f"[WARNING] JSON parsing error in laws: {e}")
-        
+            logger.exception("❌ ResGCN 예측 실패: %s", e)
+            pred = None
+        pred = pred or {"predicate": None, "probability": None, "top_preds": [], "is_darkpattern": 0, "category": None}
+        top_preds = pred["top_preds"]
+        category = pred["category"]
+
         output.append({
             "text": translated_text,  # 번역된 텍스트 (모델링에 사용된 텍스트)
             "translated": translated_text,  # 호환성 유지
-            "is_darkpattern": is_dark,
-            "predicate": predicate,
-            "probability": probability,
+            "is_darkpattern": pred["is_darkpattern"],
+            "predicate": pred["predicate"],
+            "probability": pred["probability"],
             "top1_predicate": top_preds[0] if len(top_preds) > 0 else None,
             "top2_predicate": top_preds[1] if len(top_preds) > 1 else None,
             "top3_predicate": top_preds[2] if len(top_preds) > 2 else None,
             "category": category,
             "type": category,
-            "laws": law_list
+            # 법률 정보 연결 (법률 목록 대신 ID)
+            "lawSetId": law_table.id_for_type(category)
         })
-    
-    return output
\ No newline at end of file
+
+    log_summary(
+        logger, "📊 [텍스트 모델링 완료]",
+        blocks=len(output),
+        segments=len(seg_texts),
+        batches=len(batches),
+        dark=sum(1 for r in output if r["is_darkpattern"]),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return output
@@ -0,0 +1,55 @@
+"""
+CPU 배포용 SentenceTransformer 동적 int8 양자화 (Linear 레이어)
+"""
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+SUPPORTED_QUANTIZATION = ("none", "int8")
+
+
+def quantize_encoder(st_model):
+    """
+    Linear 레이어를 dynamic int8로 양자화한 인코더 사본 반환 (원본 fp32 모델은 유지)
+    dynamic 양자화는 CPU 전용
+    """
+    st_model = st_model.to("cpu")
+    quantized = torch.quantization.quantize_dynamic(st_model, {nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def _encode(st_model, texts, batch_size):
+    with torch.no_grad():
+        return st_model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+
+
+def compare_encoders(fp32_model, int8_model, texts, batch_size=32):
+    """
+    fp32 / int8 인코더 임베딩 비교
+
+    Returns:
+        (fp32 임베딩, int8 임베딩, 지표 dict)
+    """
+    start = time.perf_counter()
+    emb_fp32 = _encode(fp32_model, texts, batch_size)
+    fp32_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    emb_int8 = _encode(int8_model, texts, batch_size)
+    int8_sec = time.perf_counter() - start
+
+    cos = np.sum(emb_fp32 * emb_int8, axis=1) / (
+        np.linalg.norm(emb_fp32, axis=1) * np.linalg.norm(emb_int8, axis=1) + 1e-12)
+    stats = {
+        "n": len(texts),
+        "cosine_mean": float(np.mean(cos)),
+        "cosine_p5": float(np.percentile(cos, 5)),
+        "cosine_min": float(np.min(cos)),
+        "fp32_encode_sec": round(fp32_sec, 3),
+        "int8_encode_sec": round(int8_sec, 3),
+        "speedup": round(fp32_sec / int8_sec, 2) if int8_sec > 0 else None,
+    }
+    return emb_fp32, emb_int8, stats
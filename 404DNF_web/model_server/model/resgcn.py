@@ -3,6 +3,8 @@ ResGCN_Improved 모델 정의
 PyTorch Geometric 기반의 Graph Convolutional Network 모델
 노트북(ResGCN_try.ipynb) 구조와 완전히 일치
 """
+import copy
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -73,3 +75,160 @@ class ResGCN(nn.Module):
 # 호환성을 위한 별칭
 ResGCN_Improved = ResGCN
 
+
+def gcn_norm_adj(edge_index, num_nodes, improved=True, dense=False, dtype=torch.float32):
+    """
+    GCNConv 내부 정규화(gcn_norm)와 동일한 정규화 인접행렬 계산
+    A_hat = D^-1/2 (A + fill*I) D^-1/2  (fill = 2 if improved else 1)
+
+    Args:
+        edge_index: [2, E] 엣지 인덱스 (row: source, col: target)
+        num_nodes: 노드 수
+        improved: GCNConv(improved=True)와 동일하게 self-loop 가중치 2 사용
+        dense: True면 dense 행렬, False면 sparse COO 텐서 반환
+
+    Returns:
+        [N, N] 정규화 인접행렬 (행: target, 열: source) - out = A_hat @ (x W)
+    """
+    edge_index = torch.as_tensor(edge_index, dtype=torch.long)
+    device = edge_index.device
+    row, col = edge_index[0], edge_index[1]
+    weight = torch.ones(row.numel(), dtype=dtype, device=device)
+
+    # add_remaining_self_loops와 동일: 기존 self-loop는 가중치 유지, 없는 노드에만 fill 추가
+    is_loop = row == col
+    loop_weight = torch.full((num_nodes,), 2.0 if improved else 1.0, dtype=dtype, device=device)
+    if bool(is_loop.any()):
+        loop_weight[row[is_loop]] = weight[is_loop]
+    loop_index = torch.arange(num_nodes, device=device)
+    row = torch.cat([row[~is_loop], loop_index])
+    col = torch.cat([col[~is_loop], loop_index])
+    weight = torch.cat([weight[~is_loop], loop_weight])
+
+    # target(col) 기준 degree
+    deg = torch.zeros(num_nodes, dtype=dtype, device=device).scatter_add_(0, col, weight)
+    deg_inv_sqrt = deg.pow(-0.5)
+    deg_inv_sqrt.masked_fill_(torch.isinf(deg_inv_sqrt), 0.0)
+    norm = deg_inv_sqrt[row] * weight * deg_inv_sqrt[col]
+
+    adj = torch.sparse_coo_tensor(torch.stack([col, row]), norm, (num_nodes, num_nodes)).coalesce()
+    return adj.to_dense() if dense else adj
+
+
+class _AdjBlock(nn.Module):
+    """정규화 인접행렬 기반 ResidualGCNBlock (eval 전용)"""
+    def __init__(self, blk: ResidualGCNBlock):
+        super().__init__()
+        weight = blk.conv.lin.weight.detach()
+        out_dim, in_dim = weight.shape
+        self.lin = nn.Linear(in_dim, out_dim, bias=False)
+        self.lin.weight.data.copy_(weight)
+        # GCNConv bias는 aggregation 이후에 더해짐
+        bias = blk.conv.bias.detach() if blk.conv.bias is not None else torch.zeros(out_dim, device=weight.device)
+        self.bias = nn.Parameter(bias.clone())
+        # torch_geometric BatchNorm은 내부에 BatchNorm1d(module)를 감싸고 있음
+        self.bn = copy.deepcopy(getattr(blk.bn, "module", blk.bn))
+        self.res = copy.deepcopy(blk.res_proj) if blk.res_proj is not None else nn.Identity()
+
+    def forward(self, x, adj):
+        h = self.lin(x)
+        if adj.is_sparse:
+            out = torch.sparse.mm(adj, h)
+        else:
+            out = torch.matmul(adj, h)
+        out = self.bn(out + self.bias)
+        out = F.relu(out)
+        return out + self.res(x)
+
+
+class AdjResGCN(nn.Module):
+    """
+    추론 전용 ResGCN - edge_index 대신 정규화 인접행렬(gcn_norm_adj)을 입력받음
+    ONNX(dense adj) / TorchScript(dense 또는 sparse adj) export에 사용
+    """
+    def __init__(self, model: ResGCN):
+        super().__init__()
+        self.blocks = nn.ModuleList([_AdjBlock(blk) for blk in model.blocks])
+        self.head = copy.deepcopy(model.head)
+        self.eval()
+
+    def forward(self, x, adj):
+        """
+        Args:
+            x: [N, in_dim] 노드 임베딩
+            adj: [N, N] 정규화 인접행렬 (dense 또는 sparse COO)
+
+        Returns:
+            logits: [N, out_dim]
+        """
+        for blk in self.blocks:
+            x = blk(x, adj)
+        return self.head(x)
+
+
+
+class _FoldedBlock(nn.Module):
+    """
+    BatchNorm(eval)을 GCNConv 가중치/bias에 접어넣은 블록
+    BN(A (x W^T) + b) = A (x (s*W)^T) + (b - mean) * s + beta,  s = gamma / sqrt(var + eps)
+    residual projection이 있으면 conv 가중치와 이어붙여 GEMM 1회로 계산
+    """
+    def __init__(self, blk: ResidualGCNBlock):
+        super().__init__()
+        weight = blk.conv.lin.weight.detach()
+        out_dim = weight.shape[0]
+        conv_bias = blk.conv.bias.detach() if blk.conv.bias is not None else torch.zeros(out_dim, device=weight.device)
+        bn = getattr(blk.bn, "module", blk.bn)
+        scale = bn.weight.detach() / torch.sqrt(bn.running_var + bn.eps)
+        folded_weight = weight * scale[:, None]
+        folded_bias = (conv_bias - bn.running_mean) * scale + bn.bias.detach()
+
+        self.out_dim = out_dim
+        self.has_res_proj = blk.res_proj is not None
+        if self.has_res_proj:
+            proj_weight = torch.cat([folded_weight, blk.res_proj.weight.detach()], dim=0)
+            res_bias = blk.res_proj.bias.detach()
+        else:
+            proj_weight = folded_weight
+            res_bias = torch.zeros(out_dim, device=weight.device)
+        self.register_buffer("proj_weight", proj_weight.clone())
+        self.register_buffer("bias", folded_bias.clone())
+        self.register_buffer("res_bias", res_bias.clone())
+
+    def project(self, x):
+        """x -> [N, out_dim (+ out_dim)] (conv 입력 / residual projection)"""
+        return x @ self.proj_weight.t()
+
+    def forward(self, x, adj, proj=None):
+        if proj is None:
+            proj = self.project(x)
+        h = proj[:, :self.out_dim]
+        identity = proj[:, self.out_dim:] + self.res_bias if self.has_res_proj else x
+        out = torch.sparse.mm(adj, h) if adj.is_sparse else adj @ h
+        return F.relu(out + self.bias) + identity
+
+
+class FoldedResGCN(nn.Module):
+    """
+    추론 전용 ResGCN - BatchNorm folding + 정규화 인접행렬(sparse)로 레이어당 sparse matmul 1회
+    첫 블록 projection은 입력에만 의존하므로 train 노드 부분을 미리 계산해 재사용 가능 (first_proj)
+    """
+    def __init__(self, model: ResGCN):
+        super().__init__()
+        self.blocks = nn.ModuleList([_FoldedBlock(blk) for blk in model.blocks])
+        self.head = copy.deepcopy(model.head)
+        self.eval()
+
+    def project_first(self, x):
+        return self.blocks[0].project(x)
+
+    def forward(self, x, adj, first_proj=None):
+        """
+        Args:
+            x: [N, in_dim] 노드 임베딩
+            adj: [N, N] 정규화 인접행렬 (sparse COO/CSR 또는 dense)
+            first_proj: project_first(x) 결과 (없으면 계산)
+        """
+        for i, blk in enumerate(self.blocks):
+            x = blk(x, adj, proj=first_proj if i == 0 else None)
+        return self.head(x)
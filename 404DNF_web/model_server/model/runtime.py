@@ -0,0 +1,147 @@
+"""
+추론 런타임 백엔드
+- torch       : 기존 eager PyTorch (기본값, predictor.py에서 직접 처리)
+- torchscript : model/export.py로 생성한 TorchScript 아티팩트 (sparse adj 사용)
+- onnx        : model/export.py로 생성한 ONNX 아티팩트 (onnxruntime, dense adj 사용)
+"""
+import os
+
+import numpy as np
+import torch
+
+from model.resgcn import gcn_norm_adj
+
+SUPPORTED_RUNTIMES = ("torch", "torchscript", "onnx")
+
+# export 아티팩트 파일명 (export.py와 공유)
+ARTIFACT_NAMES = {
+    "torchscript": {"encoder": "encoder.ts", "resgcn": "resgcn.ts"},
+    "onnx": {"encoder": "encoder.onnx", "resgcn": "resgcn.onnx"},
+}
+
+
+def artifact_paths(runtime, export_dir):
+    """런타임별 (encoder, resgcn) 아티팩트 경로 반환"""
+    names = ARTIFACT_NAMES[runtime]
+    return os.path.join(export_dir, names["encoder"]), os.path.join(export_dir, names["resgcn"])
+
+
+def _onnx_session(path):
+    """onnxruntime 세션 생성 (선택 의존성)"""
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise RuntimeError("MODEL_RUNTIME=onnx 사용 시 onnxruntime 패키지가 필요합니다 (pip install onnxruntime)") from e
+    providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in ort.get_available_providers()]
+    return ort.InferenceSession(path, providers=providers)
+
+
+class _EncoderBase:
+    """SentenceTransformer의 tokenizer를 그대로 사용하는 인코더 백엔드 공통부"""
+    def __init__(self, tokenizer, max_length):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def _tokenize(self, texts, return_tensors):
+        return self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors=return_tensors,
+        )
+
+
+class TorchScriptEncoder(_EncoderBase):
+    def __init__(self, path, tokenizer, max_length, device):
+        super().__init__(tokenizer, max_length)
+        self.device = device
+        self.module = torch.jit.load(path, map_location=device).eval()
+
+    def encode(self, texts):
+        tok = self._tokenize(texts, "pt")
+        with torch.no_grad():
+            emb = self.module(tok["input_ids"].to(self.device), tok["attention_mask"].to(self.device))
+        return emb.detach().cpu().numpy()
+
+
+class OnnxEncoder(_EncoderBase):
+    def __init__(self, path, tokenizer, max_length):
+        super().__init__(tokenizer, max_length)
+        self.session = _onnx_session(path)
+
+    def encode(self, texts):
+        tok = self._tokenize(texts, "np")
+        return self.session.run(None, {
+            "input_ids": tok["input_ids"].astype(np.int64),
+            "attention_mask": tok["attention_mask"].astype(np.int64),
+        })[0]
+
+
+class TorchScriptGCN:
+    """TorchScript AdjResGCN - sparse 정규화 인접행렬 사용"""
+    def __init__(self, path, device):
+        self.device = device
+        self.module = torch.jit.load(path, map_location=device).eval()
+
+    def logits(self, x, edge_index):
+        x_t = torch.as_tensor(x, dtype=torch.float32, device=self.device)
+        adj = gcn_norm_adj(torch.as_tensor(edge_index, dtype=torch.long, device=self.device), len(x), dense=False)
+        with torch.no_grad():
+            return self.module(x_t, adj).detach().cpu().numpy()
+
+
+class OnnxGCN:
+    """ONNX AdjResGCN - dense 정규화 인접행렬 사용 (메모리 O(N^2), 참조 집합이 작을 때 권장)"""
+    def __init__(self, path):
+        self.session = _onnx_session(path)
+
+    def logits(self, x, edge_index):
+        adj = gcn_norm_adj(torch.as_tensor(edge_index, dtype=torch.long), len(x), dense=True)
+        return self.session.run(None, {
+            "x": np.asarray(x, dtype=np.float32),
+            "adj": adj.numpy(),
+        })[0]
+
+
+def load_gcn_backend(runtime, export_dir, device):
+    """ResGCN 백엔드만 로드 (아티팩트 핫 리로드 시 인코더는 그대로 두고 GCN만 교체)"""
+    if runtime not in SUPPORTED_RUNTIMES:
+        raise ValueError(f"지원하지 않는 MODEL_RUNTIME: {runtime} (지원: {', '.join(SUPPORTED_RUNTIMES)})")
+    if runtime == "torch":
+        return None
+    _, gcn_path = artifact_paths(runtime, export_dir)
+    if not os.path.exists(gcn_path):
+        raise FileNotFoundError(f"{runtime} 아티팩트가 없습니다: {gcn_path} (python -m tools.export_models 로 생성)")
+    if runtime == "torchscript":
+        return TorchScriptGCN(gcn_path, device)
+    return OnnxGCN(gcn_path)
+
+
+def load_backends(runtime, export_dir, st_model, device):
+    """
+    설정된 런타임의 (encoder, gcn) 백엔드 로드
+
+    Returns:
+        (encoder_backend, gcn_backend) - torch 런타임이면 (None, None)
+    """
+    if runtime not in SUPPORTED_RUNTIMES:
+        raise ValueError(f"지원하지 않는 MODEL_RUNTIME: {runtime} (지원: {', '.join(SUPPORTED_RUNTIMES)})")
+    if runtime == "torch":
+        return None, None
+
+    encoder_path, gcn_path = artifact_paths(runtime, export_dir)
+    for path in (encoder_path, gcn_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{runtime} 아티팩트가 없습니다: {path} (python -m tools.export_models 로 생성)")
+
+    max_length = st_model.max_seq_length
+    if runtime == "torchscript":
+        return (
+            TorchScriptEncoder(encoder_path, st_model.tokenizer, max_length, device),
+            TorchScriptGCN(gcn_path, device),
+        )
+    return (
+        OnnxEncoder(encoder_path, st_model.tokenizer, max_length),
+        OnnxGCN(gcn_path),
+    )
@@ -0,0 +1,70 @@
+"""
+긴 블록 분할 + 토큰 예산 배치 (process_text_and_predict)
+
+structuredBlocks에는 문단 전체나 이어 붙은 footer 같은 긴 블록이 섞여 있다.
+이런 블록은 인코더 최대 길이에서 잘리고, 같은 배치의 짧은 문장까지 긴 길이로 padding되어 배치 전체를 느리게 만든다.
+
+- split_block: LONG_BLOCK_TOKENS를 넘는 블록을 문장 단위로 나눈 뒤, 인접 문장을 한도 안에서 다시 묶어 하위 블록 생성
+  (한 문장이 한도를 넘으면 그 문장은 그대로 - 인코더 최대 길이에서 잘림)
+- plan_batches: 토큰 길이순으로 정렬해 비슷한 길이끼리 묶고, 배치의 padding 포함 토큰 수(최대 길이 x 개수)를
+  예산 이하로 제한 -> 배치당 지연 시간이 예측 가능
+"""
+import re
+
+# 문장 경계: 종결 부호 뒤 공백, 줄바꿈, 구분 기호(|, •, ·)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+|\s+[|•·]\s+")
+
+
+def split_sentences(text):
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def split_block(text, count_tokens, max_tokens):
+    """
+    블록 -> 하위 블록 리스트 (한도 이하면 [text])
+
+    Args:
+        count_tokens: 문장 리스트 -> 문장별 토큰 수 (특수 토큰 제외)
+        max_tokens: 하위 블록 토큰 한도
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return [text]
+    lengths = count_tokens(sentences)
+    if sum(lengths) <= max_tokens:
+        return [text]
+
+    parts, current, current_len = [], [], 0
+    for sentence, length in zip(sentences, lengths):
+        if current and current_len + length > max_tokens:
+            parts.append(" ".join(current))
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += length
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+def plan_batches(lengths, token_budget, max_batch=0):
+    """
+    토큰 길이 -> 인덱스 배치 리스트 (짧은 것부터)
+
+    Args:
+        lengths: 항목별 토큰 수 (인코더 최대 길이로 자른 값)
+        token_budget: 배치당 padding 포함 토큰 수 상한 (0 = 항목마다 1건씩)
+        max_batch: 배치당 최대 항목 수 (0 = 제한 없음)
+    """
+    if token_budget <= 0:
+        return [[i] for i in range(len(lengths))]
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current = [], []
+    for i in order:
+        # 정렬되어 있으므로 새 항목의 길이가 배치의 padding 길이
+        if current and ((len(current) + 1) * lengths[i] > token_budget or 0 < max_batch <= len(current)):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,249 @@
+"""
+운영 중 프로파일링 (프로세스 재시작 없이 /admin/* 엔드포인트에서 호출)
+
+- 샘플링 프로파일러: sys._current_frames()로 모든 스레드(watcher / 스케줄러 / 요청 스레드 포함)의 스택을 주기적으로 수집해
+  flamegraph.pl / speedscope에서 바로 열 수 있는 collapsed stack 형식("스레드;프레임;... 횟수")으로 반환
+- tracemalloc 스냅샷: 이름 붙여 저장 후 두 스냅샷의 차이(증가한 할당 위치)를 조회 - 계속 커지는 집합 / 캐시 추적용
+- 버퍼 사용량: 아티팩트 배열 / 텐서, 모델 파라미터, torch CUDA 할당량, (선택) gc 기준 살아 있는 텐서 / 배열 합계
+"""
+import gc
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+# numpy / torch는 함수 안에서 import - app.py가 predictor보다 먼저 이 모듈을 import하므로
+# 모듈 수준에서 import하면 configure_blas_env()의 BLAS / OpenMP 스레드 설정보다 먼저 초기화됨
+
+# 한 번에 샘플링할 수 있는 최대 시간 (초)
+MAX_PROFILE_SECONDS = 120
+# numpy가 tracemalloc에 데이터 버퍼를 보고하는 도메인 번호 (numpy/core/include/numpy/ndarraytypes.h)
+NUMPY_TRACEMALLOC_DOMAIN = 389047
+
+
+class ProfilerBusyError(Exception):
+    """다른 샘플링이 진행 중인 경우"""
+
+
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"
+
+
+def sample_stacks(seconds, interval=0.01):
+    """
+    모든 스레드의 스택을 seconds 동안 interval 간격으로 샘플링
+
+    Returns:
+        (collapsed stack 문자열, 샘플 수) - 줄마다 "스레드이름;바깥 프레임;...;안쪽 프레임 횟수"
+    """
+    seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+    interval = max(interval, 0.001)
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("이미 샘플링이 진행 중입니다.")
+    try:
+        me = threading.get_ident()
+        counts = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                counts[";".join(reversed(stack))] += 1
+            samples += 1
+            time.sleep(interval)
+    finally:
+        _profile_lock.release()
+
+    collapsed = "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+    return collapsed + "\n", samples
+
+
+class MemorySnapshots:
+    """이름 붙인 tracemalloc 스냅샷 저장소 (첫 스냅샷 때 tracemalloc 시작)"""
+
+    def __init__(self, max_snapshots=8):
+        self.max_snapshots = max_snapshots
+        self._snapshots = {}  # 이름 -> (생성 시각, Snapshot)
+        self._lock = threading.Lock()
+
+    def take(self, name=None, nframes=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, nframes))
+        snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            name = name or f"s{len(self._snapshots) + 1}"
+            self._snapshots[name] = (datetime.now(), snapshot)
+            # 오래된 스냅샷부터 버림 (스냅샷 자체도 메모리를 차지)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.pop(next(iter(self._snapshots)))
+        return name, snapshot
+
+    def get(self, name):
+        with self._lock:
+            entry = self._snapshots.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry[1]
+
+    def list(self):
+        with self._lock:
+            return [{"name": name, "takenAt": taken_at.isoformat()} for name, (taken_at, _) in self._snapshots.items()]
+
+    def stop(self):
+        """스냅샷 삭제 + tracemalloc 중단 (추적 오버헤드 제거)"""
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def status(self):
+        traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "tracedBytes": traced,
+            "peakBytes": peak,
+            "snapshots": self.list(),
+        }
+
+
+def _python_domain(snapshot):
+    # numpy 버퍼 도메인은 buffer_usage에서 따로 집계
+    return snapshot.filter_traces([tracemalloc.DomainFilter(False, NUMPY_TRACEMALLOC_DOMAIN)])
+
+
+def top_stats(snapshot, top=20, group_by="lineno"):
+    """스냅샷 상위 할당 위치"""
+    stats = _python_domain(snapshot).statistics(group_by)
+    return [
+        {"location": str(stat.traceback), "sizeBytes": stat.size, "count": stat.count}
+        for stat in stats[:top]
+    ]
+
+
+def diff_stats(old, new, top=20, group_by="lineno"):
+    """두 스냅샷의 차이 (증가량이 큰 위치부터)"""
+    stats = _python_domain(new).compare_to(_python_domain(old), group_by)
+    return [
+        {
+            "location": str(stat.traceback),
+            "sizeDiffBytes": stat.size_diff,
+            "sizeBytes": stat.size,
+            "countDiff": stat.count_diff,
+            "count": stat.count,
+        }
+        for stat in stats[:top]
+    ]
+
+
+def _nbytes(value):
+    import numpy as np
+    import torch
+
+    if isinstance(value, torch.Tensor):
+        return value.element_size() * value.nelement()
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return 0
+
+
+def _describe_array(value):
+    import numpy as np
+
+    if value is None:
+        return None
+    return {
+        "type": type(value).__name__,
+        "shape": list(value.shape),
+        "dtype": str(value.dtype),
+        "bytes": _nbytes(value),
+        # memmap은 페이지 캐시를 공유하므로 프로세스 상주 메모리와 다름
+        "mmap": isinstance(value, np.memmap),
+    }
+
+
+def _module_bytes(module):
+    import torch
+
+    if not isinstance(module, torch.nn.Module):
+        return None
+    return sum(_nbytes(p) for p in module.parameters()) + sum(_nbytes(b) for b in module.buffers())
+
+
+def buffer_usage(arts, models=None, scan=False):
+    """
+    버퍼 사용량
+
+    Args:
+        arts: 현재 ArtifactSet
+        models: {이름: torch 모듈} - 파라미터 + 버퍼 크기 집계 대상
+        scan: True면 gc로 살아 있는 torch 텐서 / numpy 배열을 전부 훑어 합계 (객체 수에 비례해 느림)
+    """
+    import numpy as np
+    import torch
+
+    train_graph = {}
+    if arts.train_graph is not None:
+        for name, value in vars(arts.train_graph).items():
+            if _nbytes(value):
+                train_graph[name] = _describe_array(value)
+
+    usage = {
+        "artifacts": {
+            "version": arts.version,
+            "X_train": _describe_array(arts.X_train),
+            "trainGraph": train_graph,
+            "modelBytes": _module_bytes(arts.model),
+        },
+        "models": {name: _module_bytes(module) for name, module in (models or {}).items()},
+        # Linux ru_maxrss 단위는 KB
+        "maxRssBytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+    if torch.cuda.is_available():
+        usage["cuda"] = {
+            "allocatedBytes": torch.cuda.memory_allocated(),
+            "reservedBytes": torch.cuda.memory_reserved(),
+            "maxAllocatedBytes": torch.cuda.max_memory_allocated(),
+        }
+
+    if tracemalloc.is_tracing():
+        numpy_traced = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.DomainFilter(True, NUMPY_TRACEMALLOC_DOMAIN)]
+        )
+        usage["numpyTracedBytes"] = sum(stat.size for stat in numpy_traced.statistics("filename"))
+
+    if scan:
+        tensors = Counter()
+        tensor_bytes = Counter()
+        array_count, array_bytes = 0, 0
+        for obj in gc.get_objects():
+            try:
+                if isinstance(obj, torch.Tensor):
+                    key = f"{obj.device}:{obj.dtype}"
+                    tensors[key] += 1
+                    tensor_bytes[key] += _nbytes(obj)
+                elif isinstance(obj, np.ndarray) and obj.base is None:
+                    array_count += 1
+                    array_bytes += obj.nbytes
+            except Exception:
+                continue
+        usage["scan"] = {
+            "tensors": {key: {"count": tensors[key], "bytes": tensor_bytes[key]} for key in tensors},
+            # gc가 추적하는 배열만 포함 (view 제외)
+            "numpyArrays": {"count": array_count, "bytes": array_bytes},
+        }
+    return usage
@@ -0,0 +1,240 @@
+"""
+크기 기반 우선순위 스케줄러 (interactive / bulk 레인)
+
+- 단일 스크린샷 /predict, 짧은 페이지 같은 interactive 작업이 수천 블록짜리 크롤링 문서 뒤에서 기다리지 않도록
+  예상 비용(남은 블록 수)이 작은 작업부터 실행
+- 큰 문서는 청크 단위로 실행하고 청크 사이에 다시 큐에 넣음 (청크 경계에서 선점)
+- 마감 시각이 있는 작업은 남은 예상 시간이 마감까지 남은 시간보다 크면 최우선 (earliest deadline first)
+- bulk 작업은 동시에 BULK 최대 실행 수까지만 워커를 점유하고, 오래 기다리면 interactive로 승격 (기아 방지)
+
+작업은 일반 함수(한 번에 실행) 또는 제너레이터(청크마다 처리한 비용 단위를 yield, return 값이 결과)
+제너레이터가 concurrent.futures.Future를 yield하면 완료될 때까지 워커를 놓아줌 (비동기 DB I/O 대기 중 다른 작업 실행)
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+from model.logging_setup import get_logger
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+logger = get_logger(__name__)
+
+
+class _Job:
+    __slots__ = ("seq", "key", "lane", "cost", "remaining", "deadline", "submitted_at", "ready_since",
+                 "step", "is_generator", "future", "name")
+
+    def __init__(self, seq, key, lane, cost, deadline, step, is_generator, name):
+        now = time.monotonic()
+        self.seq = seq
+        self.key = key
+        self.lane = lane
+        self.cost = max(1, cost)
+        self.remaining = self.cost
+        self.deadline = deadline
+        self.submitted_at = now
+        self.ready_since = now
+        self.step = step
+        self.is_generator = is_generator
+        self.future = Future()
+        self.name = name
+
+
+class PriorityScheduler:
+    def __init__(self, workers=2, bulk_max_running=1, bulk_max_wait_seconds=120.0, default_seconds_per_unit=0.05):
+        self.workers = max(1, workers)
+        # bulk 작업이 모든 워커를 점유하지 않도록 (0 이하 = 제한 없음)
+        self.bulk_max_running = bulk_max_running if bulk_max_running > 0 else self.workers
+        self.bulk_max_wait_seconds = bulk_max_wait_seconds
+        # 비용 단위(블록)당 처리 시간 추정치 - 청크 실행 시간으로 갱신 (EWMA)
+        self.seconds_per_unit = default_seconds_per_unit
+        self._queue = []
+        self._keys = set()
+        self._running = {INTERACTIVE: 0, BULK: 0}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._threads = []
+        self._parked = 0
+        self._stats = {"completed": 0, "failed": 0, "preemptions": 0, "deadline_missed": 0, "io_waits": 0}
+
+    # ---- 제출 ----
+
+    def submit(self, work, lane=INTERACTIVE, cost=1, deadline_seconds=None, key=None, name=None):
+        """
+        작업 제출
+
+        Args:
+            work: 인자 없는 함수 또는 제너레이터 객체
+            lane: interactive | bulk
+            cost: 예상 비용 (블록 수 등)
+            deadline_seconds: 제출 시점 기준 마감까지 남은 시간 (None = 마감 없음)
+            key: 중복 제출 방지 키 (같은 키가 대기 / 실행 중이면 None 반환)
+
+        Returns:
+            concurrent.futures.Future 또는 None (중복)
+        """
+        if lane not in LANES:
+            raise ValueError(f"지원하지 않는 레인: {lane} (지원: {', '.join(LANES)})")
+        is_generator = hasattr(work, "send") and hasattr(work, "throw")
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        with self._cond:
+            if key is not None:
+                if key in self._keys:
+                    if is_generator:
+                        work.close()
+                    return None
+                self._keys.add(key)
+            job = _Job(next(self._seq), key, lane, cost, deadline, work, is_generator, name or str(key or ""))
+            self._queue.append(job)
+            self._cond.notify()
+        # 첫 제출 시 워커 스레드 시작
+        self.start()
+        return job.future
+
+    def run(self, work, lane=INTERACTIVE, cost=1, deadline_seconds=None, timeout=None):
+        """제출 후 결과 대기 (Flask 요청 스레드용)"""
+        return self.submit(work, lane, cost, deadline_seconds).result(timeout=timeout)
+
+    # ---- 실행 ----
+
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            self._start_threads()
+
+    def _start_threads(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker_loop, name=f"scheduler-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _effective_lane(self, job, now):
+        if job.lane == BULK and now - job.ready_since > self.bulk_max_wait_seconds:
+            return INTERACTIVE
+        return job.lane
+
+    def _priority(self, job, now):
+        """작을수록 먼저 실행"""
+        if job.deadline is not None:
+            slack = job.deadline - now - job.remaining * self.seconds_per_unit
+            if slack <= 0:
+                # 마감 위험: earliest deadline first
+                return (0, job.deadline, job.seq)
+        lane_rank = 0 if self._effective_lane(job, now) == INTERACTIVE else 1
+        # 같은 레인에서는 남은 비용이 작은 작업부터 (shortest remaining work first)
+        return (1, lane_rank, job.remaining, job.seq)
+
+    def _pop(self):
+        """실행할 작업 선택 (호출자가 _cond 보유)"""
+        now = time.monotonic()
+        candidates = [
+            job for job in self._queue
+            if self._effective_lane(job, now) == INTERACTIVE or self._running[BULK] < self.bulk_max_running
+        ]
+        if not candidates:
+            return None
+        job = min(candidates, key=lambda j: self._priority(j, now))
+        self._queue.remove(job)
+        return job
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = self._pop()
+                while job is None:
+                    self._cond.wait(timeout=1.0)
+                    job = self._pop()
+                lane = job.lane
+                self._running[lane] += 1
+
+            outcome = self._run_step(job)
+
+            with self._cond:
+                self._running[lane] -= 1
+                if outcome is True:
+                    if job.key is not None:
+                        self._keys.discard(job.key)
+                elif outcome is False:
+                    # 청크 경계: 다시 큐에 넣어 더 우선인 작업이 먼저 실행되도록
+                    job.ready_since = time.monotonic()
+                    self._queue.append(job)
+                    self._stats["preemptions"] += 1
+                else:
+                    self._parked += 1
+                    self._stats["io_waits"] += 1
+                self._cond.notify_all()
+            if isinstance(outcome, Future):
+                # I/O 완료 후 다시 큐에 넣음
+                outcome.add_done_callback(lambda _f, job=job: self._resume(job))
+
+    def _resume(self, job):
+        with self._cond:
+            self._parked -= 1
+            job.ready_since = time.monotonic()
+            self._queue.append(job)
+            self._cond.notify()
+
+    def _run_step(self, job):
+        """작업 한 단계 실행 -> True(완료) / False(청크 경계, 다시 큐) / Future(I/O 대기)"""
+        started = time.monotonic()
+        try:
+            if not job.is_generator:
+                result = job.step()
+                self._finish(job, result, started)
+                return True
+            units = next(job.step)
+            if isinstance(units, Future):
+                return units
+        except StopIteration as stop:
+            self._finish(job, stop.value, started)
+            return True
+        except BaseException as e:
+            self._stats["failed"] += 1
+            logger.exception("❌ [스케줄러] 작업 실패 (%s): %s", job.name, e)
+            job.future.set_exception(e)
+            return True
+
+        units = max(1, int(units or 1))
+        self._observe(units, time.monotonic() - started)
+        job.remaining = max(1, job.remaining - units)
+        return False
+
+    def _finish(self, job, result, started):
+        # 블록 단위 비용 추정은 청크 작업(제너레이터)에서만 갱신 (이미지 요청은 단위가 다름)
+        if job.is_generator:
+            self._observe(job.remaining, time.monotonic() - started)
+        self._stats["completed"] += 1
+        if job.deadline is not None and time.monotonic() > job.deadline:
+            self._stats["deadline_missed"] += 1
+            logger.warning("⏰ [스케줄러] 마감 초과: %s", job.name)
+        job.future.set_result(result)
+
+    def _observe(self, units, seconds):
+        if units > 0 and seconds > 0:
+            self.seconds_per_unit = 0.8 * self.seconds_per_unit + 0.2 * (seconds / units)
+
+    def stats(self):
+        """대기 / 실행 현황 (/health 노출용)"""
+        with self._cond:
+            now = time.monotonic()
+            queued = {lane: 0 for lane in LANES}
+            queued_cost = {lane: 0 for lane in LANES}
+            for job in self._queue:
+                lane = self._effective_lane(job, now)
+                queued[lane] += 1
+                queued_cost[lane] += job.remaining
+            return {
+                "workers": self.workers,
+                "bulkMaxRunning": self.bulk_max_running,
+                "queued": queued,
+                "queuedCost": queued_cost,
+                "running": dict(self._running),
+                "parked": self._parked,
+                "secondsPerUnit": round(self.seconds_per_unit, 4),
+                **self._stats,
+            }
@@ -0,0 +1,121 @@
+"""
+MongoDB 인덱스 부트스트랩 + 페이지 단위 요약
+
+- 서버 시작 시 조회 / 선점 / lease 인수에 쓰이는 인덱스를 보장 (이미 있으면 no-op)
+- 모델링 완료 시 블록별 model 문서를 집계한 요약(modelingSummary)을 extension 문서에 함께 기록해
+  요약 화면이 페이지의 model 문서 수백 개를 매번 스캔하지 않도록 함
+- change stream / 인수 조회는 선점 판단에 필요한 필드와 블록 수만 받고(lean),
+  본문(structuredBlocks 또는 fullText/originalText)은 선점에 성공한 인스턴스만 조회
+"""
+from collections import Counter
+
+# (컬렉션 이름, 인덱스 키, 인덱스 이름)
+INDEXES = [
+    # GET /model?id=..., /model/summary (id 단독 조회도 prefix로 사용)
+    ("model", [("id", 1), ("is_darkpattern", 1)], "id_is_darkpattern"),
+    # 선점 / 상태 조회
+    ("extension", [("modelingStatus", 1), ("processingServerId", 1)], "modelingStatus_processingServerId"),
+    # 만료 lease 인수 점검
+    ("extension", [("leaseExpiresAt", 1)], "leaseExpiresAt"),
+    # delta 모드 기준 실행 조회 (같은 tabUrl의 최근 문서)
+    ("extension", [("tabUrl", 1), ("_id", -1)], "tabUrl_id"),
+]
+
+
+def ensure_indexes(db):
+    """필요한 인덱스 생성 - 권한 부족 등으로 실패해도 서버는 계속 실행"""
+    for collection_name, keys, name in INDEXES:
+        try:
+            db[collection_name].create_index(keys, name=name, background=True)
+            print(f"   - 인덱스 확인: {collection_name}.{name}")
+        except Exception as e:
+            print(f"⚠️ [인덱스 생성 실패] {collection_name}.{name}: {str(e)}")
+
+
+def build_page_summary(result_docs, top_n=5):
+    """
+    한 페이지(extension 문서)의 model 결과 문서 목록 -> 요약
+
+    Returns:
+        {total, dark, percent, byType, byPredicate, topItems}
+        byType / byPredicate는 다크패턴 블록만 집계, topItems는 확률 상위 다크패턴 블록
+    """
+    dark_docs = [d for d in result_docs if d.get("is_darkpattern")]
+    total = len(result_docs)
+    dark = len(dark_docs)
+
+    by_type = Counter(d.get("type") or "unknown" for d in dark_docs)
+    by_predicate = Counter(d.get("predicate") or "unknown" for d in dark_docs)
+
+    top_docs = sorted(dark_docs, key=lambda d: d.get("probability") or 0, reverse=True)[:top_n]
+    top_items = [
+        {
+            "string": d.get("string"),
+            "type": d.get("type"),
+            "predicate": d.get("predicate"),
+            "probability": d.get("probability"),
+        }
+        for d in top_docs
+    ]
+
+    return {
+        "total": total,
+        "dark": dark,
+        "percent": round(dark / total * 100) if total > 0 else 0,
+        "byType": dict(by_type),
+        "byPredicate": dict(by_predicate),
+        "topItems": top_items,
+    }
+
+
+# 선점 / 스케줄링 판단에 쓰는 필드 (본문 제외)
+CLAIM_FIELDS = ("processingServerId", "leaseExpiresAt", "modelingStatus", "modelingPriority", "modelingDeadline")
+# 모델링에 쓰는 structuredBlocks 하위 필드
+STRUCTURED_BLOCK_FIELDS = (
+    "text", "plainText", "translatedPlainText", "originalText", "rawText", "originalPlainText", "rawPlainText",
+    "index", "selector", "tag", "frameUrl", "frameTitle", "frameBlockIndex", "blockType", "frameId", "linkHref",
+)
+# 로그에 쓰는 페이지 메타데이터
+PAGE_FIELDS = ("tabUrl", "tabTitle", "framesCollected")
+
+
+def _lean_fields(prefix):
+    """
+    lean 문서 필드 ($project 사양)
+    blockCount: structuredBlocks 개수, 없으면 fullText의 구분자('#', 없으면 '*') 기준 세그먼트 수 (근사)
+    structured: structuredBlocks가 비어 있지 않으면 True
+    """
+    blocks = f"${prefix}structuredBlocks"
+    full_text = f"${prefix}fullText"
+    has_blocks = {"$and": [{"$isArray": blocks}, {"$gt": [{"$size": {"$ifNull": [blocks, []]}}, 0]}]}
+    text_segments = {"$cond": [
+        {"$eq": [{"$type": full_text}, "string"]},
+        {"$size": {"$split": [full_text, {"$cond": [{"$gte": [{"$indexOfCP": [full_text, "#"]}, 0]}, "#", "*"]}]}},
+        0,
+    ]}
+    fields = {f"{prefix}_id": 1}
+    fields.update({f"{prefix}{name}": 1 for name in CLAIM_FIELDS})
+    fields[f"{prefix}structured"] = has_blocks
+    fields[f"{prefix}blockCount"] = {"$cond": [has_blocks, {"$size": {"$ifNull": [blocks, []]}}, text_segments]}
+    return fields
+
+
+def change_stream_project_stage():
+    """change stream $project 단계: fullDocument 대신 _id + 선점 필드 + 블록 수만 전송"""
+    return {"$project": {"operationType": 1, **_lean_fields("fullDocument.")}}
+
+
+def find_lean_document(collection, doc_id):
+    """인수 후보 등 ID만 아는 문서의 lean 스냅샷 (change stream 이벤트와 같은 모양)"""
+    cursor = collection.aggregate([{"$match": {"_id": doc_id}}, {"$project": _lean_fields("")}])
+    return next(cursor, None)
+
+
+def modeling_projection(structured):
+    """선점 후 본문 조회용 projection - structuredBlocks가 있으면 필요한 하위 필드만, 없으면 텍스트 필드"""
+    fields = {name: 1 for name in PAGE_FIELDS}
+    if structured:
+        fields.update({f"structuredBlocks.{name}": 1 for name in STRUCTURED_BLOCK_FIELDS})
+    else:
+        fields.update({"fullText": 1, "originalText": 1})
+    return fields
@@ -0,0 +1,10 @@
+"""
+model_server 단위 테스트 공통 설정
+실행: cd model_server && python -m pytest
+무거운 의존성(numpy / torch / bson / onnxruntime 등)이 필요한 테스트는 해당 패키지가 없으면 skip
+"""
+import os
+import sys
+
+# app.py와 같은 기준으로 import (from model.xxx import ..., import scheduler)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
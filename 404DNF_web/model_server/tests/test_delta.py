@@ -0,0 +1,36 @@
+"""재수집 페이지 delta 처리 (delta.block_key / carried_result)"""
+import pytest
+
+pytest.importorskip("bson")
+
+from delta import CARRIED_FIELDS, block_key, carried_result  # noqa: E402
+
+
+def test_block_key_normalizes_whitespace_and_case():
+    assert block_key("  Only 2\n left   in STOCK ", "#stock") == ("only 2 left in stock", "#stock")
+    assert block_key("Only 2 left in stock", "#stock") == block_key("only  2 left in stock", "#stock")
+
+
+def test_block_key_selector_distinguishes_blocks():
+    assert block_key("Buy now", "#a") != block_key("Buy now", "#b")
+    # selector가 없는 텍스트 블록은 텍스트만 비교
+    assert block_key("Buy now", "") == block_key("Buy now", None) == ("buy now", None)
+
+
+def test_block_key_handles_missing_text():
+    assert block_key(None, None) == ("", None)
+
+
+def test_carried_result_scales_probability_without_mutating_prior():
+    prior = {"type": "Scarcity", "predicate": "Low-stock Messages", "probability": 87, "is_darkpattern": 1}
+    result = carried_result(prior)
+    assert result == {"type": "Scarcity", "predicate": "Low-stock Messages", "probability": 0.87,
+                      "is_darkpattern": 1}
+    assert prior["probability"] == 87
+    assert set(result) == set(CARRIED_FIELDS)
+
+
+def test_carried_result_keeps_missing_probability():
+    assert carried_result({"type": None, "predicate": None, "probability": None, "is_darkpattern": 0}) == {
+        "type": None, "predicate": None, "probability": None, "is_darkpattern": 0,
+    }
@@ -0,0 +1,115 @@
+"""ONNX / TorchScript export 결과와 eager 모델의 parity (model/export.py, model/runtime.py)"""
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+pytest.importorskip("torch_geometric")
+
+from torch_geometric.data import Data  # noqa: E402
+
+from model.export import export_encoder, export_resgcn  # noqa: E402
+from model.resgcn import ResGCN  # noqa: E402
+from model.runtime import OnnxEncoder, OnnxGCN, TorchScriptEncoder, TorchScriptGCN  # noqa: E402
+
+IN_DIM, HIDDEN, NUM_CLASSES = 16, 8, 4
+ATOL = 1e-4
+TEXTS = ["only two left in stock", "hurry sale ends soon", "free shipping", "thanks"]
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+         "only", "two", "left", "in", "stock", "hurry", "sale", "ends", "soon", "free", "shipping", "thanks"]
+
+
+def _resgcn():
+    """BatchNorm 통계 / bias가 기본값이 아닌 ResGCN (folding / bias 순서 오류가 드러나도록)"""
+    torch.manual_seed(0)
+    model = ResGCN(IN_DIM, HIDDEN, NUM_CLASSES, layers=2)
+    with torch.no_grad():
+        for blk in model.blocks:
+            bn = getattr(blk.bn, "module", blk.bn)
+            bn.running_mean.uniform_(-0.5, 0.5)
+            bn.running_var.uniform_(0.5, 2.0)
+            bn.weight.uniform_(0.5, 1.5)
+            bn.bias.uniform_(-0.2, 0.2)
+            blk.conv.bias.uniform_(-0.1, 0.1)
+    return model.eval()
+
+
+def _graph(n=12):
+    """ring + 건너뛴 이웃 (대칭) 그래프"""
+    torch.manual_seed(1)
+    x = torch.randn(n, IN_DIM)
+    ring = torch.arange(n)
+    src = torch.cat([ring, ring])
+    dst = torch.cat([(ring + 1) % n, (ring + 3) % n])
+    edge_index = torch.stack([torch.cat([src, dst]), torch.cat([dst, src])])
+    return x, edge_index
+
+
+def _eager_logits(model, x, edge_index):
+    with torch.no_grad():
+        return model(Data(x=x, edge_index=edge_index)).numpy()
+
+
+def test_resgcn_torchscript_sparse_adj_parity(tmp_path):
+    model = _resgcn()
+    path = export_resgcn(model, str(tmp_path / "resgcn.ts"), "torchscript", IN_DIM)
+    x, edge_index = _graph()
+
+    backend = TorchScriptGCN(path, torch.device("cpu"))
+    np.testing.assert_allclose(backend.logits(x.numpy(), edge_index.numpy()),
+                               _eager_logits(model, x, edge_index), atol=ATOL)
+
+
+def test_resgcn_onnx_dense_adj_parity(tmp_path):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    model = _resgcn()
+    path = export_resgcn(model, str(tmp_path / "resgcn.onnx"), "onnx", IN_DIM)
+    # export 샘플(노드 8개)과 다른 노드 수로 dynamic axes 확인
+    x, edge_index = _graph(n=12)
+
+    backend = OnnxGCN(path)
+    np.testing.assert_allclose(backend.logits(x.numpy(), edge_index.numpy()),
+                               _eager_logits(model, x, edge_index), atol=ATOL)
+
+
+@pytest.fixture(scope="module")
+def st_model(tmp_path_factory):
+    """허브 다운로드 없이 만든 작은 BERT 기반 SentenceTransformer (Transformer -> mean Pooling -> Normalize)"""
+    transformers = pytest.importorskip("transformers")
+    st = pytest.importorskip("sentence_transformers")
+
+    model_dir = tmp_path_factory.mktemp("tiny_bert")
+    vocab_path = model_dir / "vocab.txt"
+    vocab_path.write_text("\n".join(VOCAB) + "\n")
+    transformers.BertTokenizerFast(vocab_file=str(vocab_path)).save_pretrained(str(model_dir))
+    torch.manual_seed(2)
+    config = transformers.BertConfig(vocab_size=len(VOCAB), hidden_size=16, num_hidden_layers=1,
+                                     num_attention_heads=2, intermediate_size=32, max_position_embeddings=64)
+    transformers.BertModel(config).save_pretrained(str(model_dir))
+
+    transformer = st.models.Transformer(str(model_dir), max_seq_length=32)
+    pooling = st.models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+    return st.SentenceTransformer(modules=[transformer, pooling, st.models.Normalize()], device="cpu")
+
+
+def _eager_encode(st_model, texts):
+    with torch.no_grad():
+        return st_model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+
+
+def test_encoder_torchscript_parity(tmp_path, st_model):
+    path = export_encoder(st_model, str(tmp_path / "encoder.ts"), "torchscript")
+
+    backend = TorchScriptEncoder(path, st_model.tokenizer, st_model.max_seq_length, torch.device("cpu"))
+    np.testing.assert_allclose(backend.encode(TEXTS), _eager_encode(st_model, TEXTS), atol=ATOL)
+
+
+def test_encoder_onnx_parity(tmp_path, st_model):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    path = export_encoder(st_model, str(tmp_path / "encoder.onnx"), "onnx")
+
+    backend = OnnxEncoder(path, st_model.tokenizer, st_model.max_seq_length)
+    # 길이가 다른 문장이 섞인 배치 (padding mask 포함 mean pooling 확인)
+    np.testing.assert_allclose(backend.encode(TEXTS), _eager_encode(st_model, TEXTS), atol=ATOL)
+
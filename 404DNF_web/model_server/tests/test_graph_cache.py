@@ -0,0 +1,86 @@
+"""FoldedResGCN / TrainGraphCache와 GCNConv 기반 ResGCN의 parity (model/resgcn.py, model/graph_cache.py)"""
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+pytest.importorskip("torch_geometric")
+pytest.importorskip("sklearn")
+
+from torch_geometric.data import Data  # noqa: E402
+
+from model.graph_cache import TrainGraphCache, build_edge_index, knn_indices  # noqa: E402
+from model.resgcn import FoldedResGCN, ResGCN, gcn_norm_adj  # noqa: E402
+
+IN_DIM, HIDDEN, NUM_CLASSES = 16, 8, 4
+KNN_K = 5
+ATOL = 1e-4
+
+
+def _resgcn(hidden=HIDDEN):
+    """BatchNorm 통계 / bias가 기본값이 아닌 ResGCN (folding 오류가 드러나도록)"""
+    torch.manual_seed(0)
+    model = ResGCN(IN_DIM, hidden, NUM_CLASSES, layers=2)
+    with torch.no_grad():
+        for blk in model.blocks:
+            bn = getattr(blk.bn, "module", blk.bn)
+            bn.running_mean.uniform_(-0.5, 0.5)
+            bn.running_var.uniform_(0.5, 2.0)
+            bn.weight.uniform_(0.5, 1.5)
+            bn.bias.uniform_(-0.2, 0.2)
+            blk.conv.bias.uniform_(-0.1, 0.1)
+    return model.eval()
+
+
+def _eager_logits(model, x, edge_index):
+    with torch.no_grad():
+        return model(Data(x=torch.as_tensor(x, dtype=torch.float32),
+                          edge_index=torch.as_tensor(edge_index, dtype=torch.long))).numpy()
+
+
+@pytest.mark.parametrize("hidden", [HIDDEN, IN_DIM])  # residual projection 있음 / 없음
+@pytest.mark.parametrize("dense", [False, True])
+def test_folded_resgcn_matches_gcnconv(hidden, dense):
+    model = _resgcn(hidden)
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(40, IN_DIM)).astype(np.float32)
+    edge_index = build_edge_index(knn_indices(x, k=KNN_K), mutual=True)
+
+    adj = gcn_norm_adj(torch.as_tensor(edge_index), len(x), dense=dense)
+    with torch.no_grad():
+        folded = FoldedResGCN(model)(torch.from_numpy(x), adj).numpy()
+    np.testing.assert_allclose(folded, _eager_logits(model, x, edge_index), atol=ATOL)
+
+
+@pytest.mark.parametrize("mutual", [True, False])
+def test_train_graph_cache_matches_gcnconv_on_same_graph(mutual):
+    """
+    캐시는 query끼리의 엣지 / 밀려나는 train 엣지를 반영하지 않는 근사이므로,
+    캐시가 사용하는 그래프(train kNN 엣지 + query_edges)를 그대로 GCNConv에 넣은 결과와 비교
+    """
+    model = _resgcn()
+    rng = np.random.default_rng(1)
+    X_train = rng.normal(size=(60, IN_DIM)).astype(np.float32)
+    X_query = rng.normal(size=(3, IN_DIM)).astype(np.float32)
+    cache = TrainGraphCache(model, X_train, knn_k=KNN_K, mutual=mutual)
+
+    n = len(X_train)
+    train_edges = build_edge_index(knn_indices(X_train, k=KNN_K), mutual)
+    q_local, t_idx = cache.query_edges(X_query)
+    q_node = q_local + n
+    edge_index = np.hstack([train_edges, np.vstack([q_node, t_idx]), np.vstack([t_idx, q_node])])
+
+    expected = _eager_logits(model, np.vstack([X_train, X_query]), edge_index)[n:]
+    np.testing.assert_allclose(cache.logits(X_query), expected, atol=ATOL)
+
+
+def test_train_graph_cache_neighbors_saved_and_reloaded(tmp_path):
+    """cache_dir에 저장한 train kNN을 다시 읽어도 같은 로짓"""
+    model = _resgcn()
+    rng = np.random.default_rng(2)
+    X_train = rng.normal(size=(30, IN_DIM)).astype(np.float32)
+    X_query = rng.normal(size=(2, IN_DIM)).astype(np.float32)
+
+    first = TrainGraphCache(model, X_train, knn_k=KNN_K, cache_dir=str(tmp_path)).logits(X_query)
+    assert len(list(tmp_path.glob("train_knn_*.npy"))) == 2
+    second = TrainGraphCache(model, X_train, knn_k=KNN_K, cache_dir=str(tmp_path)).logits(X_query)
+    np.testing.assert_allclose(first, second, atol=1e-6)
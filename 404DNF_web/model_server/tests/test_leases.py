@@ -0,0 +1,36 @@
+"""문서 파티셔닝 (leases.partition_of / partition_match_stage)"""
+import pytest
+
+bson = pytest.importorskip("bson")
+
+from leases import partition_match_stage, partition_of  # noqa: E402
+
+
+def _suffixes(stage):
+    return stage["$match"]["$expr"]["$in"][1]
+
+
+def _object_id(last_byte):
+    return bson.ObjectId("65a1b2c3d4e5f6a7b8c9d0" + f"{last_byte:02x}")
+
+
+@pytest.mark.parametrize("partition_count", [1, 2, 3, 7])
+def test_every_document_in_exactly_one_partition(partition_count):
+    for last_byte in range(256):
+        doc_id = _object_id(last_byte)
+        owners = [index for index in range(partition_count)
+                  if str(doc_id)[-2:] in _suffixes(partition_match_stage(partition_count, index))]
+        assert owners == [partition_of(doc_id, partition_count)]
+
+
+def test_partition_of_uses_last_byte():
+    assert partition_of(_object_id(0x07), 4) == 3
+    assert partition_of(_object_id(0xff), 16) == 15
+    # str / ObjectId 모두 같은 결과
+    assert partition_of(str(_object_id(0x10)), 3) == partition_of(_object_id(0x10), 3) == 16 % 3
+
+
+def test_match_stage_compares_last_two_hex_digits():
+    expr = partition_match_stage(2, 1)["$match"]["$expr"]["$in"][0]
+    assert expr == {"$substrCP": [{"$toString": "$fullDocument._id"}, 22, 2]}
+    assert _suffixes(partition_match_stage(2, 1))[:3] == ["01", "03", "05"]
@@ -0,0 +1,73 @@
+"""train 근접 중복 지름길 (model/near_dup.py)"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from model import near_dup  # noqa: E402
+from model.near_dup import NearDuplicateIndex, encode_labels, train_labels_path  # noqa: E402
+
+CLASSES = ["Countdown Timers", "Low-stock Messages", "Not Dark Pattern"]
+
+
+def test_train_labels_path():
+    assert train_labels_path("/m/embeddings_improved.npy") == "/m/train_labels.npy"
+    assert train_labels_path("/m/coreset_2000.npy") == "/m/coreset_2000_labels.npy"
+
+
+def test_encode_labels_from_names_and_indices():
+    np.testing.assert_array_equal(encode_labels(["Not Dark Pattern", "Countdown Timers"], CLASSES), [2, 0])
+    encoded = encode_labels(np.array([1, 2], dtype=np.int64), CLASSES)
+    assert encoded.dtype == np.int32
+    np.testing.assert_array_equal(encoded, [1, 2])
+
+
+def test_encode_labels_rejects_unknown_or_out_of_range():
+    with pytest.raises(ValueError):
+        encode_labels(["Confirmshaming"], CLASSES)
+    with pytest.raises(ValueError):
+        encode_labels([3], CLASSES)
+
+
+def test_label_count_must_match_embeddings():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(np.ones((3, 4), dtype=np.float32), [0, 1], threshold=0.9)
+
+
+def test_nearest_matches_brute_force_cosine(monkeypatch):
+    # chunk 경계를 넘는 query 수로 확인
+    monkeypatch.setattr(near_dup, "SIMILARITY_CHUNK", 4)
+    rng = np.random.default_rng(0)
+    X_train = rng.normal(size=(50, 8)).astype(np.float32)
+    X_query = rng.normal(size=(10, 8)).astype(np.float32)
+    index = NearDuplicateIndex(X_train, np.zeros(len(X_train), dtype=np.int32), threshold=0.9)
+
+    idx, sims = index.nearest(X_query)
+    unit_train = X_train / np.linalg.norm(X_train, axis=1, keepdims=True)
+    unit_query = X_query / np.linalg.norm(X_query, axis=1, keepdims=True)
+    expected = unit_query @ unit_train.T
+    np.testing.assert_array_equal(idx, expected.argmax(axis=1))
+    np.testing.assert_allclose(sims, expected.max(axis=1), atol=1e-5)
+
+
+def test_match_uses_threshold_and_counts_stats():
+    X_train = np.eye(3, dtype=np.float32)
+    labels = np.array([0, 1, 2], dtype=np.int32)
+    index = NearDuplicateIndex(X_train, labels, threshold=0.95)
+    # 0번과 거의 같은 문장 / 어느 train과도 먼 문장
+    X_query = np.array([[2.0, 0.01, 0.0], [1.0, 1.0, 1.0]], dtype=np.float32)
+
+    hit, hit_labels, sims = index.match(X_query)
+    np.testing.assert_array_equal(hit, [True, False])
+    np.testing.assert_array_equal(hit_labels, [0])
+    assert sims[0] > 0.99
+    assert index.stats() == {"threshold": 0.95, "queries": 2, "hits": 1, "hitRate": 0.5}
+
+    # threshold를 지정한 조회(리포트용)는 통계에 포함하지 않음
+    hit, hit_labels, _ = index.match(X_query, threshold=0.5)
+    np.testing.assert_array_equal(hit, [True, True])
+    assert index.stats()["queries"] == 2
+
+
+def test_stats_before_queries():
+    index = NearDuplicateIndex(np.eye(2, dtype=np.float32), [0, 1], threshold=0.9)
+    assert index.stats()["hitRate"] is None
@@ -0,0 +1,119 @@
+"""우선순위 스케줄러 실행 순서 (scheduler.PriorityScheduler)"""
+import threading
+
+import pytest
+
+from scheduler import BULK, INTERACTIVE, PriorityScheduler
+
+TIMEOUT = 5
+
+
+def _blocked_scheduler(**kwargs):
+    """워커 1개를 막아 둔 스케줄러 - 막는 동안 제출한 작업은 풀린 뒤 우선순위 순서로 실행"""
+    scheduler = PriorityScheduler(workers=1, **kwargs)
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(TIMEOUT)
+
+    scheduler.submit(blocker, name="blocker")
+    assert started.wait(TIMEOUT)
+    return scheduler, release
+
+
+def _record(order, name):
+    return lambda: order.append(name)
+
+
+def test_shortest_cost_first_within_lane():
+    scheduler, release = _blocked_scheduler()
+    order = []
+    futures = [scheduler.submit(_record(order, name), cost=cost)
+               for name, cost in (("large", 500), ("small", 2), ("medium", 40))]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ["small", "medium", "large"]
+
+
+def test_interactive_before_bulk():
+    scheduler, release = _blocked_scheduler()
+    order = []
+    futures = [
+        scheduler.submit(_record(order, "bulk"), lane=BULK, cost=1),
+        scheduler.submit(_record(order, "interactive"), lane=INTERACTIVE, cost=100),
+    ]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ["interactive", "bulk"]
+
+
+def test_waiting_bulk_promoted_to_interactive():
+    scheduler, release = _blocked_scheduler(bulk_max_wait_seconds=0)
+    order = []
+    futures = [
+        scheduler.submit(_record(order, "bulk"), lane=BULK, cost=1),
+        scheduler.submit(_record(order, "interactive"), lane=INTERACTIVE, cost=100),
+    ]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    # 승격된 bulk 작업은 interactive와 비용으로 비교
+    assert order == ["bulk", "interactive"]
+
+
+def test_deadline_at_risk_runs_first():
+    scheduler, release = _blocked_scheduler()
+    order = []
+    futures = [
+        scheduler.submit(_record(order, "small"), cost=1),
+        scheduler.submit(_record(order, "deadline"), lane=BULK, cost=1000, deadline_seconds=0),
+    ]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ["deadline", "small"]
+    assert scheduler.stats()["deadline_missed"] == 1
+
+
+def test_chunked_job_preempted_at_chunk_boundary():
+    scheduler = PriorityScheduler(workers=1)
+    order = []
+    interactive = []
+
+    def bulk():
+        order.append("bulk-0")
+        # 첫 청크 실행 중 제출된 짧은 작업은 다음 청크보다 먼저 실행
+        interactive.append(scheduler.submit(_record(order, "interactive"), cost=1))
+        yield 1
+        order.append("bulk-1")
+        yield 1
+        order.append("bulk-2")
+        return "done"
+
+    assert scheduler.submit(bulk(), lane=BULK, cost=10).result(TIMEOUT) == "done"
+    interactive[0].result(TIMEOUT)
+    assert order == ["bulk-0", "interactive", "bulk-1", "bulk-2"]
+    assert scheduler.stats()["preemptions"] == 2
+
+
+def test_duplicate_key_rejected_until_done():
+    scheduler, release = _blocked_scheduler()
+    first = scheduler.submit(lambda: "first", key="doc-1")
+    assert scheduler.submit(lambda: "second", key="doc-1") is None
+    release.set()
+    assert first.result(TIMEOUT) == "first"
+
+
+def test_failure_propagates_to_future():
+    scheduler = PriorityScheduler(workers=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    future = scheduler.submit(fail)
+    with pytest.raises(ValueError, match="boom"):
+        future.result(TIMEOUT)
+    assert scheduler.stats()["failed"] == 1
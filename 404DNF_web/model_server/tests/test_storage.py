@@ -0,0 +1,54 @@
+"""페이지 요약 (storage.build_page_summary)"""
+from storage import build_page_summary
+
+
+def _doc(string, dark, type_=None, predicate=None, probability=None):
+    return {"string": string, "is_darkpattern": dark, "type": type_, "predicate": predicate,
+            "probability": probability}
+
+
+def test_counts_and_percent_use_dark_blocks_only():
+    docs = [
+        _doc("Only 2 left", 1, "Scarcity", "Low-stock Messages", 91),
+        _doc("Ends in 10:00", 1, "Urgency", "Countdown Timers", 80),
+        _doc("3 left", 1, "Scarcity", "Low-stock Messages", 75),
+        _doc("Home", 0, "Not Dark Pattern", "Not Dark Pattern", 99),
+        _doc("About", 0),
+        _doc("Contact", 0),
+    ]
+    summary = build_page_summary(docs)
+    assert summary["total"] == 6
+    assert summary["dark"] == 3
+    assert summary["percent"] == 50
+    assert summary["byType"] == {"Scarcity": 2, "Urgency": 1}
+    assert summary["byPredicate"] == {"Low-stock Messages": 2, "Countdown Timers": 1}
+
+
+def test_top_items_sorted_by_probability_and_limited():
+    docs = [
+        _doc("a", 1, "Urgency", "Countdown Timers", 60),
+        _doc("b", 1, "Urgency", "Countdown Timers", None),
+        _doc("c", 1, "Scarcity", "Low-stock Messages", 95),
+        _doc("d", 1, "Social Proof", "Activity Notifications", 70),
+        _doc("e", 0, "Not Dark Pattern", "Not Dark Pattern", 100),
+    ]
+    top = build_page_summary(docs, top_n=2)["topItems"]
+    assert [item["string"] for item in top] == ["c", "d"]
+    assert top[0] == {"string": "c", "type": "Scarcity", "predicate": "Low-stock Messages", "probability": 95}
+
+
+def test_missing_type_and_predicate_counted_as_unknown():
+    summary = build_page_summary([_doc("x", 1), _doc("y", True, "Urgency")])
+    assert summary["byType"] == {"unknown": 1, "Urgency": 1}
+    assert summary["byPredicate"] == {"unknown": 2}
+
+
+def test_empty_page():
+    assert build_page_summary([]) == {
+        "total": 0, "dark": 0, "percent": 0, "byType": {}, "byPredicate": {}, "topItems": [],
+    }
+
+
+def test_percent_rounded():
+    docs = [_doc("a", 1)] + [_doc(str(i), 0) for i in range(2)]
+    assert build_page_summary(docs)["percent"] == 33
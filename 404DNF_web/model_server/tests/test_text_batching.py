@@ -0,0 +1,67 @@
+"""긴 블록 분할 + 토큰 예산 배치 (model/text_batching.py)"""
+from model.text_batching import plan_batches, split_block, split_sentences
+
+
+def _word_counts(sentences):
+    """테스트용 토크나이저: 단어 수 = 토큰 수"""
+    return [len(s.split()) for s in sentences]
+
+
+def test_split_sentences_on_punctuation_newlines_and_separators():
+    text = "Only 2 left! Order now.\nFree shipping | Returns accepted • Ends soon"
+    assert split_sentences(text) == ["Only 2 left!", "Order now.", "Free shipping", "Returns accepted", "Ends soon"]
+
+
+def test_split_block_keeps_short_block():
+    text = "Only 2 left! Order now."
+    assert split_block(text, _word_counts, max_tokens=10) == [text]
+
+
+def test_split_block_keeps_single_sentence_over_limit():
+    text = "one two three four five six seven eight"
+    assert split_block(text, _word_counts, max_tokens=3) == [text]
+
+
+def test_split_block_groups_adjacent_sentences_within_limit():
+    text = "a b c. d e. f g h i. j."
+    parts = split_block(text, _word_counts, max_tokens=5)
+    assert parts == ["a b c. d e.", "f g h i. j."]
+    assert all(sum(_word_counts([p])) <= 5 for p in parts)
+
+
+def test_split_block_long_sentence_gets_its_own_part():
+    text = "a b. c d e f g h. i."
+    assert split_block(text, _word_counts, max_tokens=4) == ["a b.", "c d e f g h.", "i."]
+
+
+def _flatten(batches):
+    return sorted(i for batch in batches for i in batch)
+
+
+def test_plan_batches_without_budget_is_one_per_item():
+    assert plan_batches([5, 3, 9], token_budget=0) == [[0], [1], [2]]
+
+
+def test_plan_batches_respects_padded_token_budget():
+    lengths = [30, 5, 12, 7, 30, 6, 100, 11]
+    batches = plan_batches(lengths, token_budget=40)
+    assert _flatten(batches) == list(range(len(lengths)))
+    for batch in batches:
+        # 한도를 넘는 항목 하나짜리 배치만 예외
+        assert len(batch) == 1 or max(lengths[i] for i in batch) * len(batch) <= 40
+
+
+def test_plan_batches_groups_similar_lengths_shortest_first():
+    lengths = [50, 4, 48, 5, 3]
+    batches = plan_batches(lengths, token_budget=100)
+    assert batches == [[4, 1, 3], [2, 0]]
+
+
+def test_plan_batches_max_batch():
+    batches = plan_batches([2] * 7, token_budget=1000, max_batch=3)
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert _flatten(batches) == list(range(7))
+
+
+def test_plan_batches_empty():
+    assert plan_batches([], token_budget=64) == []
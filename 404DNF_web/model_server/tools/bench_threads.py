@@ -0,0 +1,127 @@
+"""
+스레드 / 동시성 설정별 텍스트 추론 처리량 벤치마크
+
+설정 조합마다 별도 프로세스를 띄워(스레드 설정은 프로세스 시작 시에만 적용 가능)
+동시 클라이언트 스레드로 process_text_and_predict를 호출하고 처리량 / 지연 시간을 측정한다.
+
+실행 (model_server 디렉토리에서):
+    python -m tools.bench_threads --torch-threads 1,2,4,8 --concurrency 1,2,4 --clients 8 --seconds 30
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+SAMPLE_TEXTS = [
+    "Only 2 left in stock!",
+    "Hurry! Sale ends in 10 minutes",
+    "No thanks, I don't like saving money",
+    "15 people are looking at this item right now",
+    "Free shipping on orders over $50",
+    "Customers who bought this also bought",
+    "Limited time offer: 50% off today only",
+    "Add to cart",
+]
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def run_child(clients, seconds, blocks):
+    """자식 프로세스: 현재 환경변수 설정으로 모델 로드 후 부하 측정, 결과 JSON 한 줄 출력"""
+    from model import predictor
+
+    texts = (SAMPLE_TEXTS * (blocks // len(SAMPLE_TEXTS) + 1))[:blocks]
+    predictor.process_text_and_predict(texts[:2])  # warm-up
+
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            predictor.process_text_and_predict(texts)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    result = {
+        "requests": len(latencies),
+        "blocks_per_sec": round(len(latencies) * blocks / wall, 2),
+        "p50_sec": round(latencies[len(latencies) // 2], 3) if latencies else None,
+        "p95_sec": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+        "settings": predictor.get_runtime_info()["threads"],
+    }
+    print("BENCH_RESULT " + json.dumps(result), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스레드 / 동시성 설정별 처리량 벤치마크")
+    parser.add_argument("--torch-threads", type=_int_list, default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=_int_list, default=[0, 1, 2], help="MODEL_CONCURRENCY (0 = 제한 없음)")
+    parser.add_argument("--blas-threads", type=_int_list, default=[1])
+    parser.add_argument("--knn-jobs", type=_int_list, default=[1])
+    parser.add_argument("--clients", type=int, default=8, help="동시 요청 스레드 수")
+    parser.add_argument("--seconds", type=int, default=30, help="설정별 측정 시간")
+    parser.add_argument("--blocks", type=int, default=8, help="요청당 텍스트 블록 수")
+    parser.add_argument("--out", help="결과 CSV 저장 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.clients, args.seconds, args.blocks)
+        return
+
+    rows = []
+    grid = itertools.product(args.torch_threads, args.concurrency, args.blas_threads, args.knn_jobs)
+    for torch_threads, concurrency, blas_threads, knn_jobs in grid:
+        env = dict(os.environ)
+        env.update({
+            "TORCH_NUM_THREADS": str(torch_threads),
+            "TORCH_INTEROP_THREADS": "1",
+            "MODEL_CONCURRENCY": str(concurrency),
+            "BLAS_NUM_THREADS": str(blas_threads),
+            "KNN_N_JOBS": str(knn_jobs),
+        })
+        cmd = [sys.executable, "-m", "tools.bench_threads", "--child",
+               "--clients", str(args.clients), "--seconds", str(args.seconds), "--blocks", str(args.blocks)]
+        label = f"torch={torch_threads} concurrency={concurrency} blas={blas_threads} knn_jobs={knn_jobs}"
+        print(f"⏱️  {label}", flush=True)
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("BENCH_RESULT ")]
+        if proc.returncode != 0 or not lines:
+            print(f"   ❌ 실패 (exit {proc.returncode})\n{proc.stderr[-2000:]}")
+            continue
+        result = json.loads(lines[-1][len("BENCH_RESULT "):])
+        print(f"   {result['blocks_per_sec']} blocks/s, p50 {result['p50_sec']}s, p95 {result['p95_sec']}s")
+        rows.append((torch_threads, concurrency, blas_threads, knn_jobs,
+                     result["blocks_per_sec"], result["p50_sec"], result["p95_sec"]))
+
+    header = "torch_threads,model_concurrency,blas_threads,knn_jobs,blocks_per_sec,p50_sec,p95_sec"
+    print("\n" + header)
+    for row in rows:
+        print(",".join(str(v) for v in row))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(header + "\n")
+            f.writelines(",".join(str(v) for v in row) + "\n" for row in rows)
+        print(f"💾 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+현재 아티팩트(체크포인트 + train 임베딩 + 메타 + 법률 CSV)로 모델 번들 생성
+
+체크포인트 키 추정 / 기본값 보정은 빌드 시 한 번만 하고, 번들에는 정규화된 하이퍼파라미터 / 클래스와
+mmap 가능한 배열(ResGCN 가중치, train 임베딩, train 자기 자신 kNN)을 저장한다.
+빌드 후 번들을 다시 열어 배열 해시를 검사하고 기존 아티팩트와 예측 일치율을 비교한다.
+
+실행 (model_server 디렉토리에서):
+    python -m tools.build_bundle --out model/bundle
+    python -m tools.build_bundle --out model/bundle_kmeans20 --embeddings model/coreset/kmeans_20.npy --include-encoder
+
+사용: MODEL_BUNDLE=model/bundle (또는 /admin/reload {"dir": "model/bundle"})
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 번들 생성")
+    parser.add_argument("--out", required=True, help="번들 디렉토리")
+    parser.add_argument("--embeddings", help="축소 참조 집합 .npy (기본: embeddings_improved.npy)")
+    parser.add_argument("--include-encoder", action="store_true", help="SentenceTransformer 사본을 번들에 포함")
+    parser.add_argument("--no-knn", action="store_true", help="train kNN을 미리 계산하지 않음")
+    args = parser.parse_args()
+
+    # 번들이 아닌 원본 아티팩트를 eager PyTorch / fp32 인코더로 로드 (predictor는 import 시 환경변수를 읽음)
+    os.environ.pop("MODEL_BUNDLE", None)
+    os.environ["MODEL_RUNTIME"] = "torch"
+    os.environ["GCN_INFERENCE"] = "concat"
+    os.environ["ENCODER_QUANTIZATION"] = "none"
+    if args.embeddings:
+        os.environ["TRAIN_EMBEDDINGS_PATH"] = args.embeddings
+    else:
+        os.environ.pop("TRAIN_EMBEDDINGS_PATH", None)
+
+    from model import predictor
+    from model.bundle import ModelBundle, write_bundle
+
+    arts = predictor.artifacts
+    model = arts.model
+    arrays = {f"model/{name}": tensor.detach().cpu().numpy() for name, tensor in model.state_dict().items()}
+    manifest = {
+        "hp": {
+            "in_dim": arts.in_dim,
+            "hidden": model.head.in_features,
+            "layers": len(model.blocks),
+            "dropout": model.blocks[0].dropout if len(model.blocks) else 0.0,
+            "num_classes": model.head.out_features,
+        },
+        "classes": [str(c) for c in arts.label_encoder.classes_],
+        "meta": arts.meta,
+        "laws": predictor.load_reduced_law().to_dict("records"),
+        "encoder": {"name": predictor.ENCODER_NAME},
+        "source": {"dir": arts.source_dir, "version": arts.version, "embeddingsPath": arts.embeddings_path},
+    }
+
+    if arts.X_train is not None:
+        X = np.asarray(arts.X_train, dtype=np.float32)
+        arrays["train/X"] = X
+        if arts.y_train is not None:
+            arrays["train/labels"] = np.asarray(arts.y_train, dtype=np.int32)
+        if not args.no_knn:
+            # TrainGraphCache와 같은 설정 (k+1개, 자기 자신 포함)
+            k = arts.meta.get("knn_k", 10)
+            metric = arts.meta.get("metric", "cosine")
+            started = time.perf_counter()
+            nn = NearestNeighbors(n_neighbors=k + 1, metric=metric, n_jobs=predictor.KNN_N_JOBS).fit(X)
+            dist, idx = nn.kneighbors(X)
+            arrays["knn/dist"] = dist
+            arrays["knn/idx"] = idx
+            manifest["knn"] = {"k": k, "metric": metric}
+            print(f"✅ train kNN 계산: {len(X)}개, k={k} ({time.perf_counter() - started:.1f}s)")
+
+    encoder_dir = None
+    if args.include_encoder:
+        encoder_dir = tempfile.mkdtemp(prefix="bundle-encoder-")
+        predictor.st_model.save(encoder_dir)
+    try:
+        manifest = write_bundle(args.out, arrays, manifest, encoder_dir=encoder_dir)
+    finally:
+        if encoder_dir:
+            shutil.rmtree(encoder_dir, ignore_errors=True)
+    size_mb = manifest["data"]["size"] / 1e6
+    print(f"💾 번들 저장: {args.out} (버전: {manifest['bundleHash'][:12]}, 배열 {len(arrays)}개, {size_mb:.1f}MB)")
+
+    # 검증: 배열 해시 + 기존 아티팩트와 예측 일치율
+    ModelBundle(args.out, verify=True)
+    started = time.perf_counter()
+    candidate = predictor.load_bundle_artifact_set(args.out, gcn_inference="concat")
+    load_ms = (time.perf_counter() - started) * 1000
+    report = predictor.validate_artifact_set(candidate, reference=arts)
+    print(f"📊 번들 로드 {load_ms:.0f}ms, 검증: {report}")
+    if not report["ok"] or report.get("agreementWithCurrent", 1.0) < 1.0:
+        print("❌ 번들 검증 실패")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+embeddings_improved.npy로부터 축소 참조 집합(coreset / prototype) 생성
+
+라벨은 다음 중 하나로 지정 (train 임베딩과 행 순서가 같아야 함):
+    --labels labels.npy               클래스 이름 또는 클래스 인덱스 배열
+    --csv train.csv --label-col label10
+지정하지 않으면 현재 ResGCN을 train 그래프에 적용한 예측(pseudo-label)을 사용
+
+실행 (model_server 디렉토리에서):
+    python -m tools.build_coreset --ratio 0.2 --method kmeans --out model/coreset/kmeans_20.npy
+
+생성 파일: <out>.npy (임베딩), <out>.json (메타데이터, coreset 정보 포함), <out>_indices.npy (원본 인덱스),
+          <out>_labels.npy (참조 집합 행별 클래스 인덱스 - NEAR_DUP_THRESHOLD 지름길용)
+사용: TRAIN_EMBEDDINGS_PATH=model/coreset/kmeans_20.npy
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 원본(전체) 참조 집합 기준으로 생성
+os.environ.pop("TRAIN_EMBEDDINGS_PATH", None)
+os.environ["GCN_INFERENCE"] = "concat"
+os.environ["MODEL_RUNTIME"] = "torch"
+
+from model import predictor  # noqa: E402
+from model.coreset import SUPPORTED_METHODS, build_coreset  # noqa: E402
+from model.graph_cache import build_edge_index, knn_indices  # noqa: E402
+from model.near_dup import encode_labels, train_labels_path  # noqa: E402
+
+
+def train_labels(arts, labels_path=None, csv_path=None, label_col=None):
+    """train 임베딩 행별 클래스 이름 (정답 라벨 또는 pseudo-label)"""
+    n = len(arts.X_train)
+    if labels_path:
+        labels = np.load(labels_path, allow_pickle=True)
+        if np.issubdtype(labels.dtype, np.integer):
+            labels = arts.label_encoder.inverse_transform(labels)
+        source = labels_path
+    elif csv_path:
+        labels = pd.read_csv(csv_path)[label_col or arts.meta.get("label_col", "label10")].astype(str).to_numpy()
+        source = csv_path
+    else:
+        meta = arts.meta
+        X = np.asarray(arts.X_train, dtype=np.float32)
+        knn = knn_indices(X, k=meta.get("knn_k", 10), metric=meta.get("metric", "cosine"), n_jobs=predictor.KNN_N_JOBS)
+        edge_index = build_edge_index(knn, meta.get("mutual_knn", True))
+        logits = predictor.eager_logits(arts.model, X, edge_index)
+        labels = arts.label_encoder.inverse_transform(logits.argmax(axis=1))
+        source = "pseudo"
+    if len(labels) != n:
+        raise ValueError(f"라벨 수({len(labels)})와 train 임베딩 수({n})가 다릅니다.")
+    return np.asarray(labels), source
+
+
+def add_label_args(parser):
+    parser.add_argument("--labels", help="train 라벨 .npy (행 순서 = embeddings_improved.npy)")
+    parser.add_argument("--csv", dest="train_csv", help="train 데이터 CSV (행 순서 = embeddings_improved.npy)")
+    parser.add_argument("--label-col", help="train CSV 라벨 컬럼 (기본: 메타데이터 label_col)")
+    parser.add_argument("--method", choices=SUPPORTED_METHODS, default="kmeans")
+    parser.add_argument("--min-per-class", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--centroids", action="store_true", help="kmeans: medoid 대신 중심 좌표 저장")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="축소 참조 집합 생성")
+    size_group = parser.add_mutually_exclusive_group(required=True)
+    size_group.add_argument("--size", type=int, help="전체 참조 집합 크기")
+    size_group.add_argument("--ratio", type=float, help="원본 대비 비율 (0~1)")
+    parser.add_argument("--out", required=True, help="저장 경로 (.npy)")
+    add_label_args(parser)
+    args = parser.parse_args()
+
+    arts = predictor.artifacts
+    if arts.X_train is None:
+        raise SystemExit("❌ train 임베딩이 없습니다 (embeddings_improved.npy)")
+    X = np.asarray(arts.X_train, dtype=np.float32)
+    size = args.size or max(1, int(round(len(X) * args.ratio)))
+    labels, label_source = train_labels(arts, args.labels, args.train_csv, args.label_col)
+
+    X_reduced, indices, per_class = build_coreset(
+        X, labels, size, method=args.method, min_per_class=args.min_per_class,
+        seed=args.seed, medoid=not args.centroids)
+
+    out_path = args.out if args.out.endswith(".npy") else args.out + ".npy"
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    np.save(out_path, X_reduced)
+    meta = dict(arts.meta)
+    meta["coreset"] = {
+        "method": args.method,
+        "prototype": "centroid" if args.centroids else "medoid",
+        "size": int(len(X_reduced)),
+        "sourceSize": int(len(X)),
+        "sourceVersion": arts.version,
+        "labelSource": label_source,
+        "minPerClass": args.min_per_class,
+        "seed": args.seed,
+        "perClass": per_class,
+    }
+    with open(predictor.coreset_meta_path(out_path), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    if indices is not None:
+        np.save(os.path.splitext(out_path)[0] + "_indices.npy", indices)
+        reduced_labels = labels[indices]
+    else:
+        # kmeans 중심 모드: 클래스별로 이어 붙인 순서 그대로
+        reduced_labels = np.repeat(list(per_class), list(per_class.values()))
+    np.save(train_labels_path(out_path), encode_labels(reduced_labels, arts.label_encoder.classes_))
+
+    print(f"✅ 축소 참조 집합 저장: {out_path} ({len(X_reduced)}/{len(X)}개, {args.method})")
+    print(json.dumps(per_class, indent=2, ensure_ascii=False))
+    print(f"   사용: TRAIN_EMBEDDINGS_PATH={out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+축소 비율별 정확도 vs 지연 시간 리포트
+
+held-out 문장을 운영 경로와 같이 1건씩 inductive 추론하면서 참조 집합 크기별로
+정확도(정답 라벨이 있으면), 전체 집합 대비 예측 일치율, 요청당 지연 시간을 측정한다.
+
+실행 (model_server 디렉토리에서):
+    python -m tools.coreset_report --heldout heldout.csv --ratios 1,0.5,0.25,0.1 --method kmeans --out coreset.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tools.build_coreset import add_label_args, predictor, train_labels
+from model.coreset import build_coreset
+from model.graph_cache import TrainGraphCache
+
+
+def _float_list(value):
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def reduced_set(arts, X_reduced, ratio, gcn_inference):
+    """X_train만 바꾼 아티팩트 세트"""
+    train_graph = None
+    if gcn_inference == "cached":
+        meta = arts.meta
+        train_graph = TrainGraphCache(
+            arts.model, X_reduced,
+            knn_k=meta.get("knn_k", 10), metric=meta.get("metric", "cosine"), mutual=meta.get("mutual_knn", True),
+            device=predictor.device, n_jobs=predictor.KNN_N_JOBS,
+        )
+    return predictor.ArtifactSet(
+        arts.source_dir, f"{arts.version}-r{ratio}", arts.model, X_reduced, arts.meta, arts.label_encoder,
+        arts.in_dim, train_graph=train_graph, gcn_inference=gcn_inference)
+
+
+def evaluate(arts, embeddings):
+    """문장별 1건씩 추론 -> (예측 predicate 배열, 지연 시간 배열)"""
+    preds, latencies = [], []
+    for emb in embeddings:
+        start = time.perf_counter()
+        probs = predictor.forward_on_concat(arts, emb[None, :])[0]
+        latencies.append(time.perf_counter() - start)
+        preds.append(arts.label_encoder.inverse_transform([int(np.argmax(probs))])[0])
+    return np.array(preds), np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="축소 참조 집합 정확도 / 지연 시간 리포트")
+    parser.add_argument("--heldout", required=True, help="held-out 데이터 CSV")
+    parser.add_argument("--text-col", default=predictor.artifacts.meta.get("text_col", "String"))
+    parser.add_argument("--heldout-label-col", default=predictor.artifacts.meta.get("label_col", "label10"))
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--ratios", type=_float_list, default=[1.0, 0.5, 0.25, 0.1, 0.05])
+    parser.add_argument("--gcn-inference", choices=["concat", "cached"], default="concat")
+    parser.add_argument("--out", help="결과 CSV 저장 경로")
+    add_label_args(parser)
+    args = parser.parse_args()
+
+    arts = predictor.artifacts
+    X = np.asarray(arts.X_train, dtype=np.float32)
+    df = pd.read_csv(args.heldout).dropna(subset=[args.text_col]).head(args.limit)
+    texts = df[args.text_col].astype(str).tolist()
+    gold = df[args.heldout_label_col].astype(str).to_numpy() if args.heldout_label_col in df.columns else None
+    embeddings = predictor.encode_texts(texts)
+    labels, label_source = train_labels(arts, args.labels, args.train_csv, args.label_col)
+    print(f"📊 held-out {len(texts)}개, train {len(X)}개 (라벨: {label_source})")
+
+    full_preds = None
+    rows = []
+    # 일치율 기준인 전체 집합(1.0)은 항상 포함
+    for ratio in sorted(set(args.ratios) | {1.0}, reverse=True):
+        if ratio >= 1.0:
+            X_reduced = X
+        else:
+            X_reduced, _, _ = build_coreset(
+                X, labels, max(1, int(round(len(X) * ratio))), method=args.method,
+                min_per_class=args.min_per_class, seed=args.seed, medoid=not args.centroids)
+        candidate = reduced_set(arts, X_reduced, ratio, args.gcn_inference)
+        predictor.forward_on_concat(candidate, embeddings[:1])  # warm-up
+        preds, latencies = evaluate(candidate, embeddings)
+        if full_preds is None:
+            full_preds = preds
+        row = {
+            "ratio": ratio,
+            "size": len(X_reduced),
+            "accuracy": round(float(np.mean(preds == gold)), 4) if gold is not None else None,
+            "agreement_with_full": round(float(np.mean(preds == full_preds)), 4),
+            "mean_ms": round(float(latencies.mean()) * 1000, 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+        }
+        rows.append(row)
+        print(f"   ratio={ratio} size={row['size']} acc={row['accuracy']} "
+              f"agree={row['agreement_with_full']} mean={row['mean_ms']}ms p95={row['p95_ms']}ms")
+
+    report = pd.DataFrame(rows)
+    print("\n" + report.to_string(index=False))
+    if args.out:
+        report.to_csv(args.out, index=False)
+        print(f"💾 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
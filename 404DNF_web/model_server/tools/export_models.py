@@ -0,0 +1,71 @@
+"""
+인코더(all-mpnet-base-v2) + ResGCN을 ONNX / TorchScript 아티팩트로 export하고 eager 모델과 parity 검사
+
+실행 (model_server 디렉토리에서):
+    python -m tools.export_models --format onnx
+    python -m tools.export_models --format torchscript --out model/exported
+
+생성된 아티팩트는 MODEL_RUNTIME=onnx|torchscript, MODEL_EXPORT_DIR=<out> 으로 사용
+"""
+import argparse
+import json
+import os
+import sys
+
+import torch
+
+# parity 기준은 항상 eager fp32 모델 (환경의 MODEL_RUNTIME이 export 백엔드를 가리켜도 자기 자신과 비교하지 않도록)
+os.environ["ENCODER_QUANTIZATION"] = "none"
+os.environ["MODEL_RUNTIME"] = "torch"
+
+from model import predictor  # noqa: E402
+from model.export import check_parity, export_all  # noqa: E402
+from model.runtime import load_backends  # noqa: E402
+
+PARITY_TEXTS = [
+    "Only 2 left in stock!",
+    "Hurry! Sale ends in 10 minutes",
+    "No thanks, I don't like saving money",
+    "15 people are looking at this item right now",
+    "Free shipping on orders over $50",
+    "Add to cart",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX / TorchScript export")
+    parser.add_argument("--format", choices=["onnx", "torchscript"], required=True)
+    parser.add_argument("--out", default=predictor.MODEL_EXPORT_DIR, help="아티팩트 저장 디렉토리")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset 버전")
+    parser.add_argument("--atol", type=float, default=1e-3, help="parity 허용 오차 (최대 절대 오차)")
+    args = parser.parse_args()
+
+    arts = predictor.artifacts
+    print(f"📦 [{args.format}] export 시작 → {args.out}")
+    encoder_path, gcn_path = export_all(
+        predictor.st_model, arts.model, args.out, args.format, arts.in_dim, opset=args.opset)
+    print(f"✅ encoder: {encoder_path}")
+    print(f"✅ resgcn : {gcn_path}")
+
+    # export 결과는 CPU 기준으로 비교
+    encoder_backend, gcn_backend = load_backends(args.format, args.out, predictor.st_model, torch.device("cpu"))
+    report = check_parity(
+        eager_encode=predictor.encode_texts,
+        backend_encode=encoder_backend.encode,
+        eager_logits=lambda x, ei: predictor.eager_logits(arts.model, x, ei),
+        backend_logits=gcn_backend.logits,
+        texts=PARITY_TEXTS,
+        build_graph=lambda q: predictor.build_concat_graph(arts.X_train, q, arts.meta),
+    )
+    print("📊 [Parity]")
+    print(json.dumps(report, indent=2))
+
+    ok = (report["encoder_max_abs_diff"] <= args.atol
+          and report["gcn_max_abs_diff"] <= args.atol
+          and report["gcn_argmax_agreement"] == 1.0)
+    print("✅ parity 통과" if ok else "❌ parity 실패 (허용 오차 초과)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+수집 경로 부하 테스트 (extension insert → change stream → watch_extension_collection → model 저장)
+
+로컬 단일 노드 replica set(docker-compose.loadtest.yml)에 기록된 / 합성 extension 문서를 지정한 속도와 동시성으로 넣고
+- insert부터 modelingStatus가 completed/failed로 바뀔 때까지의 end-to-end 시간 (change stream으로 측정)
+- 대기열 깊이 (pending / processing 문서 수, --health-url이면 모델 서버 스케줄러 대기열도)
+- 쓰기 증폭 (서버 opcounters 증가량 / 넣은 문서 수, model 문서 수 / 입력 블록 수, 저장 바이트 비율)
+을 측정한다. 모델 서버는 같은 MongoDB를 바라보도록 따로 실행해 둔다.
+
+실행 (model_server 디렉토리에서):
+    docker compose -f docker-compose.loadtest.yml up -d mongo
+    MONGODB_URL="mongodb://localhost:27017/?directConnection=true" python app.py
+    python -m tools.loadgen --count 200 --rate 5 --concurrency 4 --blocks 40 --out loadgen.json
+    python -m tools.loadgen --replay recorded.jsonl --count 500 --rate 10   # mongoexport 등으로 기록한 문서
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime
+from urllib.parse import urlparse
+
+import bson
+from bson import json_util
+from pymongo import MongoClient
+
+from tools.bench_threads import SAMPLE_TEXTS
+
+DEFAULT_URI = "mongodb://localhost:27017/?directConnection=true"
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "mongo")
+FINISHED_STATUSES = ("completed", "failed")
+# 기록된 문서에서 제거하는 처리 상태 필드 (새 문서처럼 다시 넣기 위해)
+STRIPPED_FIELDS = (
+    "_id", "processingServerId", "leaseExpiresAt", "modelingStatus", "modelingProgress", "modelingError",
+    "modelingCompletedAt", "modelingSummary", "modelingModelVersion", "modelingDelta", "createdAt", "updatedAt",
+)
+NORMAL_TEXTS = [
+    "Product details",
+    "Customer reviews",
+    "Shipping and returns",
+    "Size guide",
+    "Contact us",
+    "Terms of service",
+]
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * q))], 3)
+
+
+def check_local(uri, allow_remote):
+    """운영 클러스터(Atlas 등)에 실수로 부하를 주지 않도록 로컬 주소만 허용"""
+    if allow_remote:
+        return
+    parsed = urlparse(uri)
+    hosts = [h.rsplit(":", 1)[0].strip("[]") for h in parsed.netloc.rsplit("@", 1)[-1].split(",")]
+    if parsed.scheme != "mongodb" or any(h not in LOCAL_HOSTS for h in hosts):
+        raise SystemExit(f"❌ 로컬 MongoDB가 아닙니다: {uri} (의도한 경우 --allow-remote)")
+
+
+def synthetic_documents(blocks, url_pool, seed=0):
+    """합성 extension 문서 (structuredBlocks + '*' 구분 fullText) 무한 생성"""
+    rng = random.Random(seed)
+    for n in itertools.count():
+        texts = [rng.choice(SAMPLE_TEXTS if rng.random() < 0.3 else NORMAL_TEXTS) + f" - {rng.randrange(1000)}"
+                 for _ in range(blocks)]
+        url = f"https://loadgen.local/page/{rng.randrange(url_pool) if url_pool > 0 else n}"
+        yield {
+            "tabUrl": url,
+            "tabTitle": f"loadgen {n}",
+            "collectedAt": datetime.utcnow(),
+            "framesCollected": 1,
+            "fullText": "*".join(texts),
+            "originalText": "*".join(texts),
+            "frames": [url],
+            "frameMetadata": [{"index": 0, "frameUrl": url, "frameId": 0, "title": f"loadgen {n}", "blocks": blocks}],
+            "structuredBlocks": [
+                {
+                    "index": i,
+                    "selector": f"div.block:nth-child({i + 1})",
+                    "tag": "div",
+                    "frameUrl": url,
+                    "frameId": 0,
+                    "frameBlockIndex": i,
+                    "blockType": "text",
+                    "text": text,
+                    "plainText": text,
+                    "translatedPlainText": text,
+                    "originalText": text,
+                    "originalPlainText": text,
+                }
+                for i, text in enumerate(texts)
+            ],
+            "modelingStatus": "pending",
+        }
+
+
+def recorded_documents(path, loop=True):
+    """기록된 문서 (한 줄에 extended JSON 문서 하나, mongoexport 출력 형식) - 처리 상태 필드는 제거"""
+    with open(path, encoding="utf-8") as f:
+        docs = [json_util.loads(line) for line in f if line.strip()]
+    if not docs:
+        raise SystemExit(f"❌ 문서가 없습니다: {path}")
+    for doc in itertools.cycle(docs) if loop else docs:
+        doc = {k: v for k, v in doc.items() if k not in STRIPPED_FIELDS}
+        doc["modelingStatus"] = "pending"
+        yield doc
+
+
+def block_count(doc):
+    blocks = doc.get("structuredBlocks")
+    if blocks:
+        return len(blocks)
+    return len([seg for seg in (doc.get("fullText") or "").split("*") if seg.strip()])
+
+
+class Recorder:
+    """insert / 완료 시각과 대기열 깊이 샘플"""
+
+    def __init__(self):
+        self.inserted = {}  # _id -> (insert 시각, 블록 수, BSON 바이트)
+        self.finished = {}  # _id -> (완료 시각, 상태)
+        self.depth_samples = []
+        self.lock = threading.Lock()
+
+    def on_insert(self, doc_id, at, blocks, size):
+        with self.lock:
+            self.inserted[doc_id] = (at, blocks, size)
+
+    def on_finish(self, doc_id, at, status):
+        with self.lock:
+            self.finished.setdefault(doc_id, (at, status))
+
+    def outstanding(self):
+        with self.lock:
+            return len(self.inserted) - len(self.finished)
+
+
+def watch_completions(collection, run_id, recorder, stop):
+    """change stream으로 이 실행 문서의 modelingStatus 완료 / 실패 시각 기록"""
+    pipeline = [
+        {"$match": {
+            "operationType": "update",
+            "fullDocument.loadgenRunId": run_id,
+            "updateDescription.updatedFields.modelingStatus": {"$in": list(FINISHED_STATUSES)},
+        }},
+        {"$project": {"documentKey": 1, "updateDescription.updatedFields.modelingStatus": 1}},
+    ]
+    with collection.watch(pipeline, full_document="updateLookup", max_await_time_ms=500) as stream:
+        while not stop.is_set():
+            change = stream.try_next()
+            if change is None:
+                continue
+            status = change["updateDescription"]["updatedFields"]["modelingStatus"]
+            recorder.on_finish(change["documentKey"]["_id"], time.monotonic(), status)
+
+
+def sample_depth(collection, run_id, recorder, stop, interval, health_url):
+    """pending / processing 문서 수 (+ 모델 서버 스케줄러 대기열) 주기적 샘플"""
+    started = time.monotonic()
+    while not stop.wait(interval):
+        counts = {status: 0 for status in ("pending", "processing")}
+        for row in collection.aggregate([
+            {"$match": {"loadgenRunId": run_id, "modelingStatus": {"$in": list(counts)}}},
+            {"$group": {"_id": "$modelingStatus", "n": {"$sum": 1}}},
+        ]):
+            counts[row["_id"]] = row["n"]
+        sample = {"t": round(time.monotonic() - started, 1), **counts}
+        if health_url:
+            try:
+                with urllib.request.urlopen(health_url, timeout=2) as resp:
+                    scheduler = json.loads(resp.read()).get("scheduler") or {}
+                sample["schedulerQueued"] = sum((scheduler.get("queued") or {}).values())
+            except Exception:
+                pass
+        recorder.depth_samples.append(sample)
+
+
+def opcounters(db):
+    counters = db.command("serverStatus")["opcounters"]
+    return {k: counters.get(k, 0) for k in ("insert", "update", "delete", "query", "getmore", "command")}
+
+
+def insert_loop(collection, documents, doc_lock, run_id, recorder, pacer):
+    while True:
+        with doc_lock:
+            doc = next(documents, None)
+        if doc is None or not pacer.wait():
+            return
+        doc = dict(doc, loadgenRunId=run_id)
+        size = len(bson.encode(doc))
+        blocks = block_count(doc)
+        at = time.monotonic()
+        doc_id = collection.insert_one(doc).inserted_id
+        recorder.on_insert(doc_id, at, blocks, size)
+
+
+class Pacer:
+    """전체 insert 속도 제한 (rate <= 0 이면 제한 없음) + 총 개수 제한"""
+
+    def __init__(self, rate, count):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.remaining = count
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            slot = max(self.next_at, time.monotonic())
+            self.next_at = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+def write_amplification(db, recorder, ops_before, ops_after):
+    ids = list(recorder.inserted)
+    docs = len(ids)
+    in_blocks = sum(blocks for _, blocks, _ in recorder.inserted.values())
+    in_bytes = sum(size for _, _, size in recorder.inserted.values())
+    model = next(db["model"].aggregate([
+        {"$match": {"id": {"$in": [str(i) for i in ids]}}},
+        {"$group": {"_id": None, "n": {"$sum": 1}, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}},
+    ]), {"n": 0, "bytes": 0})
+    delta = {k: ops_after[k] - ops_before[k] for k in ops_before}
+    writes = delta["insert"] + delta["update"] + delta["delete"]
+    return {
+        "opcounterDelta": delta,
+        "writeOpsPerDoc": round(writes / docs, 2) if docs else None,
+        "modelDocs": model["n"],
+        "modelDocsPerBlock": round(model["n"] / in_blocks, 3) if in_blocks else None,
+        "inputBytes": in_bytes,
+        "modelBytes": model["bytes"],
+        "modelBytesPerInputByte": round(model["bytes"] / in_bytes, 3) if in_bytes else None,
+    }
+
+
+def summarize(recorder, wall, timed_out):
+    latencies = []
+    statuses = {status: 0 for status in FINISHED_STATUSES}
+    done_blocks = 0
+    for doc_id, (finished_at, status) in recorder.finished.items():
+        if doc_id not in recorder.inserted:
+            continue
+        inserted_at, blocks, _ = recorder.inserted[doc_id]
+        latencies.append(finished_at - inserted_at)
+        statuses[status] += 1
+        done_blocks += blocks
+    depths = [s["pending"] + s["processing"] for s in recorder.depth_samples]
+    return {
+        "inserted": len(recorder.inserted),
+        **statuses,
+        "timedOut": timed_out,
+        "wallSec": round(wall, 1),
+        "docsPerSec": round(len(latencies) / wall, 3) if wall > 0 else None,
+        "blocksPerSec": round(done_blocks / wall, 2) if wall > 0 else None,
+        "e2eSec": {
+            "p50": _percentile(latencies, 0.5),
+            "p95": _percentile(latencies, 0.95),
+            "p99": _percentile(latencies, 0.99),
+            "max": round(max(latencies), 3) if latencies else None,
+        },
+        "queueDepth": {
+            "max": max(depths) if depths else 0,
+            "avg": round(sum(depths) / len(depths), 1) if depths else 0,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="extension 수집 경로 end-to-end 부하 테스트 (로컬 replica set 전용)")
+    parser.add_argument("--uri", default=DEFAULT_URI)
+    parser.add_argument("--db", default="web")
+    parser.add_argument("--replay", help="기록된 extension 문서 JSONL (없으면 합성 문서)")
+    parser.add_argument("--count", type=int, default=100, help="넣을 문서 수")
+    parser.add_argument("--rate", type=float, default=2.0, help="초당 insert 수 (0 = 제한 없음)")
+    parser.add_argument("--concurrency", type=int, default=2, help="insert 스레드 수")
+    parser.add_argument("--blocks", type=int, default=40, help="합성 문서당 블록 수")
+    parser.add_argument("--url-pool", type=int, default=0, help="합성 문서 tabUrl 종류 수 (0 = 모두 다름, delta 모드 측정용)")
+    parser.add_argument("--timeout", type=float, default=600, help="마지막 insert 후 완료 대기 시간 (초)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="대기열 깊이 샘플 간격 (초)")
+    parser.add_argument("--health-url", help="모델 서버 /health (스케줄러 대기열 샘플링, 예: http://localhost:5005/health)")
+    parser.add_argument("--cleanup", action="store_true", help="종료 후 이 실행의 extension / model 문서 삭제")
+    parser.add_argument("--allow-remote", action="store_true", help="로컬이 아닌 MongoDB 허용")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    check_local(args.uri, args.allow_remote)
+    client = MongoClient(args.uri)
+    db = client[args.db]
+    extension_col = db["extension"]
+    run_id = uuid.uuid4().hex[:12]
+    documents = recorded_documents(args.replay) if args.replay else synthetic_documents(args.blocks, args.url_pool)
+
+    recorder = Recorder()
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch_completions, args=(extension_col, run_id, recorder, stop), daemon=True)
+    sampler = threading.Thread(
+        target=sample_depth, args=(extension_col, run_id, recorder, stop, args.sample_interval, args.health_url),
+        daemon=True,
+    )
+    watcher.start()
+    sampler.start()
+    time.sleep(1.0)  # change stream 커서가 열린 뒤 insert 시작
+
+    print(f"🚀 [loadgen {run_id}] {args.count}건, {args.rate}/s, 동시성 {args.concurrency}", flush=True)
+    ops_before = opcounters(db)
+    started = time.monotonic()
+    pacer = Pacer(args.rate, args.count)
+    doc_lock = threading.Lock()
+    inserters = [
+        threading.Thread(target=insert_loop, args=(extension_col, documents, doc_lock, run_id, recorder, pacer))
+        for _ in range(max(1, args.concurrency))
+    ]
+    for t in inserters:
+        t.start()
+    for t in inserters:
+        t.join()
+    print(f"📤 insert 완료: {len(recorder.inserted)}건 ({time.monotonic() - started:.1f}s), 처리 대기 중", flush=True)
+
+    deadline = time.monotonic() + args.timeout
+    while recorder.outstanding() > 0 and time.monotonic() < deadline:
+        time.sleep(0.5)
+    wall = time.monotonic() - started
+    timed_out = recorder.outstanding()
+    stop.set()
+    watcher.join(timeout=5)
+    sampler.join(timeout=5)
+
+    report = {
+        "runId": run_id,
+        "settings": {k: v for k, v in vars(args).items() if k not in ("uri",)},
+        **summarize(recorder, wall, timed_out),
+        "writeAmplification": write_amplification(db, recorder, ops_before, opcounters(db)),
+        "depthSamples": recorder.depth_samples,
+    }
+    print(json.dumps({k: v for k, v in report.items() if k != "depthSamples"}, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.out}")
+
+    if args.cleanup:
+        ids = [str(i) for i in recorder.inserted]
+        db["model"].delete_many({"id": {"$in": ids}})
+        extension_col.delete_many({"loadgenRunId": run_id})
+        print(f"🧹 이 실행 문서 삭제 ({len(ids)}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+근접 중복 지름길(NEAR_DUP_THRESHOLD) threshold별 적중률 / 전체 모델과의 일치율 리포트
+
+held-out 문장을 운영 경로와 같이 1건씩 전체 모델(그래프 + GCN)로 추론해 기준 예측을 만들고,
+threshold마다 지름길이 적중하는 비율, 적중한 문장에서 train 라벨과 전체 모델 예측의 일치율,
+정답 라벨이 있으면 지름길 적용 전후 정확도, 예상 요청당 지연 시간을 계산한다.
+
+실행 (model_server 디렉토리에서):
+    python -m tools.near_dup_report --heldout heldout.csv --thresholds 0.9,0.95,0.97,0.99 --out near_dup.csv
+
+train 라벨: 아티팩트와 함께 저장된 라벨(tools.save_train_labels), 없으면 --labels / --csv (미지정 시 pseudo-label)
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tools.build_coreset import predictor, train_labels
+from tools.coreset_report import evaluate
+from model.near_dup import NearDuplicateIndex, encode_labels
+
+
+def _float_list(value):
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근접 중복 지름길 리포트")
+    parser.add_argument("--heldout", required=True, help="held-out 데이터 CSV")
+    parser.add_argument("--text-col", default=predictor.artifacts.meta.get("text_col", "String"))
+    parser.add_argument("--heldout-label-col", default=predictor.artifacts.meta.get("label_col", "label10"))
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--thresholds", type=_float_list, default=[0.9, 0.95, 0.97, 0.98, 0.99])
+    parser.add_argument("--labels", help="train 라벨 .npy (저장된 라벨 대신 사용)")
+    parser.add_argument("--csv", dest="train_csv", help="train 데이터 CSV (저장된 라벨 대신 사용)")
+    parser.add_argument("--label-col", help="train CSV 라벨 컬럼")
+    parser.add_argument("--out", help="결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    arts = predictor.artifacts
+    if arts.X_train is None:
+        raise SystemExit("❌ train 임베딩이 없습니다 (embeddings_improved.npy)")
+    if arts.y_train is not None and not (args.labels or args.train_csv):
+        y_train, label_source = arts.y_train, "shipped"
+    else:
+        labels, label_source = train_labels(arts, args.labels, args.train_csv, args.label_col)
+        y_train = encode_labels(labels, arts.label_encoder.classes_)
+    classes = arts.label_encoder.classes_
+    index = NearDuplicateIndex(arts.X_train, y_train, threshold=max(args.thresholds))
+
+    df = pd.read_csv(args.heldout).dropna(subset=[args.text_col]).head(args.limit)
+    texts = df[args.text_col].astype(str).tolist()
+    gold = df[args.heldout_label_col].astype(str).to_numpy() if args.heldout_label_col in df.columns else None
+    embeddings = predictor.encode_texts(texts)
+    print(f"📊 held-out {len(texts)}개, train {len(y_train)}개 (라벨: {label_source})")
+
+    # 기준: 지름길 없이 1건씩 전체 모델 추론
+    predictor.forward_on_concat(arts, embeddings[:1])  # warm-up
+    full_preds, full_latencies = evaluate(arts, embeddings)
+
+    # 지름길 조회 비용 (1건씩)
+    lookup_latencies = []
+    for emb in embeddings:
+        start = time.perf_counter()
+        index.nearest(emb[None, :])
+        lookup_latencies.append(time.perf_counter() - start)
+    lookup_ms = float(np.mean(lookup_latencies)) * 1000
+    full_ms = float(full_latencies.mean()) * 1000
+
+    nearest_idx, sims = index.nearest(embeddings)
+    shortcut_preds = classes[y_train[nearest_idx]]
+    print(f"   최근접 유사도 분위수: p50={np.percentile(sims, 50):.4f} p90={np.percentile(sims, 90):.4f} "
+          f"p99={np.percentile(sims, 99):.4f}")
+
+    rows = []
+    for threshold in sorted(args.thresholds):
+        hit = sims >= threshold
+        preds = np.where(hit, shortcut_preds, full_preds)
+        hits = int(hit.sum())
+        row = {
+            "threshold": threshold,
+            "hits": hits,
+            "hit_rate": round(hits / len(texts), 4),
+            # 적중한 문장에서 train 라벨 == 전체 모델 예측
+            "agreement_on_hits": round(float(np.mean(shortcut_preds[hit] == full_preds[hit])), 4) if hits else None,
+            "agreement_overall": round(float(np.mean(preds == full_preds)), 4),
+            "accuracy_full": round(float(np.mean(full_preds == gold)), 4) if gold is not None else None,
+            "accuracy_shortcut": round(float(np.mean(preds == gold)), 4) if gold is not None else None,
+            # 적중 = 조회만, 미적중 = 조회 + 전체 모델
+            "est_mean_ms": round(lookup_ms + (1 - hits / len(texts)) * full_ms, 2),
+        }
+        rows.append(row)
+        print(f"   threshold={threshold} hit={row['hit_rate']} agree_hits={row['agreement_on_hits']} "
+              f"agree={row['agreement_overall']} acc={row['accuracy_full']}->{row['accuracy_shortcut']} "
+              f"mean={row['est_mean_ms']}ms")
+
+    report = pd.DataFrame(rows)
+    print(f"\n전체 모델 mean={full_ms:.2f}ms, 지름길 조회 mean={lookup_ms:.2f}ms")
+    print(report.to_string(index=False))
+    if args.out:
+        report.to_csv(args.out, index=False)
+        print(f"💾 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
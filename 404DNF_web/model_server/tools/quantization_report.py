@@ -0,0 +1,67 @@
+"""
+int8 동적 양자화 인코더 vs fp32 인코더 비교 리포트
+- 임베딩 유사도 (cosine 평균 / p5 / 최소)
+- end-to-end predicate 일치율 (ResGCN inductive 추론 결과 비교)
+- 정답 라벨이 있으면 각 모델의 정확도
+
+실행 (model_server 디렉토리에서):
+    python -m tools.quantization_report --csv heldout.csv [--text-col String] [--label-col label10] [--limit 500]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 비교 기준은 항상 eager fp32 모델
+os.environ["ENCODER_QUANTIZATION"] = "none"
+os.environ["MODEL_RUNTIME"] = "torch"
+
+from model import predictor  # noqa: E402
+from model.quantization import compare_encoders, quantize_encoder  # noqa: E402
+
+
+def classify(embeddings):
+    """임베딩별 inductive 추론 (운영 경로와 동일하게 1건씩) -> predicate 리스트"""
+    preds = []
+    for emb in embeddings:
+        probs = predictor.forward_on_concat(predictor.artifacts, emb[None, :])[0]
+        preds.append(predictor.artifacts.label_encoder.inverse_transform([int(np.argmax(probs))])[0])
+    return preds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 양자화 인코더 검증 리포트")
+    parser.add_argument("--csv", required=True, help="held-out 데이터 CSV")
+    parser.add_argument("--text-col", default=predictor.artifacts.meta.get("text_col", "String"))
+    parser.add_argument("--label-col", default=predictor.artifacts.meta.get("label_col", "label10"))
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--out", help="리포트 JSON 저장 경로")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv).dropna(subset=[args.text_col]).head(args.limit)
+    texts = df[args.text_col].astype(str).tolist()
+    print(f"📊 held-out 문장 {len(texts)}개")
+
+    int8_model = quantize_encoder(predictor.st_model)
+    emb_fp32, emb_int8, report = compare_encoders(predictor.st_model, int8_model, texts)
+
+    pred_fp32 = classify(emb_fp32)
+    pred_int8 = classify(emb_int8)
+    report["predicate_agreement"] = float(np.mean([a == b for a, b in zip(pred_fp32, pred_int8)]))
+
+    if args.label_col in df.columns:
+        labels = df[args.label_col].astype(str).tolist()
+        report["fp32_accuracy"] = float(np.mean([p == y for p, y in zip(pred_fp32, labels)]))
+        report["int8_accuracy"] = float(np.mean([p == y for p, y in zip(pred_int8, labels)]))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 리포트 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
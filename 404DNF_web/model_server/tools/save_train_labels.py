@@ -0,0 +1,51 @@
+"""
+train 라벨을 임베딩과 함께 저장 (NEAR_DUP_THRESHOLD 근접 중복 지름길용)
+
+라벨은 train 임베딩(embeddings_improved.npy)과 행 순서가 같아야 한다:
+    --labels labels.npy               클래스 이름 또는 클래스 인덱스 배열
+    --csv train.csv --label-col label10
+지정하지 않으면 현재 ResGCN의 train 노드 예측(pseudo-label)을 저장 (정답 라벨 권장)
+
+실행 (model_server 디렉토리에서):
+    python -m tools.save_train_labels --csv train.csv
+
+생성 파일: model/train_labels.npy (클래스 인덱스, int32)
+축소 참조 집합은 tools.build_coreset이 <out>_labels.npy를 함께 저장, 모델 번들은 빌드 시 train/labels로 포함
+"""
+import argparse
+import os
+
+import numpy as np
+
+from tools.build_coreset import predictor, train_labels
+from model.bundle import is_bundle
+from model.near_dup import encode_labels, train_labels_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="train 라벨 저장")
+    parser.add_argument("--labels", help="train 라벨 .npy (행 순서 = embeddings_improved.npy)")
+    parser.add_argument("--csv", dest="train_csv", help="train 데이터 CSV (행 순서 = embeddings_improved.npy)")
+    parser.add_argument("--label-col", help="train CSV 라벨 컬럼 (기본: 메타데이터 label_col)")
+    parser.add_argument("--out", help="저장 경로 (기본: 아티팩트 디렉토리의 train_labels.npy)")
+    args = parser.parse_args()
+
+    arts = predictor.artifacts
+    if arts.X_train is None:
+        raise SystemExit("❌ train 임베딩이 없습니다 (embeddings_improved.npy)")
+    if is_bundle(arts.source_dir) and not args.out:
+        raise SystemExit("❌ 모델 번들에는 라벨을 추가할 수 없습니다 (원본 아티팩트에 저장 후 번들을 다시 빌드)")
+
+    labels, label_source = train_labels(arts, args.labels, args.train_csv, args.label_col)
+    y_train = encode_labels(labels, arts.label_encoder.classes_)
+    out_path = args.out or train_labels_path(os.path.join(arts.source_dir, "embeddings_improved.npy"))
+    np.save(out_path, y_train)
+
+    counts = np.bincount(y_train, minlength=len(arts.label_encoder.classes_))
+    print(f"✅ train 라벨 저장: {out_path} ({len(y_train)}개, 라벨: {label_source})")
+    for name, count in zip(arts.label_encoder.classes_, counts):
+        print(f"   - {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
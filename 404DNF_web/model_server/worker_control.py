@@ -0,0 +1,104 @@
+"""
+멀티 프로세스 추론 워커 제어 채널 (MODEL_WORKERS > 1)
+
+문서 ID 작업 큐는 워커들이 공유하므로(먼저 꺼낸 워커가 처리) 모든 워커에 보내야 하는 명령
+(아티팩트 리로드, 현재 버전 조회, 프로파일)은 워커마다 따로 둔 제어 큐로 보낸다.
+
+- 부모: WorkerControl.send(command, **kwargs)로 모든 워커에 명령 전송 -> collect(ticket, timeout)로 응답 수집
+- 워커: serve_worker_control(...) 스레드가 제어 큐를 읽어 handlers[command](**kwargs) 실행 후 응답
+  (작업 루프와 별도 스레드이므로 문서 처리 중에도 응답)
+- 작업 큐 중복 방지: 부모는 큐에 넣었지만 아직 워커가 꺼내지 않은 문서 ID를 기억하고(mark_queued),
+  워커는 문서를 꺼낼 때 notify_picked로 알림 -> 인수 주기마다 같은 문서가 큐에 쌓이지 않음
+"""
+import threading
+import uuid
+
+from model.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerControl:
+    """부모 프로세스 쪽 워커 제어 (워커별 제어 큐 + 공유 응답 큐)"""
+
+    def __init__(self, ctx, num_workers):
+        self.num_workers = num_workers
+        self.queues = [ctx.Queue() for _ in range(num_workers)]
+        self.replies = ctx.Queue()
+        self._lock = threading.Lock()
+        self._pending = {}  # ticket -> {워커 번호: 응답}
+        self._queued = set()  # 작업 큐에 넣었지만 아직 워커가 꺼내지 않은 문서 ID
+        self._done = threading.Condition(self._lock)
+        threading.Thread(target=self._collect_replies, name="worker-control", daemon=True).start()
+
+    def worker_args(self, worker_index):
+        """워커 프로세스에 넘길 (제어 큐, 응답 큐)"""
+        return self.queues[worker_index], self.replies
+
+    def _collect_replies(self):
+        while True:
+            ticket, worker_index, reply = self.replies.get()
+            with self._lock:
+                if ticket is None:
+                    # notify_picked: 워커가 작업 큐에서 문서를 꺼냄
+                    self._queued.discard(reply)
+                    continue
+                # 시간 초과로 이미 포기한 요청의 늦은 응답은 버림
+                if ticket in self._pending:
+                    self._pending[ticket][worker_index] = reply
+                    self._done.notify_all()
+
+    def mark_queued(self, doc_id):
+        """작업 큐에 넣을 문서 기록 -> 이미 대기 중이면 False"""
+        with self._lock:
+            if doc_id in self._queued:
+                return False
+            self._queued.add(doc_id)
+            return True
+
+    def send(self, command, **kwargs):
+        """모든 워커에 명령 전송 -> ticket"""
+        ticket = uuid.uuid4().hex
+        with self._lock:
+            self._pending[ticket] = {}
+        for queue in self.queues:
+            queue.put((ticket, command, kwargs))
+        return ticket
+
+    def collect(self, ticket, timeout):
+        """
+        응답 수집 (timeout 초까지 대기)
+
+        Returns:
+            {워커 번호: 응답} - 응답하지 않은 워커는 {"error": "timeout"}
+        """
+        with self._lock:
+            self._done.wait_for(lambda: len(self._pending[ticket]) >= self.num_workers, timeout=timeout)
+            replies = self._pending.pop(ticket)
+        return {index: replies.get(index, {"error": "timeout"}) for index in range(self.num_workers)}
+
+    def request(self, command, timeout, **kwargs):
+        return self.collect(self.send(command, **kwargs), timeout)
+
+
+def notify_picked(reply_queue, worker_index, doc_id):
+    """워커가 작업 큐에서 문서를 꺼냈음을 부모에 알림 (WorkerControl.mark_queued 해제)"""
+    reply_queue.put((None, worker_index, doc_id))
+
+
+def serve_worker_control(worker_index, control_queue, reply_queue, handlers):
+    """워커 프로세스 쪽 제어 루프 (데몬 스레드로 실행)"""
+    def serve():
+        while True:
+            ticket, command, kwargs = control_queue.get()
+            handler = handlers.get(command)
+            try:
+                if handler is None:
+                    raise ValueError(f"지원하지 않는 워커 명령: {command}")
+                reply = handler(**kwargs)
+            except Exception as e:
+                logger.warning("⚠️ [워커 명령 실패] w%d %s: %s", worker_index, command, e)
+                reply = {"error": str(e)}
+            reply_queue.put((ticket, worker_index, reply))
+
+    threading.Thread(target=serve, name="worker-control", daemon=True).start()
@@ -10,6 +10,7 @@ if (!uri) {
 
 const client = new MongoClient(uri);
 let predicateCollection;
+let lawSetCollection;
 
 async function connectPredicateCollection() {
   if (!predicateCollection) {
@@ -20,4 +21,14 @@ async function connectPredicateCollection() {
   return predicateCollection;
 }
 
-module.exports = { connectPredicateCollection };
\ No newline at end of file
+// 모델 서버가 동기화하는 type별 법률 목록 (predicate 문서에는 lawSetId만 저장)
+async function connectLawSetCollection() {
+  if (!lawSetCollection) {
+    await client.connect();
+    const db = client.db(dbName);
+    lawSetCollection = db.collection('law_set');
+  }
+  return lawSetCollection;
+}
+
+module.exports = { connectPredicateCollection, connectLawSetCollection };
\ No newline at end of file
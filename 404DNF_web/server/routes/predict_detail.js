@@ -1,6 +1,6 @@
 const express = require('express');
 const router = express.Router();
-const { connectPredicateCollection } = require('../db/predicate');
+const { connectPredicateCollection, connectLawSetCollection } = require('../db/predicate');
 
 router.post('/', async (req, res) => {
   const { filename } = req.body;
@@ -12,6 +12,7 @@ router.post('/', async (req, res) => {
   try {
     const collection = await connectPredicateCollection();
     const results = await collection.find({ filename }).toArray();
+    const lawsById = await resolveLawSets(results);
 
     const formatted = results.map(item => ({
       text: item.text,
@@ -20,7 +21,8 @@ router.post('/', async (req, res) => {
       confidence: Math.round((item.confidence || 0) * 100), // 0~1 → %
       bbox: JSON.parse(item.bbox), // 문자열 → 객체
       prob: extractProb(item.top1_predicate),
-      laws: item.laws || []
+      // 기존 문서는 laws를 직접 포함, 신규 문서는 lawSetId로 조회
+      laws: item.laws || lawsById[item.lawSetId] || []
     }));
 
     res.status(200).json(formatted);
@@ -30,6 +32,15 @@ router.post('/', async (req, res) => {
   }
 });
 
+// 결과 문서들의 lawSetId -> 법률 목록 (한 번의 $in 조회)
+async function resolveLawSets(results) {
+  const ids = [...new Set(results.map(item => item.lawSetId).filter(Boolean))];
+  if (ids.length === 0) return {};
+  const lawSets = await connectLawSetCollection();
+  const docs = await lawSets.find({ _id: { $in: ids } }).toArray();
+  return Object.fromEntries(docs.map(doc => [doc._id, doc.laws || []]));
+}
+
 // top1_predicate에서 확률 수치 추출하는 함수
 function extractProb(str) {
   if (!str) return null;